@@ -0,0 +1,181 @@
+# CUBE D'AGRÉGATION (release_year × type × pays × genres)
+"""Cube de comptages précalculé au chargement, qui alimente tous les graphiques
+
+Une cellule regroupe les titres qui partagent la même année de sortie, le
+même type, le même ensemble de pays et le même ensemble de genres. Elle
+stocke le nombre de titres ainsi que count / somme / somme des carrés de
+duration_min. Comme un titre n'appartient qu'à une seule cellule, les
+filtres de la barre latérale (« au moins un des pays / genres choisis »)
+deviennent de simples masques sur les cellules, sans double comptage, et
+chaque graphique se calcule sur le cube plutôt que sur les lignes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from list_columns import list_values, to_tuples
+
+MEASURES = ['count', 'dur_count', 'dur_sum', 'dur_sumsq']
+
+
+def _set_incidence(series, index):
+    """Identifiant d'ensemble par ligne et matrice ensemble × valeur (booléens)"""
+    set_ids, sets = pd.factorize(pd.Series(to_tuples(*list_values(series)), dtype=object))
+    incidence = np.zeros((len(sets), len(index)), dtype=bool)
+    for i, members in enumerate(sets):
+        ids = [index.ids[value] for value in members if value in index]
+        incidence[i, ids] = True
+    return set_ids, incidence
+
+
+class AggregationCube:
+    """Comptages et sommes de durée par (année, type, ensemble de pays, ensemble de genres)"""
+
+    def __init__(self, df, indexes):
+        self.indexes = indexes
+        self.types, self.type_names = pd.factorize(df['type'], use_na_sentinel=False)
+        self.type_names = list(self.type_names)
+
+        country_sets, self.country_incidence = _set_incidence(df['countries_list'], indexes['country'])
+        genre_sets, self.genre_incidence = _set_incidence(df['genres_list'], indexes['genre'])
+
+        duration = pd.to_numeric(df['duration_min'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        has_duration = ~np.isnan(duration)
+        duration = np.where(has_duration, duration, 0.0)
+
+        rows = pd.DataFrame({
+            'year': df['release_year'].to_numpy(dtype=float, na_value=np.nan),
+            'type': self.types,
+            'country_set': country_sets,
+            'genre_set': genre_sets,
+            'count': 1,
+            'dur_count': has_duration.astype(np.int64),
+            'dur_sum': duration,
+            'dur_sumsq': duration ** 2,
+        })
+        # Les titres sans année ne passent jamais le filtre temporel
+        rows = rows[rows['year'].notna()]
+        rows['year'] = rows['year'].astype(np.int64)
+
+        cells = rows.groupby(['year', 'type', 'country_set', 'genre_set'], sort=False)[MEASURES].sum()
+        self.cells = cells.reset_index()
+        self.n_rows = len(df)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def slice(self, content_type, year_range, countries, genres):
+        """Cellules correspondant aux filtres de la barre latérale"""
+        cells = self.cells
+        mask = ((cells['year'] >= year_range[0]) & (cells['year'] <= year_range[1])).to_numpy()
+        if content_type:
+            codes = [self.type_names.index(t) for t in content_type if t in self.type_names]
+            mask = mask & np.isin(cells['type'].to_numpy(), codes)
+        if countries:
+            hit = self._members(self.country_incidence, 'country', countries).any(axis=1)
+            mask = mask & hit[cells['country_set'].to_numpy()]
+        if genres:
+            hit = self._members(self.genre_incidence, 'genre', genres).any(axis=1)
+            mask = mask & hit[cells['genre_set'].to_numpy()]
+        return CubeSlice(self, cells[mask])
+
+    def _members(self, incidence, dimension, values):
+        """Colonnes de la matrice d'incidence pour les valeurs demandées"""
+        index = self.indexes[dimension]
+        columns = np.zeros((incidence.shape[0], len(values)), dtype=bool)
+        for j, value in enumerate(values):
+            if value in index:
+                columns[:, j] = incidence[:, index.ids[value]]
+        return columns
+
+
+class CubeSlice:
+    """Sous-ensemble de cellules du cube, avec les agrégats des graphiques"""
+
+    def __init__(self, cube, cells):
+        self.cube = cube
+        self.cells = cells
+
+    def summary(self, countries):
+        """Toutes les séries des graphiques, calculées en une seule passe"""
+        return SliceSummary(self, countries)
+
+
+class SliceSummary:
+    """Séries partagées par les sections du tableau de bord pour un état des filtres
+
+    L'appartenance des cellules aux pays sélectionnés et à tous les genres est
+    « explosée » une seule fois ; chaque série en est ensuite déduite :
+
+    - year_counts : titres par année
+    - type_totals : titres par type
+    - year_by_country / year_by_genre : titres par année et par pays / genre
+    - country_totals / genre_totals : titres par pays sélectionné / par genre
+    - crosstab : pays sélectionnés × genres
+    - type_by_country : pays sélectionnés × type
+    """
+
+    def __init__(self, cube_slice, countries):
+        cube, cells = cube_slice.cube, cube_slice.cells
+        countries = list(countries)
+        genre_names = list(cube.indexes['genre'].vocabulary)
+        counts = cells['count'].to_numpy()
+
+        # Explosion unique : cellules × pays sélectionnés, cellules × genres
+        in_country = cube._members(cube.country_incidence, 'country', countries)[cells['country_set'].to_numpy()]
+        in_genre = cube.genre_incidence[cells['genre_set'].to_numpy()]
+        by_country = in_country * counts[:, None]
+        by_genre = in_genre * counts[:, None]
+
+        # Un seul group-by par année pour le total, les pays et les genres
+        years = np.column_stack([counts, by_country, by_genre])
+        years = pd.DataFrame(years).groupby(cells['year'].to_numpy()).sum().sort_index()
+        self.year_counts = years[0].rename_axis('release_year').rename('count')
+        self.year_by_country = pd.DataFrame(years.iloc[:, 1:1 + len(countries)].to_numpy(),
+                                            index=years.index, columns=countries)
+        self.year_by_genre = pd.DataFrame(years.iloc[:, 1 + len(countries):].to_numpy(),
+                                          index=years.index, columns=genre_names)
+
+        # Un seul group-by par type pour le total et les pays
+        types = pd.DataFrame(np.column_stack([counts, by_country]))
+        types = types.groupby(cells['type'].to_numpy()).sum()
+        types.index = [cube.type_names[i] for i in types.index]
+        types = types.reindex(cube.type_names, fill_value=0)
+        self.type_totals = types[0]
+        self.type_by_country = pd.DataFrame(types.iloc[:, 1:].to_numpy().T,
+                                            index=countries, columns=cube.type_names)
+
+        self.country_totals = pd.Series(by_country.sum(axis=0), index=countries)
+        self.genre_totals = pd.Series(by_genre.sum(axis=0), index=genre_names)
+        self.crosstab = pd.DataFrame(by_country.T @ in_genre, index=countries, columns=genre_names)
+
+        self.total = int(counts.sum())
+        self._duration = cells.groupby('type')[['dur_count', 'dur_sum', 'dur_sumsq']].sum()
+        self._type_names = cube.type_names
+
+    def year_stats(self):
+        """Année moyenne, minimale et maximale"""
+        if self.total == 0:
+            return np.nan, np.nan, np.nan
+        years = self.year_counts.index.to_numpy()
+        mean = (years * self.year_counts.to_numpy()).sum() / self.total
+        return mean, years.min(), years.max()
+
+    def duration_stats(self, content_type='Movie'):
+        """Nombre, moyenne et écart-type de duration_min pour un type"""
+        if content_type not in self._type_names:
+            return 0, np.nan, np.nan
+        code = self._type_names.index(content_type)
+        if code not in self._duration.index:
+            return 0, np.nan, np.nan
+        n, total, squares = self._duration.loc[code]
+        if n == 0:
+            return 0, np.nan, np.nan
+        mean = total / n
+        variance = max(squares / n - mean ** 2, 0.0)
+        return int(n), mean, np.sqrt(variance)
+
+
+def build_cube(df, indexes):
+    """Construit le cube d'agrégation à partir du catalogue et de ses index"""
+    return AggregationCube(df, indexes)
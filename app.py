@@ -3,11 +3,27 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from collections import Counter
 import warnings
 import os
+import json
+import uuid
+
+from aggregates import build_cube
+from collaboration import DIRECTOR, CollaborationGraph
+from compact import load_compact, memory_report
+from charts import (country_figure, genre_figure, genre_heatmap_figure,
+                    observations as build_observations, type_split_figure, yearly_figure)
+from data_store import file_fingerprint, load_cleaned
+from explorer import DISPLAY_COLUMNS, PAGE_SIZES, SortIndex, page_count, page_frame, page_positions
+from export import EXPORT_FORMATS, available_formats, export_file
+from filter_index import build_filter_indexes
+from figure_cache import FigureCache
+from filtering import FilterCache, FilteredView
+from instrumentation import StageRecorder
+from profiling import RAW_FILENAME, is_fresh, profile_frame, profile_path
+from search_index import SearchIndex, member_mask
+from sections import SectionRunner
+from similarity import is_fresh as neighbors_are_fresh, load_neighbors, neighbors_path, similar_titles
 
 warnings.filterwarnings('ignore')
 
@@ -75,87 +91,152 @@ Base de données : Netflix Movies and TV Shows (Kaggle)
 </div>
 """, unsafe_allow_html=True)
 
+# Emplacements possibles du fichier de données
+POSSIBLE_PATHS = [
+    "netflix_titles_cleaned.csv",  # Même dossier
+    os.path.join(os.path.dirname(__file__), "netflix_titles_cleaned.csv"),  # Dossier de l'app
+    os.path.expanduser("~/Documents/Seminaire/netflix_titles_cleaned.csv"),  # Dossier utilisateur
+    "C:/Users/Mahamadou.Is Khadija/OneDrive/Documents/Seminaire/netflix_titles_cleaned.csv"  # Chemin complet
+]
+
+def find_data_file():
+    """Premier fichier de données existant, avec son empreinte (taille, date de modification)"""
+    for path in POSSIBLE_PATHS:
+        try:
+            fingerprint = file_fingerprint(path)
+        except OSError:
+            continue
+        return path, (fingerprint['size'], fingerprint['mtime_ns'])
+    return None, None
+
 # Fonction de chargement des données
-@st.cache_data
-def load_data():
-    """Charge les données nettoyées depuis le fichier CSV"""
+# (cache_resource : le DataFrame est partagé en lecture seule, sans copie à chaque exécution ;
+# la clé contient l'empreinte du fichier, donc une mise à jour du CSV provoque un rechargement)
+@st.cache_resource(max_entries=1)
+def load_data(path, version):
+    """Charge les données nettoyées (types compacts)"""
     try:
-        # Essayer plusieurs chemins possibles
-        possible_paths = [
-            "netflix_titles_cleaned.csv",  # Même dossier
-            os.path.join(os.path.dirname(__file__), "netflix_titles_cleaned.csv"),  # Dossier de l'app
-            os.path.expanduser("~/Documents/Seminaire/netflix_titles_cleaned.csv"),  # Dossier utilisateur
-            "C:/Users/Mahamadou.Is Khadija/OneDrive/Documents/Seminaire/netflix_titles_cleaned.csv"  # Chemin complet
-        ]
-        
-        df = None
-        for path in possible_paths:
-            try:
-                if os.path.exists(path):
-                    df = pd.read_csv(path, encoding='utf-8')
-                    st.sidebar.success(f"Données chargées depuis : {path}")
-                    break
-            except:
-                continue
-        
-        if df is None:
-            st.error("Fichier netflix_titles_cleaned.csv non trouvé.")
-            st.info("""
-            Veuillez :
-            1. Placer le fichier dans le même dossier que cette application
-            2. Vérifier le chemin d'accès au fichier
-            """)
-            return pd.DataFrame()
-        
-        # Conversion des types de données
-        # Colonnes datetime
-        date_columns = ['date_added']
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-        
-        # Colonnes numériques
-        numeric_columns = ['release_year', 'year_added', 'month_added', 
-                          'duration_min', 'duration_seasons', 'decade']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Conversion des colonnes de listes
-        def convert_to_list(value):
-            if pd.isna(value):
-                return []
-            if isinstance(value, list):
-                return value
-            if isinstance(value, str):
-                if value == '[]' or value == '':
-                    return []
-                try:
-                    import ast
-                    return ast.literal_eval(value)
-                except:
-                    items = [item.strip() for item in value.split(',')]
-                    return [item for item in items if item]
-            return []
-        
-        list_columns = ['genres_list', 'countries_list', 'cast_list', 'director_list']
-        for col in list_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(convert_to_list)
-        
+        # Lecture via le cache Arrow (typé), recréé si le CSV a changé, puis
+        # catégories, Int16 et listes codées : moins de mémoire par processus
+        df = load_compact(path)
+        st.sidebar.success(f"Données chargées depuis : {path}")
         return df
         
     except Exception as e:
         st.error(f"Erreur lors du chargement des données : {str(e)}")
         return pd.DataFrame()
 
+@st.cache_resource(max_entries=1)
+def load_memory_report(_df, path, version):
+    """Empreinte mémoire par colonne avant / après types compacts (relit les listes Python)"""
+    return memory_report(load_cleaned(path).reset_index(drop=True), _df)
+
+# Structures dérivées : reconstruites pour chaque version du fichier de données
+@st.cache_resource(max_entries=1)
+def load_filter_indexes(_df, version):
+    """Construit une seule fois les index inversés pays / genres"""
+    return build_filter_indexes(_df)
+
+@st.cache_resource(max_entries=1)
+def load_cube(_df, _indexes, version):
+    """Précalcule le cube d'agrégation qui alimente les graphiques"""
+    return build_cube(_df, _indexes)
+
+@st.cache_resource(max_entries=1)
+def load_filter_cache(_df, _indexes, version):
+    """Cache LRU des résultats filtrés, partagé entre les sessions"""
+    return FilterCache(
+        _df,
+        _indexes,
+        max_entries=int(os.environ.get('NETFLIX_FILTER_CACHE_ENTRIES', 64)),
+        max_bytes=int(float(os.environ.get('NETFLIX_FILTER_CACHE_MB', 256)) * 2**20)
+    )
+
+@st.cache_resource(max_entries=1)
+def load_sort_index(_df, version):
+    """Ordres de tri par colonne de l'explorateur, calculés à la demande et partagés entre les sessions"""
+    return SortIndex(_df)
+
+@st.cache_resource(max_entries=1)
+def load_search_index(_df, version):
+    """Index de recherche (mots et préfixes) des titres, personnes et descriptions"""
+    return SearchIndex(_df)
+
+@st.cache_resource(max_entries=1)
+def load_collaboration_graph(_df, version):
+    """Graphe personnes–titres (acteurs et réalisateurs) en CSR"""
+    return CollaborationGraph(_df)
+
+@st.cache_resource(max_entries=1)
+def load_figure_cache(version):
+    """Cache LRU des figures Plotly allégées, partagé entre les sessions"""
+    return FigureCache(
+        max_entries=int(os.environ.get('NETFLIX_FIGURE_CACHE_ENTRIES', 256)),
+        max_bytes=int(float(os.environ.get('NETFLIX_FIGURE_CACHE_MB', 64)) * 2**20)
+    )
+
+def find_profile(data_path):
+    """Profil JSON du catalogue brut (sinon des données nettoyées) rangé à côté des données"""
+    folder = os.path.dirname(data_path)
+    for path in (profile_path(os.path.join(folder, RAW_FILENAME)), profile_path(data_path)):
+        try:
+            fingerprint = file_fingerprint(path)
+        except OSError:
+            continue
+        return path, (fingerprint['size'], fingerprint['mtime_ns'])
+    return None, None
+
+@st.cache_resource(max_entries=1)
+def load_profile(path, version):
+    """Lit le profil des colonnes écrit par profiling.py"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def find_neighbors(data_path):
+    """Table des titres similaires (similarity.py) rangée à côté des données"""
+    path = neighbors_path(data_path)
+    try:
+        fingerprint = file_fingerprint(path)
+    except OSError:
+        return None, None
+    return path, (fingerprint['size'], fingerprint['mtime_ns'])
+
+@st.cache_resource(max_entries=1)
+def load_neighbor_table(path, version):
+    """Lit la table des voisins (k titres similaires par titre)"""
+    return load_neighbors(path)
+
+# Instrumentation optionnelle (NETFLIX_INSTRUMENT=1) : durée, lignes et mémoire de chaque étape
+st.session_state.setdefault('_instrumentation_session', uuid.uuid4().hex[:12])
+st.session_state['_instrumentation_run'] = st.session_state.get('_instrumentation_run', 0) + 1
+recorder = StageRecorder.from_env(session=st.session_state['_instrumentation_session'],
+                                  run=st.session_state['_instrumentation_run'])
+
 # Chargement des données
-with st.spinner('Chargement des données en cours...'):
-    df = load_data()
+data_path, data_version = find_data_file()
+if data_path is None:
+    st.error("Fichier netflix_titles_cleaned.csv non trouvé.")
+    st.info("""
+    Veuillez :
+    1. Placer le fichier dans le même dossier que cette application
+    2. Vérifier le chemin d'accès au fichier
+    """)
+    st.stop()
+
+with st.spinner('Chargement des données en cours...'), recorder.stage('load_data') as stage:
+    df = load_data(data_path, data_version)
+    stage.rows_out = len(df)
 
 if df.empty:
     st.stop()
 
+# Index inversés (les positions de lignes correspondent à l'index de df)
+with recorder.stage('index', rows_in=len(df)):
+    filter_indexes = load_filter_indexes(df, data_version)
+    cube = load_cube(df, filter_indexes, data_version)
+country_index = filter_indexes['country']
+genre_index = filter_indexes['genre']
+
 # Barre latérale - Filtres
 st.sidebar.title("Configuration de l'analyse")
 
@@ -186,12 +267,7 @@ year_range = st.sidebar.slider(
 )
 
 # Extraction des pays pour le filtre
-all_countries = []
-for countries in df['countries_list']:
-    all_countries.extend(countries)
-
-country_counts = Counter(all_countries)
-top_countries = sorted([country for country, _ in country_counts.most_common(20)])
+top_countries = sorted(country_index.most_common(20))
 
 st.sidebar.markdown("**Sélection des pays**")
 selected_countries = st.sidebar.multiselect(
@@ -201,12 +277,7 @@ selected_countries = st.sidebar.multiselect(
 )
 
 # Extraction des genres pour le filtre
-all_genres = []
-for genres in df['genres_list']:
-    all_genres.extend(genres)
-
-genre_counts = Counter(all_genres)
-top_genres = sorted([genre for genre, _ in genre_counts.most_common(15)])
+top_genres = sorted(genre_index.most_common(15))
 
 st.sidebar.markdown("**Sélection des genres**")
 selected_genres = st.sidebar.multiselect(
@@ -215,78 +286,87 @@ selected_genres = st.sidebar.multiselect(
     default=['Dramas', 'Comedies', 'Action & Adventure', 'Documentaries', 'International Movies']
 )
 
-# Application des filtres
-filtered_df = df.copy()
-
-# Filtre par type
-if content_type:
-    filtered_df = filtered_df[filtered_df['type'].isin(content_type)]
-
-# Filtre par période
-filtered_df = filtered_df[
-    (filtered_df['release_year'] >= year_range[0]) & 
-    (filtered_df['release_year'] <= year_range[1])
-]
-
-# Filtre par pays
-if selected_countries:
-    mask = filtered_df['country'].apply(
-        lambda x: any(country in str(x) for country in selected_countries) if pd.notna(x) else False
-    )
-    filtered_df = filtered_df[mask]
-
-# Filtre par genres
-if selected_genres:
-    mask = filtered_df['listed_in'].apply(
-        lambda x: any(genre in str(x) for genre in selected_genres) if pd.notna(x) else False
-    )
-    filtered_df = filtered_df[mask]
+# Application des filtres (mémorisée par état normalisé de la barre latérale)
+filter_cache = load_filter_cache(df, filter_indexes, data_version)
+filter_key = filter_cache.key(content_type, year_range, selected_countries, selected_genres)
+
+# Sections du tableau de bord : chacune déclare ses entrées et n'est
+# recalculée que si elles ont changé depuis l'exécution précédente
+# (ou si le fichier de données a changé)
+sections = SectionRunner(st.session_state, data_version, recorder)
+
+# Figures : section de la session, puis cache partagé entre les sessions,
+# chacune mémorisée selon les entrées de son propre graphique
+figure_cache = load_figure_cache(data_version)
+chart_payloads = {}
+
+def chart(name, inputs, build):
+    """Figure du graphique name (None si rien à afficher), construite seulement si ses entrées sont nouvelles"""
+    cached = sections.run(name, inputs, lambda: figure_cache.figure(name, inputs, build))
+    if cached.figure is not None:
+        chart_payloads[name] = cached
+    return cached.figure
+
+# Lignes filtrées et agrégats : calculés seulement si une section en a besoin
+get_filtered_view = sections.lazy(
+    'lignes_filtrees', filter_key,
+    lambda: filter_cache.filter(content_type, year_range, selected_countries, selected_genres)
+)
+get_summary = sections.lazy(
+    'agregats', (filter_key, tuple(selected_countries)),
+    lambda: cube.slice(content_type, year_range, selected_countries, selected_genres).summary(selected_countries)
+)
 
 # Section 1 : Vue d'ensemble
 st.markdown('<div class="section-title">Vue d\'ensemble des données filtrées</div>', unsafe_allow_html=True)
 
+total_count, films_count, series_count, avg_year, min_year, max_year = sections.run(
+    'indicateurs', filter_key,
+    lambda: (get_summary().total,
+             int(get_summary().type_totals.get('Movie', 0)),
+             int(get_summary().type_totals.get('TV Show', 0)),
+             *get_summary().year_stats())
+)
+
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     st.markdown(f"""
     <div class='metric-container'>
         <div style='font-size: 1.2rem; font-weight: 600; color: #333; margin-bottom: 0.5rem;'>Productions totales</div>
-        <div style='font-size: 2rem; font-weight: 700; color: #E50914;'>{len(filtered_df):,}</div>
+        <div style='font-size: 2rem; font-weight: 700; color: #E50914;'>{total_count:,}</div>
     </div>
     """, unsafe_allow_html=True)
 
 with col2:
-    films_count = len(filtered_df[filtered_df['type'] == 'Movie'])
     st.markdown(f"""
     <div class='metric-container'>
         <div style='font-size: 1.2rem; font-weight: 600; color: #333; margin-bottom: 0.5rem;'>Films</div>
         <div style='font-size: 2rem; font-weight: 700; color: #E50914;'>{films_count:,}</div>
         <div style='font-size: 0.9rem; color: #666; margin-top: 0.2rem;'>
-            {films_count/len(filtered_df)*100:.1f}% du total
+            {films_count/total_count*100:.1f}% du total
         </div>
     </div>
     """, unsafe_allow_html=True)
 
 with col3:
-    series_count = len(filtered_df[filtered_df['type'] == 'TV Show'])
     st.markdown(f"""
     <div class='metric-container'>
         <div style='font-size: 1.2rem; font-weight: 600; color: #333; margin-bottom: 0.5rem;'>Séries TV</div>
         <div style='font-size: 2rem; font-weight: 700; color: #E50914;'>{series_count:,}</div>
         <div style='font-size: 0.9rem; color: #666; margin-top: 0.2rem;'>
-            {series_count/len(filtered_df)*100:.1f}% du total
+            {series_count/total_count*100:.1f}% du total
         </div>
     </div>
     """, unsafe_allow_html=True)
 
 with col4:
-    avg_year = filtered_df['release_year'].mean()
     st.markdown(f"""
     <div class='metric-container'>
         <div style='font-size: 1.2rem; font-weight: 600; color: #333; margin-bottom: 0.5rem;'>Année moyenne</div>
         <div style='font-size: 2rem; font-weight: 700; color: #E50914;'>{int(avg_year)}</div>
         <div style='font-size: 0.9rem; color: #666; margin-top: 0.2rem;'>
-            Période : {int(filtered_df['release_year'].min())} - {int(filtered_df['release_year'].max())}
+            Période : {int(min_year)} - {int(max_year)}
         </div>
     </div>
     """, unsafe_allow_html=True)
@@ -295,97 +375,43 @@ with col4:
 st.markdown('<div class="section-title">Analyse temporelle des productions</div>', unsafe_allow_html=True)
 
 # Onglets pour différentes analyses temporelles
-tab1, tab2, tab3 = st.tabs(["Évolution globale", "Comparaison par pays", "Analyse par genre"])
+# (on_change="rerun" : seul l'onglet ouvert est calculé)
+tab1, tab2, tab3 = st.tabs(
+    ["Évolution globale", "Comparaison par pays", "Analyse par genre"],
+    key='onglets_temporels',
+    on_change='rerun'
+)
 
 with tab1:
     # Évolution globale du nombre de productions
-    yearly_counts = filtered_df['release_year'].value_counts().sort_index()
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=yearly_counts.index,
-        y=yearly_counts.values,
-        mode='lines+markers',
-        line=dict(color='#E50914', width=3),
-        marker=dict(size=6, color='#E50914'),
-        name='Nombre de productions'
-    ))
-    
-    fig.update_layout(
-        title=f'Évolution du nombre de productions ({year_range[0]}-{year_range[1]})',
-        xaxis_title="Année",
-        yaxis_title="Nombre de productions",
-        hovermode='x unified',
-        template='plotly_white',
-        height=500,
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    if tab1.open:
+        fig = chart(
+            'evolution_globale', (filter_key, tuple(year_range)),
+            lambda: yearly_figure(get_summary().year_counts, year_range)
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
 with tab2:
     # Comparaison de l'évolution entre pays
-    if selected_countries:
-        fig = go.Figure()
-        
-        colors = ['#E50914', '#221F1F', '#564d4d', '#808080', '#A9A9A9']
-        
-        for i, country in enumerate(selected_countries[:5]):
-            mask = filtered_df['country'].str.contains(country, na=False)
-            country_counts = filtered_df[mask]['release_year'].value_counts().sort_index()
-            
-            fig.add_trace(go.Scatter(
-                x=country_counts.index,
-                y=country_counts.values,
-                mode='lines+markers',
-                name=country,
-                line=dict(width=2, color=colors[i % len(colors)]),
-                marker=dict(size=5)
-            ))
-        
-        fig.update_layout(
-            title='Évolution comparée par pays',
-            xaxis_title="Année",
-            yaxis_title="Nombre de productions",
-            hovermode='x unified',
-            template='plotly_white',
-            height=500
+    if not selected_countries:
+        st.info("Veuillez sélectionner au moins un pays dans la barre latérale pour afficher cette comparaison.")
+    elif tab2.open:
+        fig = chart(
+            'comparaison_pays', (filter_key, tuple(selected_countries[:5])),
+            lambda: country_figure(get_summary().year_by_country, selected_countries[:5])
         )
-        
         st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Veuillez sélectionner au moins un pays dans la barre latérale pour afficher cette comparaison.")
 
 with tab3:
     # Évolution des genres
-    if selected_genres:
-        fig = go.Figure()
-        
-        for genre in selected_genres[:5]:
-            mask = filtered_df['listed_in'].str.contains(genre, na=False)
-            genre_counts = filtered_df[mask]['release_year'].value_counts().sort_index()
-            
-            fig.add_trace(go.Scatter(
-                x=genre_counts.index,
-                y=genre_counts.values,
-                mode='lines+markers',
-                name=genre,
-                line=dict(width=2),
-                marker=dict(size=5)
-            ))
-        
-        fig.update_layout(
-            title='Évolution de la popularité des genres',
-            xaxis_title="Année",
-            yaxis_title="Nombre de productions",
-            hovermode='x unified',
-            template='plotly_white',
-            height=500
+    if not selected_genres:
+        st.info("Veuillez sélectionner au moins un genre dans la barre latérale pour afficher cette analyse.")
+    elif tab3.open:
+        fig = chart(
+            'analyse_genres', (filter_key, tuple(selected_genres[:5])),
+            lambda: genre_figure(get_summary().year_by_genre, selected_genres[:5])
         )
-        
         st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Veuillez sélectionner au moins un genre dans la barre latérale pour afficher cette analyse.")
 
 # Section 3 : Analyse comparative entre pays
 if selected_countries and len(selected_countries) >= 2:
@@ -395,129 +421,30 @@ if selected_countries and len(selected_countries) >= 2:
     
     with col1:
         # Heatmap de popularité des genres par pays
-        heatmap_data = []
-        
-        for country in selected_countries[:6]:
-            mask = filtered_df['country'].str.contains(country, na=False)
-            country_df = filtered_df[mask]
-            
-            country_genres = []
-            for genres in country_df['genres_list']:
-                country_genres.extend(genres)
-            
-            genre_counts = Counter(country_genres)
-            country_row = {'Pays': country}
-            
-            # Prendre les genres les plus populaires pour ce pays
-            for genre, count in genre_counts.most_common(8):
-                if genre in selected_genres[:8]:
-                    country_row[genre] = count
-            
-            heatmap_data.append(country_row)
-        
-        if heatmap_data:
-            heatmap_df = pd.DataFrame(heatmap_data).set_index('Pays').fillna(0)
-            
-            fig = px.imshow(
-                heatmap_df,
-                labels=dict(x="Genres", y="Pays", color="Nombre de productions"),
-                title="Popularité des genres par pays",
-                color_continuous_scale='Reds',
-                aspect='auto'
-            )
-            
-            fig.update_layout(height=400)
+        fig = chart(
+            'heatmap_genres_pays', (filter_key, tuple(selected_countries[:6]), tuple(selected_genres[:8])),
+            lambda: genre_heatmap_figure(get_summary().crosstab, selected_countries[:6], selected_genres[:8])
+        )
+        if fig is not None:
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Répartition Films vs Séries par pays
-        type_data = []
-        
-        for country in selected_countries[:5]:
-            mask = filtered_df['country'].str.contains(country, na=False)
-            country_df = filtered_df[mask]
-            
-            movies = len(country_df[country_df['type'] == 'Movie'])
-            shows = len(country_df[country_df['type'] == 'TV Show'])
-            total = movies + shows
-            
-            if total > 0:
-                type_data.append({
-                    'Pays': country,
-                    'Type': 'Films',
-                    'Pourcentage': (movies / total) * 100
-                })
-                type_data.append({
-                    'Pays': country,
-                    'Type': 'Séries TV',
-                    'Pourcentage': (shows / total) * 100
-                })
-        
-        if type_data:
-            type_df = pd.DataFrame(type_data)
-            
-            fig = px.bar(
-                type_df,
-                x='Pays',
-                y='Pourcentage',
-                color='Type',
-                barmode='stack',
-                color_discrete_map={'Films': '#E50914', 'Séries TV': '#221F1F'},
-                title="Répartition Films vs Séries TV par pays",
-                labels={'Pourcentage': 'Pourcentage (%)'}
-            )
-            
-            fig.update_layout(height=400)
+        fig = chart(
+            'films_series_pays', (filter_key, tuple(selected_countries[:5])),
+            lambda: type_split_figure(get_summary().type_by_country, selected_countries[:5])
+        )
+        if fig is not None:
             st.plotly_chart(fig, use_container_width=True)
 
 # Section 4 : Observations et tendances
 st.markdown('<div class="section-title">Observations et tendances</div>', unsafe_allow_html=True)
 
 # Calculer des statistiques intéressantes
-observations = []
-
-# 1. Genre dominant
-if len(filtered_df) > 0:
-    all_filtered_genres = []
-    for genres in filtered_df['genres_list']:
-        all_filtered_genres.extend(genres)
-    
-    if all_filtered_genres:
-        genre_counter = Counter(all_filtered_genres)
-        top_genre, top_count = genre_counter.most_common(1)[0]
-        observations.append(f"**Genre le plus populaire** : {top_genre} ({top_count} occurrences)")
-
-# 2. Pays dominant
-if selected_countries:
-    country_stats = []
-    for country in selected_countries:
-        mask = filtered_df['country'].str.contains(country, na=False)
-        count = filtered_df[mask].shape[0]
-        if count > 0:
-            country_stats.append((country, count))
-    
-    if country_stats:
-        top_country = max(country_stats, key=lambda x: x[1])
-        observations.append(f"**Pays le plus représenté** : {top_country[0]} ({top_country[1]} productions)")
-
-# 3. Tendance temporelle
-if len(filtered_df) >= 2:
-    earliest_year = filtered_df['release_year'].min()
-    latest_year = filtered_df['release_year'].max()
-    
-    earliest_count = filtered_df[filtered_df['release_year'] == earliest_year].shape[0]
-    latest_count = filtered_df[filtered_df['release_year'] == latest_year].shape[0]
-    
-    if earliest_count > 0:
-        growth_rate = ((latest_count - earliest_count) / earliest_count) * 100
-        observations.append(f"**Tendance** : {growth_rate:+.1f}% de variation entre {int(earliest_year)} et {int(latest_year)}")
-
-# 4. Durée moyenne des films
-films_df = filtered_df[filtered_df['type'] == 'Movie']
-if len(films_df) > 0 and 'duration_min' in films_df.columns:
-    avg_duration = films_df['duration_min'].mean()
-    if not pd.isna(avg_duration):
-        observations.append(f"**Durée moyenne des films** : {avg_duration:.1f} minutes")
+observations = sections.run(
+    'observations', (filter_key, tuple(selected_countries)),
+    lambda: build_observations(get_summary(), selected_countries)
+)
 
 # Afficher les observations
 if observations:
@@ -533,45 +460,234 @@ else:
 # Section 5 : Exploration des données
 st.markdown('<div class="section-title">Exploration des données</div>', unsafe_allow_html=True)
 
-with st.expander("Afficher les statistiques descriptives", expanded=False):
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("**Distribution par année**")
-        year_dist = filtered_df['release_year'].value_counts().sort_index()
-        st.dataframe(
-            year_dist.reset_index().rename(columns={'release_year': 'Année', 'count': 'Nombre'}).head(15),
-            use_container_width=True,
-            hide_index=True
+# Les expanders ne sont calculés qu'une fois ouverts
+with st.expander("Afficher les statistiques descriptives", expanded=False,
+                 key='expander_statistiques', on_change='rerun') as stats_expander:
+    if stats_expander.open:
+        year_dist, country_dist = sections.run(
+            'statistiques', (filter_key, tuple(selected_countries)),
+            lambda: (
+                get_summary().year_counts.rename_axis('Année').reset_index(name='Nombre').head(15),
+                [(country, int(count)) for country, count in get_summary().country_totals.items() if count > 0]
+            )
         )
-    
-    with col2:
-        if selected_countries:
-            st.markdown("**Distribution par pays**")
-            country_dist = []
-            for country in selected_countries:
-                mask = filtered_df['country'].str.contains(country, na=False)
-                count = filtered_df[mask].shape[0]
-                if count > 0:
-                    country_dist.append((country, count))
-            
-            if country_dist:
-                country_df = pd.DataFrame(country_dist, columns=['Pays', 'Nombre'])
-                st.dataframe(
-                    country_df.sort_values('Nombre', ascending=False),
-                    use_container_width=True,
-                    hide_index=True
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Distribution par année**")
+            st.dataframe(
+                year_dist,
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        with col2:
+            if selected_countries:
+                st.markdown("**Distribution par pays**")
+                
+                if country_dist:
+                    country_df = pd.DataFrame(country_dist, columns=['Pays', 'Nombre'])
+                    st.dataframe(
+                        country_df.sort_values('Nombre', ascending=False),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+
+# Recherche plein texte : index inversé des mots, dernier mot lu comme préfixe
+with st.expander("Rechercher un titre ou une personne", expanded=False,
+                 key='expander_recherche', on_change='rerun') as search_expander:
+    if search_expander.open:
+        query_col, scope_col = st.columns([3, 1])
+        with query_col:
+            query = st.text_input(
+                "Titre, réalisateur, acteur ou mots de la description",
+                key='recherche_requete',
+                placeholder="ex. : stranger things, scorsese, heist"
+            )
+        with scope_col:
+            within_filters = st.checkbox("Dans les données filtrées", value=True, key='recherche_filtres')
+
+        if query.strip():
+            with st.spinner("Construction de l'index de recherche..."):
+                search_index = load_search_index(df, data_version)
+            mask = sections.run(
+                'recherche_masque', filter_key,
+                lambda: member_mask(get_filtered_view())
+            ) if within_filters else None
+            result = search_index.search(query, limit=50, mask=mask)
+            if result.total:
+                search_cols = [col for col in ['title', 'type', 'release_year', 'director', 'cast']
+                               if col in df.columns]
+                matches = FilteredView(df, result.rows).frame(search_cols)
+                matches['score'] = result.scores.round(2)
+                st.caption(
+                    f"{result.total:,} titres trouvés en {result.seconds * 1000:.1f} ms"
+                    + (f" — les {len(matches)} plus pertinents" if result.total > len(matches) else "")
                 )
+                st.dataframe(matches, use_container_width=True, hide_index=True)
+            else:
+                st.info("Aucun titre ne correspond à cette recherche.")
+
+# Explorateur : tri et pagination côté serveur, seule la page affichée est envoyée
+with st.expander("Explorer les données filtrées", expanded=False,
+                 key='expander_explorateur', on_change='rerun') as explorer_expander:
+    if explorer_expander.open:
+        available_cols = [col for col in DISPLAY_COLUMNS if col in df.columns]
+        sort_col, order_col, size_col = st.columns([2, 2, 1])
+        with sort_col:
+            sort_column = st.selectbox("Trier par", available_cols, key='explorateur_colonne')
+        with order_col:
+            descending = st.radio(
+                "Ordre",
+                [False, True],
+                format_func=lambda desc: "Décroissant" if desc else "Croissant",
+                horizontal=True,
+                key='explorateur_ordre'
+            )
+        with size_col:
+            page_size = st.selectbox("Lignes par page", PAGE_SIZES, index=1, key='explorateur_taille')
 
-with st.expander("Afficher un échantillon des données filtrées", expanded=False):
-    display_cols = ['title', 'type', 'release_year', 'country', 'rating', 'duration', 'listed_in']
-    available_cols = [col for col in display_cols if col in filtered_df.columns]
-    
-    st.dataframe(
-        filtered_df[available_cols].head(30),
-        use_container_width=True,
-        height=400
-    )
+        sort_index = load_sort_index(df, data_version)
+        sorted_view = sections.run(
+            'explorateur_tri', (filter_key, sort_column, descending),
+            lambda: sort_index.sort(get_filtered_view(), sort_column, descending)
+        )
+        pages = page_count(len(sorted_view), page_size)
+        page = min(int(st.number_input("Page", min_value=1, value=1, step=1, key='explorateur_page')), pages)
+        page_df = page_frame(sorted_view, available_cols, page, page_size)
+        selection = st.dataframe(
+            page_df,
+            use_container_width=True,
+            height=400,
+            on_select='rerun',
+            selection_mode='single-row',
+            key='explorateur_selection'
+        )
+        if len(page_df):
+            st.caption(
+                f"Lignes {page_df.index[0]:,} à {page_df.index[-1]:,} sur {len(sorted_view):,} "
+                f"— page {page:,} sur {pages:,}. Sélectionnez une ligne pour afficher les titres similaires."
+            )
+        else:
+            st.caption("Aucune ligne ne correspond aux filtres.")
+
+        # Titres similaires : simple lecture de la table précalculée par similarity.py
+        selected_rows = [row for row in selection.selection.rows if row < len(page_df)]
+        if selected_rows:
+            position = int(page_positions(sorted_view, page, page_size)[selected_rows[0]])
+            neighbors_file, neighbors_version = find_neighbors(data_path)
+            if neighbors_file is None:
+                st.info(f"Aucune table de titres similaires. Générez-la avec : "
+                        f"python similarity.py {os.path.basename(data_path)}")
+            else:
+                neighbor_table = load_neighbor_table(neighbors_file, neighbors_version)
+                if not neighbors_are_fresh(neighbor_table, data_path):
+                    st.warning(f"{os.path.basename(data_path)} a changé depuis le calcul des titres similaires : "
+                               "régénérez la table avec similarity.py.")
+                else:
+                    positions, scores = similar_titles(neighbor_table, position)
+                    st.markdown(f"**Titres similaires à « {df['title'].iloc[position]} »**")
+                    if len(positions):
+                        similar_df = FilteredView(df, positions).frame(available_cols)
+                        similar_df['similarité'] = scores.round(3)
+                        st.dataframe(similar_df, use_container_width=True, hide_index=True)
+                    else:
+                        st.caption("Ce titre ne partage aucune personne ni aucun mot de description peu fréquent "
+                                   "avec un autre titre.")
+
+# Collaborations : graphe personnes–titres de tout le catalogue (hors filtres)
+with st.expander("Explorer les collaborations entre personnes", expanded=False,
+                 key='expander_collaborations', on_change='rerun') as collaboration_expander:
+    if collaboration_expander.open:
+        first_col, second_col = st.columns(2)
+        with first_col:
+            person_name = st.text_input("Acteur ou réalisateur", key='collaboration_personne',
+                                        placeholder="nom exact, ex. : Martin Scorsese")
+        with second_col:
+            other_name = st.text_input("Seconde personne (facultatif)", key='collaboration_cible',
+                                       placeholder="pour les titres communs et le plus court chemin")
+
+        if person_name.strip():
+            with st.spinner("Construction du graphe des collaborations..."):
+                graph = load_collaboration_graph(df, data_version)
+
+            def resolve(name):
+                """Identifiant de la personne, ou suggestions (noms qui commencent pareil) si inconnue"""
+                person = graph.person_id(name.strip())
+                if person < 0:
+                    suggestions = graph.people[graph.complete(name.strip(), limit=5)]
+                    st.warning(f"« {name.strip()} » n'apparaît ni dans cast ni dans director."
+                               + (f" Vouliez-vous dire : {', '.join(suggestions)} ?" if len(suggestions) else ""))
+                return person
+
+            person = resolve(person_name)
+            if person >= 0:
+                directed = len(graph.titles(person, role=DIRECTOR))
+                st.markdown(f"**{person_name.strip()}** : {len(graph.titles(person)):,} titres"
+                            + (f", dont {directed:,} comme réalisateur" if directed else ""))
+                partners_col, cast_col = st.columns(2)
+                with partners_col:
+                    partners, counts = graph.collaborators(person)
+                    st.caption(f"{len(partners):,} collaborateurs — les plus fréquents")
+                    st.dataframe(pd.DataFrame({'personne': graph.people[partners[:20]],
+                                               'titres en commun': counts[:20]}),
+                                 use_container_width=True, hide_index=True)
+                with cast_col:
+                    if directed:
+                        actors, counts = graph.repeat_cast(person)
+                        st.caption(f"Acteurs récurrents (au moins 2 titres réalisés) : {len(actors):,}")
+                        st.dataframe(pd.DataFrame({'acteur': graph.people[actors[:20]],
+                                                   'titres réalisés ensemble': counts[:20]}),
+                                     use_container_width=True, hide_index=True)
+
+                other = resolve(other_name) if other_name.strip() else -1
+                if other >= 0 and other != person:
+                    shared = graph.co_appearances(person, other)
+                    st.markdown(f"**Titres communs** : {len(shared):,}"
+                                + (" — " + ", ".join(df['title'].iloc[shared[:10]].astype(str)) if len(shared) else ""))
+                    path = graph.shortest_path(person, other)
+                    if path is None:
+                        st.info("Aucune chaîne de collaborations ne relie ces deux personnes.")
+                    else:
+                        steps = [graph.people[node] if i % 2 == 0 else f"« {df['title'].iloc[node]} »"
+                                 for i, node in enumerate(path)]
+                        st.markdown(f"**Plus court chemin** ({len(path) // 2} titre(s)) : " + " → ".join(steps))
+
+with st.expander("Afficher l'empreinte mémoire des données", expanded=False,
+                 key='expander_memoire', on_change='rerun') as memory_expander:
+    if memory_expander.open:
+        # Calculée seulement à l'ouverture : le chargement ne crée plus les listes Python
+        with st.spinner("Mesure de l'empreinte mémoire..."):
+            memory = load_memory_report(df, data_path, data_version)
+        total = memory.loc['Total']
+        st.markdown(
+            f"**{total['octets après'] / 2**20:.1f} Mo** en mémoire par processus "
+            f"(contre {total['octets avant'] / 2**20:.1f} Mo sans types compacts)"
+        )
+        st.dataframe(memory, use_container_width=True)
+
+# Profil des colonnes précalculé par profiling.py : le CSV profilé n'est pas relu
+with st.expander("Afficher le profil des colonnes", expanded=False,
+                 key='expander_profil', on_change='rerun') as profile_expander:
+    if profile_expander.open:
+        profile_file, profile_version = find_profile(data_path)
+        if profile_file is None:
+            st.info(f"Aucun profil trouvé. Générez-le avec : python profiling.py {RAW_FILENAME}")
+        else:
+            profile = load_profile(profile_file, profile_version)
+            st.markdown(
+                f"**{profile['source']}** : {profile['rows']:,} lignes, {len(profile['columns'])} colonnes "
+                f"(profil calculé en {profile['seconds']:.1f} s)"
+            )
+            source_file = os.path.join(os.path.dirname(profile_file), profile['source'])
+            if os.path.exists(source_file) and not is_fresh(profile, source_file):
+                st.warning(f"{profile['source']} a changé depuis le calcul du profil.")
+            st.dataframe(profile_frame(profile), use_container_width=True)
+            st.caption(
+                f"Distinctes : estimation HyperLogLog (erreur typique ±{100 * profile['distinct_relative_error']:.1f} %). "
+                "Min, max et moyenne portent sur les valeurs des colonnes numériques "
+                "et sur la longueur des textes. ≥ : effectif minimal (résumé borné)."
+            )
 
 # Section 6 : Export des résultats
 st.markdown('<div class="section-title">Export des résultats</div>', unsafe_allow_html=True)
@@ -581,19 +697,26 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown("**Téléchargement des données**")
     st.markdown("""
-    Exportez les données filtrées au format CSV pour une analyse ultérieure
-    ou pour les intégrer dans d'autres outils.
+    Exportez les données filtrées au format CSV (éventuellement compressé) ou
+    Parquet pour une analyse ultérieure ou pour les intégrer dans d'autres outils.
     """)
     
-    # Conversion en CSV
-    csv_data = filtered_df.to_csv(index=False).encode('utf-8')
+    export_format = st.radio(
+        "Format d'export :",
+        options=available_formats(),
+        format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+        horizontal=True
+    )
+    label, extension, mime = EXPORT_FORMATS[export_format]
     
+    # Le fichier n'est généré (par blocs) qu'au clic sur le bouton
     st.download_button(
         label="Télécharger les données filtrées",
-        data=csv_data,
-        file_name=f"donnees_netflix_filtrees_{year_range[0]}_{year_range[1]}.csv",
-        mime="text/csv",
-        help="Cliquez pour télécharger les données au format CSV"
+        data=recorder.deferred('export', lambda: export_file(get_filtered_view(), export_format)),
+        file_name=f"donnees_netflix_filtrees_{year_range[0]}_{year_range[1]}{extension}",
+        mime=mime,
+        on_click="ignore",
+        help=f"Cliquez pour télécharger les données au format {label}"
     )
 
 with col2:
@@ -610,6 +733,37 @@ with col2:
     filtrées et exportées directement depuis l'interface.
     """)
 
+# Statistiques de recalcul (cache des filtres et sections)
+cache_stats = filter_cache.stats()
+st.sidebar.caption(
+    f"Cache des filtres : {cache_stats['hits']} succès, {cache_stats['misses']} échecs, "
+    f"{cache_stats['entries']} entrées ({cache_stats['bytes'] / 2**20:.1f} Mo)"
+)
+if chart_payloads:
+    figure_stats = figure_cache.stats()
+    st.sidebar.caption(
+        "Graphiques envoyés : "
+        + ", ".join(f"{name} {cached.payload / 1024:.1f} Ko" for name, cached in chart_payloads.items())
+        + f" — total {sum(cached.payload for cached in chart_payloads.values()) / 1024:.1f} Ko "
+        f"(sans allègement : {sum(cached.original for cached in chart_payloads.values()) / 1024:.1f} Ko) ; "
+        f"cache des figures : {figure_stats['hits']} succès, {figure_stats['misses']} échecs"
+    )
+st.sidebar.caption(
+    f"Sections recalculées : {', '.join(sections.computed) or 'aucune'} — "
+    f"réutilisées : {', '.join(sections.reused) or 'aucune'}"
+)
+
+# Panneau de débogage de l'instrumentation (mesures de cette exécution)
+if recorder.enabled:
+    recorder.finish()
+    with st.expander("Instrumentation (débogage)", expanded=False):
+        stages = recorder.frame()
+        stages['ms'] = stages.pop('seconds') * 1000
+        stages['mémoire (Mo)'] = stages.pop('memory_delta') / 2**20
+        st.caption(f"Session {recorder.session}, exécution n° {recorder.run} — journal : {recorder.log_path}")
+        st.dataframe(stages, use_container_width=True, hide_index=True)
+    recorder.flush()
+
 # Pied de page
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,122 @@
+# BENCHMARK : GRAPHE DES COLLABORATIONS
+"""Temps de construction du graphe personnes–titres et temps des requêtes selon la taille du catalogue
+
+Pour chaque taille, le catalogue synthétique nettoyé de bench_scaling.py est
+réutilisé (ou généré dans --data-dir), puis on mesure :
+
+- construction : CollaborationGraph sur le DataFrame compact (meilleur temps) ;
+- requêtes, chacune chronométrée séparément sur --queries personnes tirées au
+  hasard (p50, p90 et maximum en millisecondes) : titres d'une personne,
+  collaborateurs, acteurs récurrents d'un réalisateur, titres communs à deux
+  personnes et plus court chemin entre deux personnes. Les collaborateurs
+  sont aussi mesurés pour les personnes aux plus nombreux titres.
+
+Usage : python benchmarks/bench_collaboration.py --sizes 10k,100k,1m --output collaboration.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from bench_scaling import best_of, environment, prepare  # noqa: E402
+from collaboration import DIRECTOR, CollaborationGraph  # noqa: E402
+from compact import load_compact  # noqa: E402
+from synthetic import format_size, parse_size  # noqa: E402
+
+
+def query_times(func, arguments):
+    """Durée (s) de func(*args) pour chaque jeu d'arguments"""
+    timings = np.empty(len(arguments))
+    for i, args in enumerate(arguments):
+        start = time.perf_counter()
+        func(*args)
+        timings[i] = time.perf_counter() - start
+    return timings
+
+
+def bench_size(setup, repeat, queries, seed):
+    """Mesures d'une taille de catalogue : liste de {step, seconds, ...}"""
+    rows = setup['rows']
+    df = load_compact(setup['cleaned'])
+    results = []
+
+    seconds, graph = best_of(lambda: CollaborationGraph(df), repeat)
+    results.append({'rows': rows, 'step': 'construction', 'seconds': round(seconds, 6), 'repeat': repeat,
+                    'people': len(graph), 'edges': graph.n_edges, 'bytes': graph.nbytes})
+
+    rng = np.random.default_rng(seed)
+    people = rng.integers(0, len(graph), size=(queries, 2))
+    directors = np.unique(np.repeat(np.arange(len(graph)), np.diff(graph.person_indptr))
+                          [(graph.person_roles & DIRECTOR) > 0])
+    degrees = np.diff(graph.person_indptr)
+    hubs = np.argsort(-degrees, kind='stable')[:queries]
+    steps = {
+        'titres': (graph.titles, [(a,) for a, _ in people]),
+        'collaborateurs': (graph.collaborators, [(a,) for a, _ in people]),
+        'collaborateurs (plus prolifiques)': (graph.collaborators, [(a,) for a in hubs]),
+        'acteurs récurrents': (graph.repeat_cast, [(d,) for d in rng.choice(directors, queries)]
+                               if len(directors) else []),
+        'titres communs': (graph.co_appearances, [(a, b) for a, b in people]),
+        'plus court chemin': (graph.shortest_path, [(a, b) for a, b in people]),
+    }
+    for step, (func, arguments) in steps.items():
+        if not arguments:
+            continue
+        timings = query_times(func, arguments) * 1000
+        results.append({'rows': rows, 'step': step, 'seconds': round(float(timings.sum()) / 1000, 6),
+                        'queries': len(arguments),
+                        'p50_ms': round(float(np.percentile(timings, 50)), 4),
+                        'p90_ms': round(float(np.percentile(timings, 90)), 4),
+                        'max_ms': round(float(timings.max()), 4)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10k,100k,1m',
+                        help="tailles séparées par des virgules, ex. 10k,100k,1m (défaut : %(default)s)")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'netflix_bench'),
+                        help="dossier des catalogues générés, partagé avec bench_scaling.py")
+    parser.add_argument('--repeat', type=int, default=3, help="constructions chronométrées par taille")
+    parser.add_argument('--queries', type=int, default=200, help="requêtes chronométrées par type")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="fichier JSON des résultats")
+    args = parser.parse_args()
+
+    try:
+        sizes = [parse_size(size) for size in args.sizes.split(',')]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.queries < 1:
+        parser.error("--queries doit être au moins 1")
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    results = []
+    for rows in sizes:
+        setup = prepare(rows, args.data_dir, args.seed, workers=1, chunk_rows=1_000_000)
+        size_results = bench_size(setup, args.repeat, args.queries, args.seed)
+        results.extend(size_results)
+
+        build = size_results[0]
+        print(f"\n{format_size(rows)} : {build['people']:,} personnes, {build['edges']:,} arêtes, "
+              f"{build['bytes'] / 2**20:.1f} Mo, construction en {build['seconds']:.3f} s")
+        print(f"{'requête':<36}{'p50 (ms)':>10}{'p90 (ms)':>10}{'max (ms)':>10}")
+        for item in size_results[1:]:
+            print(f"{item['step']:<36}{item['p50_ms']:>10.3f}{item['p90_ms']:>10.3f}{item['max_ms']:>10.3f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(args), 'results': results}, f, indent=2, ensure_ascii=False)
+        print(f"\nRésultats écrits dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
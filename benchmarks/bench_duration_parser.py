@@ -0,0 +1,98 @@
+# BENCHMARK : ANALYSE DE LA COLONNE DURATION
+"""Compare l'ancien extract_number (ligne par ligne) à parse_duration
+
+Usage : python benchmarks/bench_duration_parser.py --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from cleaning import DURATION_PATTERN, parse_duration  # noqa: E402
+
+
+def extract_number(text):
+    """Version d'origine du script d'analyse, appelée une fois par ligne"""
+    if pd.isna(text):
+        return np.nan
+    # Trouver tous les chiffres dans la chaîne
+    import re
+    numbers = re.findall(r'\d+', str(text))
+    return float(numbers[0]) if numbers else np.nan
+
+
+def make_catalog(n_rows, seed=0):
+    """Colonnes type/duration avec la répartition du catalogue (~70 % de films)"""
+    rng = np.random.default_rng(seed)
+    is_movie = rng.random(n_rows) < 0.7
+    minutes = np.clip(rng.normal(100, 28, n_rows), 3, 312).astype(int)
+    seasons = np.minimum(rng.geometric(0.55, n_rows), 17)
+    durations = np.where(is_movie,
+                         [f"{m} min" for m in minutes],
+                         [f"{s} Season" if s == 1 else f"{s} Seasons" for s in seasons]).astype(object)
+    durations[rng.random(n_rows) < 0.001] = np.nan
+    return pd.DataFrame({'type': np.where(is_movie, 'Movie', 'TV Show'), 'duration': durations})
+
+
+def legacy(df):
+    """Séparation d'origine : apply(extract_number) puis np.where"""
+    numeric = df['duration'].apply(extract_number)
+    return (np.where(df['type'] == 'Movie', numeric, np.nan),
+            np.where(df['type'] == 'TV Show', numeric, np.nan))
+
+
+def extract_all(df):
+    """str.extract sur toute la colonne, sans factorisation"""
+    value = pd.to_numeric(df['duration'].str.extract(DURATION_PATTERN)[0])
+    return value.where(df['type'] == 'Movie'), value.where(df['type'] == 'TV Show')
+
+
+def vectorized(df):
+    """parse_duration : expression régulière sur les durées distinctes seulement"""
+    value = parse_duration(df['duration'])['duration_value']
+    return value.where(df['type'] == 'Movie'), value.where(df['type'] == 'TV Show')
+
+
+def best_of(func, repeat):
+    """Meilleur temps (s) sur plusieurs exécutions"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_catalog(args.rows)
+
+    legacy_time, (legacy_min, legacy_seasons) = best_of(lambda: legacy(df), args.repeat)
+    extract_time, _ = best_of(lambda: extract_all(df), args.repeat)
+    parse_time, (parsed_min, parsed_seasons) = best_of(lambda: vectorized(df), args.repeat)
+
+    for expected, result in ((legacy_min, parsed_min), (legacy_seasons, parsed_seasons)):
+        assert np.array_equal(expected, result.to_numpy(dtype=float, na_value=np.nan), equal_nan=True), \
+            "parse_duration ne reproduit pas extract_number"
+
+    print(f"{args.rows:,} lignes, {df['duration'].nunique():,} durées distinctes")
+    print(f"{'méthode':<30}{'temps (s)':>10}{'lignes/s':>14}")
+    for name, elapsed in [('extract_number (apply)', legacy_time),
+                          ('str.extract (colonne)', extract_time),
+                          ('parse_duration', parse_time)]:
+        print(f"{name:<30}{elapsed:>10.3f}{args.rows / elapsed:>14,.0f}")
+    print(f"gain : x{legacy_time / parse_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# BENCHMARK : MÉMOIRE DE L'ÉTAPE DE FILTRAGE
+"""Pic de mémoire (RSS) d'une exécution du bloc de filtres, avant / après
+
+Chaque variante tourne dans un processus séparé. Le catalogue est chargé,
+le pic RSS est remis à zéro (/proc/self/clear_refs sous Linux), puis on
+exécute les filtres et les lectures des sections (échantillon de 30 lignes).
+
+Usage : python benchmarks/bench_filter_memory.py --rows 500000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from filter_index import build_filter_indexes  # noqa: E402
+from filtering import filter_view, normalize_filters, filter_domain  # noqa: E402
+
+VARIANTS = ['copies', 'masque']
+DISPLAY_COLS = ['title', 'type', 'release_year', 'country', 'rating', 'duration', 'listed_in']
+FILTERS = dict(
+    content_type=['Movie'],
+    year_range=(2000, 2021),
+    countries=['United States', 'India', 'United Kingdom', 'Canada', 'France', 'Japan'],
+    genres=['Dramas', 'Comedies', 'Action & Adventure', 'Documentaries', 'International Movies'],
+)
+
+
+def make_catalog(n_rows, seed=0):
+    """Catalogue synthétique au format de netflix_titles_cleaned.csv (colonnes utiles)"""
+    rng = np.random.default_rng(seed)
+    countries = np.array(FILTERS['countries'] + [f"Country {i}" for i in range(60)], dtype=object)
+    genres = np.array(FILTERS['genres'] + [f"Genre {i}" for i in range(30)], dtype=object)
+    country_lists = [list(countries[rng.zipf(1.6, k) % len(countries)])
+                     for k in rng.integers(1, 3, n_rows)]
+    genre_lists = [list(genres[rng.zipf(1.4, k) % len(genres)])
+                   for k in rng.integers(1, 4, n_rows)]
+    return pd.DataFrame({
+        'show_id': [f"s{i}" for i in range(n_rows)],
+        'type': rng.choice(['Movie', 'TV Show'], n_rows, p=[0.7, 0.3]),
+        'title': [f"Title {i}" for i in range(n_rows)],
+        'release_year': rng.integers(1960, 2022, n_rows),
+        'country': [', '.join(c) for c in country_lists],
+        'rating': rng.choice(['TV-MA', 'TV-14', 'R', 'PG-13'], n_rows),
+        'duration': [f"{d} min" for d in rng.integers(60, 180, n_rows)],
+        'listed_in': [', '.join(g) for g in genre_lists],
+        'description': [f"Description of title {i}" for i in range(n_rows)],
+        'duration_min': rng.integers(60, 180, n_rows).astype(float),
+        'genres_list': genre_lists,
+        'countries_list': country_lists,
+    })
+
+
+def legacy_filters(df):
+    """Bloc d'origine de app.py : copie complète puis un DataFrame par filtre"""
+    filtered_df = df.copy()
+    filtered_df = filtered_df[filtered_df['type'].isin(FILTERS['content_type'])]
+    filtered_df = filtered_df[
+        (filtered_df['release_year'] >= FILTERS['year_range'][0]) &
+        (filtered_df['release_year'] <= FILTERS['year_range'][1])
+    ]
+    mask = filtered_df['country'].apply(
+        lambda x: any(country in str(x) for country in FILTERS['countries']) if pd.notna(x) else False
+    )
+    filtered_df = filtered_df[mask]
+    mask = filtered_df['listed_in'].apply(
+        lambda x: any(genre in str(x) for genre in FILTERS['genres']) if pd.notna(x) else False
+    )
+    filtered_df = filtered_df[mask]
+    return len(filtered_df), filtered_df[DISPLAY_COLS].head(30)
+
+
+def mask_filters(df, indexes):
+    """Moteur actuel : un masque NumPy, vue par positions, colonnes à la demande"""
+    key = normalize_filters(filter_domain(df), **FILTERS)
+    view = filter_view(df, indexes, key)
+    return len(view), view.frame(DISPLAY_COLS, limit=30)
+
+
+def rss_kb(field):
+    """Valeur (Ko) d'un champ de /proc/self/status, ou None"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak():
+    """Remet le pic RSS au niveau courant (Linux uniquement)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def run_variant(variant, n_rows):
+    """Mesure une variante dans le processus courant"""
+    df = make_catalog(n_rows)
+    indexes = build_filter_indexes(df) if variant == 'masque' else None
+    reset = reset_peak()
+    before = rss_kb('VmRSS') if reset else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    n_kept, _ = legacy_filters(df) if variant == 'copies' else mask_filters(df, indexes)
+    elapsed = time.perf_counter() - start
+
+    peak = rss_kb('VmHWM') if reset else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'variant': variant,
+        'rows': n_rows,
+        'rows_kept': n_kept,
+        'seconds': round(elapsed, 4),
+        'peak_rss_delta_mb': round((peak - before) / 1024, 1),
+        'frame_mb': round(df.memory_usage(deep=False).sum() / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--variant', choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.rows)))
+        return
+
+    print(f"{'variante':<10}{'lignes':>10}{'retenues':>10}{'temps (s)':>11}{'pic RSS (Mo)':>14}")
+    for variant in VARIANTS:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--rows', str(args.rows), '--variant', variant],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output)
+        print(f"{variant:<10}{result['rows']:>10,}{result['rows_kept']:>10,}"
+              f"{result['seconds']:>11.3f}{result['peak_rss_delta_mb']:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
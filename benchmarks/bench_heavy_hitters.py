@@ -0,0 +1,79 @@
+# BENCHMARK : ACTEURS LES PLUS FRÉQUENTS
+"""Compare « une grande liste + Counter » (section H) à HeavyHitters en mémoire bornée
+
+Usage : python benchmarks/bench_heavy_hitters.py --rows 1000000 --capacity 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from sketches import HeavyHitters  # noqa: E402
+
+
+def make_cast(n_rows, people, seed=0):
+    """Listes d'acteurs (jusqu'à 15 par titre), popularité en loi de Zipf"""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Actor {i}" for i in range(people)], dtype=object)
+    sizes = rng.integers(0, 16, n_rows)
+    ids = (rng.zipf(1.2, int(sizes.sum())) - 1) % people
+    bounds = np.concatenate([[0], np.cumsum(sizes)]).tolist()
+    flat = names[ids].tolist()
+    return [flat[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def legacy(cast_lists, k):
+    """Section H du script d'analyse"""
+    all_actors = []
+    for actors in cast_lists:
+        all_actors.extend(actors)
+    return Counter(all_actors).most_common(k)
+
+
+def measure(func):
+    """(résultat, temps en s, pic de mémoire allouée en octets)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--people', type=int, default=500_000)
+    parser.add_argument('--capacity', type=int, default=10_000)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    cast_lists = make_cast(args.rows, args.people)
+    exact, legacy_time, legacy_peak = measure(lambda: legacy(cast_lists, args.top))
+    sketch, sketch_time, sketch_peak = measure(
+        lambda: HeavyHitters(args.capacity).update_lists(cast_lists))
+
+    top = sketch.most_common(args.top)
+    true_counts = dict(exact)
+    print(f"{args.rows:,} titres, {sketch.n:,} apparitions, capacité {args.capacity:,}")
+    print(f"{'méthode':<26}{'temps (s)':>10}{'pic mémoire (Mo)':>18}")
+    print(f"{'liste + Counter':<26}{legacy_time:>10.3f}{legacy_peak / 2**20:>18.1f}")
+    print(f"{'HeavyHitters':<26}{sketch_time:>10.3f}{sketch_peak / 2**20:>18.1f}")
+    print(f"erreur maximale : {sketch.error} (borne n/(capacité+1) = {sketch.n // (args.capacity + 1)}), "
+          f"top {args.top} garanti : {sketch.guaranteed(args.top)}, "
+          f"identique au comptage exact : {[item for item, _ in top] == list(true_counts)}")
+    for item, count in top:
+        low, high = sketch.bounds(item)
+        print(f"  {item:<16}{true_counts.get(item, '?'):>8}  estimé {low}..{high}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# BENCHMARK : DÉCODAGE DES COLONNES DE LISTES
+"""Compare l'ancien convert_to_list (ligne par ligne) au décodeur en bloc
+
+Usage : python benchmarks/bench_list_decoder.py --rows 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from list_columns import decode_list_column, to_lists  # noqa: E402
+
+
+def convert_to_list(value):
+    """Version d'origine de app.py, appelée une fois par cellule"""
+    if pd.isna(value):
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        if value == '[]' or value == '':
+            return []
+        try:
+            import ast
+            return ast.literal_eval(value)
+        except:
+            items = [item.strip() for item in value.split(',')]
+            return [item for item in items if item]
+    return []
+
+
+def make_column(n_rows, max_items, seed=0):
+    """Colonne au format écrit par to_csv : "['a', 'b']", '[]' ou NaN"""
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"Person {i}" for i in range(5000)] + ["Conan O'Brien", "Kids' TV"]
+    cells = []
+    for size in rng.integers(0, max_items + 1, n_rows):
+        if size == 0:
+            cells.append('[]' if rng.random() < 0.9 else np.nan)
+        else:
+            cells.append(repr([vocabulary[i] for i in rng.integers(0, len(vocabulary), size)]))
+    return pd.Series(cells, dtype=object)
+
+
+def best_of(func, repeat):
+    """Meilleur temps (s) sur plusieurs exécutions"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--max-items', type=int, default=8,
+                        help="nombre maximal d'éléments par cellule (8 ~ cast_list)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    column = make_column(args.rows, args.max_items)
+    n_items = sum(len(convert_to_list(v)) for v in column)
+
+    legacy_time, legacy = best_of(lambda: column.apply(convert_to_list).tolist(), args.repeat)
+    decode_time, (values, offsets) = best_of(lambda: decode_list_column(column), args.repeat)
+    lists_time, lists = best_of(lambda: to_lists(values, offsets), args.repeat)
+
+    assert lists == legacy, "le décodeur en bloc ne reproduit pas convert_to_list"
+
+    print(f"{args.rows:,} lignes, {n_items:,} éléments")
+    print(f"{'méthode':<34}{'temps (s)':>10}{'lignes/s':>14}")
+    rows = [
+        ('convert_to_list (apply)', legacy_time),
+        ('decode_list_column', decode_time),
+        ('decode_list_column + to_lists', decode_time + lists_time),
+    ]
+    for name, elapsed in rows:
+        print(f"{name:<34}{elapsed:>10.3f}{args.rows / elapsed:>14,.0f}")
+    print(f"gain : x{legacy_time / decode_time:.1f} (offsets), "
+          f"x{legacy_time / (decode_time + lists_time):.1f} (listes Python)")
+
+
+if __name__ == '__main__':
+    main()
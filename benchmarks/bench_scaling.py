@@ -0,0 +1,242 @@
+# BENCHMARK : MONTÉE EN CHARGE DU TABLEAU DE BORD
+"""Temps de chargement, filtres, agrégations, graphiques et export selon la taille du catalogue
+
+Pour chaque taille, un catalogue synthétique (synthetic.py) est généré puis
+nettoyé (cleaning.py) une seule fois dans --data-dir, puis on chronomètre ce
+que fait app.py lors d'une exécution avec les filtres par défaut :
+
+- load_data : CSV nettoyé (première lecture, écrit le cache Arrow), puis cache Arrow ;
+- index : index inversés et cube d'agrégation (une fois par version des données) ;
+- filtres : bloc de la barre latérale (options, clé normalisée, lignes filtrées) ;
+- agrégats : SliceSummary, qui calcule en une passe les séries de tous les graphiques ;
+- un chronométrage par graphique (figure Plotly) et pour les observations ;
+- export CSV des lignes filtrées.
+
+Les résultats sont écrits en JSON (--output) et peuvent être comparés à un
+résultat précédent (--compare).
+
+Usage : python benchmarks/bench_scaling.py --sizes 10k,100k,1m --output scaling.json
+        python benchmarks/bench_scaling.py --sizes 10m --data-dir /data/bench
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from aggregates import build_cube  # noqa: E402
+from charts import (country_figure, genre_figure, genre_heatmap_figure,  # noqa: E402
+                    observations, type_split_figure, yearly_figure)
+from cleaning import run as clean  # noqa: E402
+from compact import load_compact  # noqa: E402
+from data_store import sidecar_path  # noqa: E402
+from export import export_file  # noqa: E402
+from filter_index import build_filter_indexes  # noqa: E402
+from filtering import FilterCache  # noqa: E402
+from synthetic import format_size, parse_size, write_catalog  # noqa: E402
+
+# Filtres par défaut de la barre latérale d'app.py
+CONTENT_TYPE = ['Movie', 'TV Show']
+YEAR_RANGE = (2000, 2021)
+COUNTRIES = ['United States', 'India', 'United Kingdom', 'Canada', 'France', 'Japan']
+GENRES = ['Dramas', 'Comedies', 'Action & Adventure', 'Documentaries', 'International Movies']
+
+
+def best_of(func, repeat):
+    """Meilleur temps (s) sur plusieurs exécutions"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def prepare(rows, data_dir, seed, workers, chunk_rows):
+    """CSV brut et CSV nettoyé d'une taille donnée (réutilisés s'ils existent déjà)"""
+    name = f"synthetic_{format_size(rows)}_seed{seed}"
+    raw_path = os.path.join(data_dir, name + '.csv')
+    cleaned_path = os.path.join(data_dir, name + '_cleaned.csv')
+    setup = {'rows': rows, 'raw': raw_path, 'cleaned': cleaned_path, 'generate': None, 'clean': None}
+    if not os.path.exists(raw_path):
+        start = time.perf_counter()
+        write_catalog(raw_path, rows, seed=seed)
+        setup['generate'] = time.perf_counter() - start
+    if not os.path.exists(cleaned_path):
+        start = time.perf_counter()
+        clean(raw_path, cleaned_path, sidecar=False, chunk_rows=chunk_rows, workers=workers)
+        setup['clean'] = time.perf_counter() - start
+    return setup
+
+
+def build_structures(df):
+    """Index inversés et cube d'agrégation (load_filter_indexes, load_cube)"""
+    indexes = build_filter_indexes(df)
+    return indexes, build_cube(df, indexes)
+
+
+def sidebar(df, indexes, cache):
+    """Bloc de la barre latérale : informations, options, puis lignes filtrées"""
+    info = (len(df), df.shape[1], int(df['release_year'].min()), int(df['release_year'].max()),
+            df['type'].nunique())
+    options = (sorted(indexes['country'].most_common(20)), sorted(indexes['genre'].most_common(15)))
+    cache.clear()
+    key = cache.key(CONTENT_TYPE, YEAR_RANGE, COUNTRIES, GENRES)
+    return info, options, key, cache.filter(CONTENT_TYPE, YEAR_RANGE, COUNTRIES, GENRES)
+
+
+def export_csv(view):
+    """Export CSV des lignes filtrées, taille du fichier en octets"""
+    target = export_file(view, 'csv')
+    target.seek(0, os.SEEK_END)
+    size = target.tell()
+    target.close()
+    return size
+
+
+def bench_size(setup, repeat):
+    """Mesures d'une taille de catalogue : liste de {step, seconds, ...}"""
+    rows, cleaned_path = setup['rows'], setup['cleaned']
+    results = []
+
+    def record(step, seconds, **extra):
+        results.append({'rows': rows, 'step': step, 'seconds': round(seconds, 6),
+                        'rows_per_s': round(rows / seconds) if seconds else None, **extra})
+
+    # Première lecture : analyse du CSV et écriture du cache Arrow
+    if os.path.exists(sidecar_path(cleaned_path)):
+        os.remove(sidecar_path(cleaned_path))
+    start = time.perf_counter()
+    load_compact(cleaned_path)
+    record('load_data (CSV)', time.perf_counter() - start, repeat=1)
+    seconds, df = best_of(lambda: load_compact(cleaned_path), repeat)
+    record('load_data (Arrow)', seconds, repeat=repeat)
+
+    seconds, (indexes, cube) = best_of(lambda: build_structures(df), repeat)
+    record('index', seconds, repeat=repeat)
+
+    cache = FilterCache(df, indexes)
+    seconds, (_, _, _, view) = best_of(lambda: sidebar(df, indexes, cache), repeat)
+    record('filtres', seconds, repeat=repeat, filtered_rows=len(view))
+
+    seconds, summary = best_of(
+        lambda: cube.slice(CONTENT_TYPE, YEAR_RANGE, COUNTRIES, GENRES).summary(COUNTRIES), repeat)
+    record('agrégats', seconds, repeat=repeat)
+
+    charts = {
+        'graphique : évolution globale': lambda: yearly_figure(summary.year_counts, YEAR_RANGE),
+        'graphique : comparaison pays': lambda: country_figure(summary.year_by_country, COUNTRIES[:5]),
+        'graphique : genres': lambda: genre_figure(summary.year_by_genre, GENRES[:5]),
+        'graphique : heatmap genres × pays': lambda: genre_heatmap_figure(
+            summary.crosstab, COUNTRIES[:6], GENRES[:8]),
+        'graphique : films / séries par pays': lambda: type_split_figure(
+            summary.type_by_country, COUNTRIES[:5]),
+        'observations': lambda: observations(summary, COUNTRIES),
+    }
+    for step, func in charts.items():
+        seconds, _ = best_of(func, repeat)
+        record(step, seconds, repeat=repeat)
+
+    seconds, size = best_of(lambda: export_csv(view), repeat)
+    record('export CSV', seconds, repeat=repeat, bytes=size)
+    return results
+
+
+def git_revision():
+    """Commit courant du dépôt (None hors d'un dépôt git)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(args):
+    """Contexte de la mesure, pour comparer des exécutions entre elles"""
+    try:
+        import pyarrow
+        pyarrow_version = pyarrow.__version__
+    except ImportError:
+        pyarrow_version = None
+    return {
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'pyarrow': pyarrow_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'sizes': args.sizes,
+        'repeat': args.repeat,
+        'seed': args.seed,
+    }
+
+
+def compare(results, previous_path):
+    """Rapport temps actuel / temps précédent pour chaque (taille, étape)"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = {(item['rows'], item['step']): item['seconds'] for item in json.load(f)['results']}
+    print(f"\nComparaison avec {previous_path} (rapport < 1 : plus rapide)")
+    for item in results:
+        before = previous.get((item['rows'], item['step']))
+        if before:
+            print(f"{format_size(item['rows']):>6}  {item['step']:<38}{before:>10.4f} -> "
+                  f"{item['seconds']:>10.4f}  x{item['seconds'] / before:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10k,100k,1m',
+                        help="tailles séparées par des virgules, ex. 10k,100k,1m,10m (défaut : %(default)s)")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'netflix_bench'),
+                        help="dossier des catalogues générés, réutilisés d'une exécution à l'autre")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-j', '--workers', type=int, default=1, help="processus de nettoyage")
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000, help="lignes par bloc de nettoyage")
+    parser.add_argument('--output', help="fichier JSON des résultats")
+    parser.add_argument('--compare', help="résultats JSON d'une exécution précédente")
+    args = parser.parse_args()
+
+    try:
+        sizes = [parse_size(size) for size in args.sizes.split(',')]
+    except ValueError as e:
+        parser.error(str(e))
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    setups, results = [], []
+    for rows in sizes:
+        setup = prepare(rows, args.data_dir, args.seed, args.workers, args.chunk_rows)
+        setups.append(setup)
+        size_results = bench_size(setup, args.repeat)
+        results.extend(size_results)
+
+        filtered = next(item['filtered_rows'] for item in size_results if item['step'] == 'filtres')
+        print(f"\n{rows:,} lignes ({filtered:,} après filtres)")
+        print(f"{'étape':<38}{'temps (s)':>10}{'lignes/s':>14}")
+        for item in size_results:
+            print(f"{item['step']:<38}{item['seconds']:>10.4f}{item['rows_per_s'] or 0:>14,}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(args), 'setup': setups, 'results': results},
+                      f, indent=2, ensure_ascii=False)
+        print(f"\nRésultats écrits dans {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# BENCHMARK : INTÉGRATION D'UN LOT DE TITRES (--upsert)
+"""Coût d'un upsert selon la taille du lot, comparé à un nettoyage complet
+
+Le catalogue de base est nettoyé une fois (CSV + cache Arrow) ; chaque
+mesure repart d'une copie de ce résultat. Deux lots sont intégrés :
+- ajout seul (nouveaux titres) : chemin rapide, qui n'ajoute que les lignes
+  du lot au CSV et au cache Arrow ;
+- ajout et titres modifiés : relecture et réécriture du catalogue.
+Les CSV obtenus sont comparés octet par octet à un nettoyage complet.
+
+Usage : python benchmarks/bench_upsert.py --rows 200000 --delta 1000
+"""
+
+import argparse
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from cleaning import run, upsert  # noqa: E402
+from data_store import sidecar_path  # noqa: E402
+from synthetic import make_raw_catalog  # noqa: E402
+
+
+def copy_store(source, target):
+    """Copie un CSV nettoyé et son cache Arrow"""
+    shutil.copyfile(source, target)
+    shutil.copyfile(sidecar_path(source), sidecar_path(target))
+
+
+def time_upsert(base, delta_path, target, repeat):
+    """Meilleur temps (s) d'un upsert, chaque fois sur une copie du catalogue nettoyé"""
+    timings = []
+    for _ in range(repeat):
+        copy_store(base, target)
+        start = time.perf_counter()
+        _, _, counts = upsert(delta_path, target)
+        timings.append(time.perf_counter() - start)
+    return min(timings), counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000, help="titres du catalogue de base")
+    parser.add_argument('--delta', type=int, default=1_000, help="titres du lot")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_upsert_')
+    path = lambda name: os.path.join(workdir, name)  # noqa: E731
+    try:
+        base = make_raw_catalog(args.rows)
+        added = make_raw_catalog(args.delta, seed=1, start_id=args.rows)
+        changed = base.sample(n=min(args.delta, args.rows), random_state=0).copy()
+        changed['title'] = changed['title'] + ' (remastered)'
+
+        base.to_csv(path('base.csv'), index=False)
+        added.to_csv(path('added.csv'), index=False)
+        pd.concat([changed, added]).to_csv(path('mixed.csv'), index=False)
+        pd.concat([base, added]).to_csv(path('full_added.csv'), index=False)
+        updated = base.copy()
+        updated.loc[changed.index, 'title'] = changed['title']
+        pd.concat([updated, added]).to_csv(path('full_mixed.csv'), index=False)
+        run(path('base.csv'), path('base_cleaned.csv'))
+
+        rows = []
+        for name, delta, full in (('ajout seul', 'added.csv', 'full_added.csv'),
+                                  ('ajout + modifiés', 'mixed.csv', 'full_mixed.csv')):
+            seconds, counts = time_upsert(path('base_cleaned.csv'), path(delta), path('store.csv'), args.repeat)
+            start = time.perf_counter()
+            run(path(full), path('reference.csv'))
+            full_seconds = time.perf_counter() - start
+            assert filecmp.cmp(path('store.csv'), path('reference.csv'), shallow=False), \
+                f"{name} : le CSV diffère d'un nettoyage complet"
+            rows.append((name, counts, seconds, full_seconds))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"catalogue de {args.rows:,} titres, lot de {args.delta:,} titres nouveaux "
+          f"(+ {min(args.delta, args.rows):,} modifiés pour le second)")
+    print(f"{'lot':<20}{'nouveaux':>10}{'modifiés':>10}{'upsert (s)':>12}{'complet (s)':>13}{'gain':>8}")
+    for name, counts, seconds, full_seconds in rows:
+        print(f"{name:<20}{counts['new']:>10,}{counts['changed']:>10,}{seconds:>12.3f}"
+              f"{full_seconds:>13.3f}{full_seconds / seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
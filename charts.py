@@ -0,0 +1,203 @@
+# GRAPHIQUES DU TABLEAU DE BORD
+"""Construction des figures Plotly et des observations à partir d'un SliceSummary
+
+Chaque fonction ne dépend que des séries qu'on lui passe : app.py peut donc
+ne la rappeler que lorsque ces entrées changent.
+"""
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+COUNTRY_COLORS = ['#E50914', '#221F1F', '#564d4d', '#808080', '#A9A9A9']
+
+
+def yearly_figure(yearly_counts, year_range):
+    """Évolution globale du nombre de productions"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=yearly_counts.index,
+        y=yearly_counts.values,
+        mode='lines+markers',
+        line=dict(color='#E50914', width=3),
+        marker=dict(size=6, color='#E50914'),
+        name='Nombre de productions'
+    ))
+
+    fig.update_layout(
+        title=f'Évolution du nombre de productions ({year_range[0]}-{year_range[1]})',
+        xaxis_title="Année",
+        yaxis_title="Nombre de productions",
+        hovermode='x unified',
+        template='plotly_white',
+        height=500,
+        showlegend=False
+    )
+    return fig
+
+
+def country_figure(country_years, countries):
+    """Évolution comparée des pays sélectionnés"""
+    fig = go.Figure()
+
+    for i, country in enumerate(countries):
+        country_counts = country_years[country][country_years[country] > 0]
+
+        fig.add_trace(go.Scatter(
+            x=country_counts.index,
+            y=country_counts.values,
+            mode='lines+markers',
+            name=country,
+            line=dict(width=2, color=COUNTRY_COLORS[i % len(COUNTRY_COLORS)]),
+            marker=dict(size=5)
+        ))
+
+    fig.update_layout(
+        title='Évolution comparée par pays',
+        xaxis_title="Année",
+        yaxis_title="Nombre de productions",
+        hovermode='x unified',
+        template='plotly_white',
+        height=500
+    )
+    return fig
+
+
+def genre_figure(genre_years, genres):
+    """Évolution de la popularité des genres sélectionnés"""
+    fig = go.Figure()
+
+    for genre in genres:
+        genre_counts = genre_years[genre][genre_years[genre] > 0]
+
+        fig.add_trace(go.Scatter(
+            x=genre_counts.index,
+            y=genre_counts.values,
+            mode='lines+markers',
+            name=genre,
+            line=dict(width=2),
+            marker=dict(size=5)
+        ))
+
+    fig.update_layout(
+        title='Évolution de la popularité des genres',
+        xaxis_title="Année",
+        yaxis_title="Nombre de productions",
+        hovermode='x unified',
+        template='plotly_white',
+        height=500
+    )
+    return fig
+
+
+def genre_heatmap_figure(country_genres, countries, genres):
+    """Heatmap de popularité des genres par pays (None si rien à afficher)"""
+    heatmap_data = []
+
+    for country in countries:
+        genre_counts = country_genres.loc[country]
+        genre_counts = genre_counts[genre_counts > 0]
+        country_row = {'Pays': country}
+
+        # Prendre les genres les plus populaires pour ce pays
+        for genre, count in genre_counts.sort_values(ascending=False, kind='stable').head(8).items():
+            if genre in genres:
+                country_row[genre] = count
+
+        heatmap_data.append(country_row)
+
+    if not heatmap_data:
+        return None
+
+    heatmap_df = pd.DataFrame(heatmap_data).set_index('Pays').fillna(0)
+
+    fig = px.imshow(
+        heatmap_df,
+        labels=dict(x="Genres", y="Pays", color="Nombre de productions"),
+        title="Popularité des genres par pays",
+        color_continuous_scale='Reds',
+        aspect='auto'
+    )
+
+    fig.update_layout(height=400)
+    return fig
+
+
+def type_split_figure(country_types, countries):
+    """Répartition Films vs Séries TV par pays (None si rien à afficher)"""
+    type_data = []
+
+    for country in countries:
+        movies = country_types.loc[country].get('Movie', 0)
+        shows = country_types.loc[country].get('TV Show', 0)
+        total = movies + shows
+
+        if total > 0:
+            type_data.append({
+                'Pays': country,
+                'Type': 'Films',
+                'Pourcentage': (movies / total) * 100
+            })
+            type_data.append({
+                'Pays': country,
+                'Type': 'Séries TV',
+                'Pourcentage': (shows / total) * 100
+            })
+
+    if not type_data:
+        return None
+
+    type_df = pd.DataFrame(type_data)
+
+    fig = px.bar(
+        type_df,
+        x='Pays',
+        y='Pourcentage',
+        color='Type',
+        barmode='stack',
+        color_discrete_map={'Films': '#E50914', 'Séries TV': '#221F1F'},
+        title="Répartition Films vs Séries TV par pays",
+        labels={'Pourcentage': 'Pourcentage (%)'}
+    )
+
+    fig.update_layout(height=400)
+    return fig
+
+
+def observations(summary, countries):
+    """Phrases de la section « Observations et tendances »"""
+    observations = []
+
+    # 1. Genre dominant
+    if summary.total > 0:
+        genre_totals = summary.genre_totals[summary.genre_totals > 0]
+
+        if len(genre_totals) > 0:
+            observations.append(f"**Genre le plus populaire** : {genre_totals.idxmax()} ({genre_totals.max()} occurrences)")
+
+    # 2. Pays dominant
+    if countries:
+        country_totals = summary.country_totals[summary.country_totals > 0]
+
+        if len(country_totals) > 0:
+            observations.append(f"**Pays le plus représenté** : {country_totals.idxmax()} ({country_totals.max()} productions)")
+
+    # 3. Tendance temporelle
+    if summary.total >= 2:
+        yearly_counts = summary.year_counts
+        earliest_year = yearly_counts.index.min()
+        latest_year = yearly_counts.index.max()
+
+        earliest_count = yearly_counts[earliest_year]
+        latest_count = yearly_counts[latest_year]
+
+        if earliest_count > 0:
+            growth_rate = ((latest_count - earliest_count) / earliest_count) * 100
+            observations.append(f"**Tendance** : {growth_rate:+.1f}% de variation entre {int(earliest_year)} et {int(latest_year)}")
+
+    # 4. Durée moyenne des films
+    films_with_duration, avg_duration, _ = summary.duration_stats('Movie')
+    if films_with_duration > 0:
+        observations.append(f"**Durée moyenne des films** : {avg_duration:.1f} minutes")
+
+    return observations
@@ -0,0 +1,604 @@
+# NETTOYAGE DU CATALOGUE NETFLIX
+"""Pipeline de nettoyage : netflix_titles.csv -> netflix_titles_cleaned.csv
+
+Reprend les étapes du script d'analyse exploratoire (conversion des dates,
+séparation de la durée, valeurs manquantes, colonnes de listes, décennie)
+sans affichage ni graphique, pour pouvoir l'exécuter en tâche planifiée :
+
+    python cleaning.py netflix_titles.csv -o netflix_titles_cleaned.csv
+
+La durée de chaque étape est journalisée (logging) et peut être écrite en JSON.
+Avec --chunk-rows, le CSV brut est lu et nettoyé par blocs de lignes : la
+mémoire utilisée ne dépend plus que de la taille des blocs, et les
+statistiques globales (durée moyenne des films, mode du nombre de saisons)
+sont cumulées d'un bloc à l'autre.
+
+Avec --upsert, le fichier d'entrée est un lot de titres nouveaux ou modifiés
+(même format que le catalogue brut) : seules ses lignes sont nettoyées puis
+intégrées au CSV nettoyé existant, par show_id.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from data_store import append_sidecar, load_cleaned, read_sidecar_table, table_rows, write_sidecar
+from sketches import HeavyHitters
+
+logger = logging.getLogger(__name__)
+
+RAW_FILENAME = "netflix_titles.csv"
+CLEANED_FILENAME = "netflix_titles_cleaned.csv"
+CATEGORICAL_COLUMNS = ['director', 'cast', 'country', 'rating']
+# Colonnes texte du CSV brut : typées explicitement pour qu'un bloc où elles
+# sont entièrement vides ne soit pas lu comme des flottants
+TEXT_COLUMNS = ['show_id', 'type', 'title', 'director', 'cast', 'country',
+                'date_added', 'rating', 'duration', 'listed_in', 'description']
+
+# Entiers nullables produits par le nettoyage (parse_duration), relus en
+# flottants par load_cleaned : rétablis avant de réécrire le CSV nettoyé
+INTEGER_COLUMNS = {
+    'duration_min': 'Int32',
+    'duration_seasons': 'Int32',
+}
+
+# Résumés des éléments les plus fréquents : nom -> colonne de listes
+TOP_COLUMNS = {
+    'genres': 'genres_list',
+    'countries': 'countries_list',
+    'cast': 'cast_list',
+    'directors': 'director_list',
+}
+# Compteurs par résumé (None : comptage exact)
+TOP_CAPACITY = 10_000
+
+# colonne de listes -> colonne texte d'origine
+LIST_SOURCES = {
+    'genres_list': 'listed_in',
+    'countries_list': 'country',
+    'cast_list': 'cast',
+    'director_list': 'director',
+}
+
+
+def load_raw(path, chunk_rows=None):
+    """Lit le catalogue brut (itérateur de blocs si chunk_rows est donné)"""
+    return pd.read_csv(path, dtype={col: str for col in TEXT_COLUMNS}, chunksize=chunk_rows)
+
+
+def convert_dates(df, date_format=None):
+    """Convertit date_added en datetime et extrait année et mois d'ajout"""
+    df['date_added'] = pd.to_datetime(df['date_added'], format=date_format, errors='coerce')
+    # Toujours en flottants (NaN pour les dates manquantes), même dans un bloc
+    # sans date manquante : la sortie ne dépend pas du découpage en blocs
+    df['year_added'] = df['date_added'].dt.year.astype('float64')
+    df['month_added'] = df['date_added'].dt.month.astype('float64')
+    return df
+
+
+# Premier nombre de la durée et le mot qui le suit ("90 min", "3 Seasons")
+DURATION_PATTERN = r'(\d+)\s*([A-Za-z]*)'
+DURATION_UNITS = ['min', 'season']
+
+
+def parse_duration(durations):
+    """Valeur entière et unité de chaque durée ("90 min" -> 90, 'min' ; "3 Seasons" -> 3, 'season')
+
+    La colonne ne contient que quelques centaines de durées distinctes : on
+    les factorise, on n'applique l'expression régulière qu'à ces valeurs
+    uniques puis on redistribue le résultat par indexation.
+    """
+    codes, uniques = pd.factorize(durations)
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(DURATION_PATTERN)
+
+    values = pd.array(pd.to_numeric(parts[0]), dtype='Int32')
+    words = parts[1].str.lower().fillna('')
+    unit_codes = np.select([words.str.startswith('min'), words.str.startswith('season')], [0, 1], -1)
+
+    # Les durées manquantes (code -1) pointent vers une valeur manquante ajoutée en fin
+    codes = np.where(codes < 0, len(uniques), codes)
+    values = pd.concat([pd.Series(values), pd.Series([pd.NA], dtype='Int32')], ignore_index=True)
+    unit_codes = np.append(unit_codes, -1)
+
+    return pd.DataFrame({
+        'duration_value': values.take(codes).array,
+        'duration_unit': pd.Categorical.from_codes(unit_codes[codes], categories=DURATION_UNITS),
+    }, index=durations.index)
+
+
+def split_duration(df):
+    """Sépare duration en duration_min (films) et duration_seasons (séries), en entiers"""
+    value = parse_duration(df['duration'])['duration_value']
+    df['duration_min'] = value.where(df['type'] == 'Movie')
+    df['duration_seasons'] = value.where(df['type'] == 'TV Show')
+    return df
+
+
+def fill_missing(df):
+    """Remplace les valeurs manquantes des colonnes catégorielles par 'Unknown'"""
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].fillna('Unknown')
+    return df
+
+
+def prepare_list_column(column_value):
+    """Découpe une valeur "a, b, c" en liste (liste vide si manquante ou 'Unknown')"""
+    if pd.isna(column_value) or column_value == 'Unknown':
+        return []
+    # Séparer par virgule et nettoyer les espaces
+    return [item.strip() for item in str(column_value).split(',')]
+
+
+def prepare_list_columns(df):
+    """Crée genres_list, countries_list, cast_list et director_list"""
+    for target, source in LIST_SOURCES.items():
+        df[target] = df[source].apply(prepare_list_column)
+    return df
+
+
+def add_decade(df):
+    """Ajoute la décennie de sortie"""
+    df['decade'] = (df['release_year'] // 10) * 10
+    return df
+
+
+class CatalogStats:
+    """Statistiques globales du catalogue, cumulables bloc par bloc ou partition par partition"""
+
+    def __init__(self, top_capacity=TOP_CAPACITY):
+        self.rows = 0
+        self.missing = {}
+        self.missing_dates = 0
+        self.movie_duration_sum = 0
+        self.movie_duration_count = 0
+        self.season_counts = {}
+        # Éléments les plus fréquents par colonne de listes, en mémoire bornée
+        self.top = {name: HeavyHitters(top_capacity) for name in TOP_COLUMNS}
+
+    def count_missing(self, raw):
+        """Ajoute les valeurs manquantes par colonne d'un bloc brut (avant nettoyage)"""
+        for col, count in raw.isna().sum().items():
+            self.missing[col] = self.missing.get(col, 0) + int(count)
+        return self
+
+    def update(self, df):
+        """Ajoute les lignes d'un bloc nettoyé"""
+        self.rows += len(df)
+        self.missing_dates += int(df['date_added'].isna().sum())
+
+        # Durées entières : sommes exactes, quel que soit l'ordre de cumul
+        durations = df.loc[df['type'] == 'Movie', 'duration_min'].dropna()
+        self.movie_duration_sum += int(durations.sum())
+        self.movie_duration_count += len(durations)
+
+        seasons = df.loc[df['type'] == 'TV Show', 'duration_seasons'].dropna()
+        for value, count in seasons.value_counts().items():
+            self.season_counts[int(value)] = self.season_counts.get(int(value), 0) + int(count)
+
+        for name, col in TOP_COLUMNS.items():
+            self.top[name].update_lists(df[col])
+        return self
+
+    def merge(self, other):
+        """Cumule les statistiques d'un autre ensemble de lignes"""
+        self.rows += other.rows
+        for col, count in other.missing.items():
+            self.missing[col] = self.missing.get(col, 0) + count
+        self.missing_dates += other.missing_dates
+        self.movie_duration_sum += other.movie_duration_sum
+        self.movie_duration_count += other.movie_duration_count
+        for value, count in other.season_counts.items():
+            self.season_counts[value] = self.season_counts.get(value, 0) + count
+        for name, sketch in other.top.items():
+            self.top[name].merge(sketch)
+        return self
+
+    def mean_movie_duration(self):
+        """Durée moyenne des films (NaN si aucune durée)"""
+        if not self.movie_duration_count:
+            return np.nan
+        return self.movie_duration_sum / self.movie_duration_count
+
+    def season_mode(self):
+        """Nombre de saisons le plus fréquent (le plus petit en cas d'égalité, comme Series.mode)"""
+        if not self.season_counts:
+            return np.nan
+        best = max(self.season_counts.values())
+        return min(value for value, count in self.season_counts.items() if count == best)
+
+    @staticmethod
+    def _top(sketch, k):
+        # Ordre indépendant du découpage : effectif décroissant puis nom
+        ranked = sorted(sketch.counts.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return {
+            'error': sketch.error,
+            'guaranteed': sketch.guaranteed(k),
+            'items': [[item, count, count + sketch.error] for item, count in ranked],
+        }
+
+    def as_dict(self, top=10):
+        return {
+            'rows': self.rows,
+            'missing_values': self.missing,
+            'missing_date_added': self.missing_dates,
+            'mean_movie_duration': self.mean_movie_duration(),
+            'season_mode': self.season_mode(),
+            'top': {name: self._top(sketch, top) for name, sketch in self.top.items()},
+        }
+
+
+STAGES = [
+    ('dates', convert_dates),
+    ('duration', split_duration),
+    ('missing', fill_missing),
+    ('lists', prepare_list_columns),
+    ('decade', add_decade),
+]
+
+
+def clean_catalog(df, timings=None, date_format=None):
+    """Applique toutes les étapes de nettoyage ; timings cumule la durée (s) de chacune"""
+    for name, stage in STAGES:
+        start = time.perf_counter()
+        df = stage(df, date_format) if stage is convert_dates else stage(df)
+        elapsed = time.perf_counter() - start
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed
+    return df
+
+
+def clean_partition(raw, date_format=None, top_capacity=TOP_CAPACITY):
+    """Nettoie un bloc de lignes brutes : (bloc nettoyé, statistiques, durées des étapes)
+
+    Fonction de niveau module pour pouvoir être exécutée dans un processus du pool.
+    """
+    timings = {}
+    stats = CatalogStats(top_capacity).count_missing(raw)
+    df = clean_catalog(raw, timings, date_format)
+    stats.update(df)
+    return df, stats, timings
+
+
+def guess_date_format(dates):
+    """Format de date_added deviné sur la première valeur non vide, comme to_datetime
+
+    Il est deviné une seule fois puis imposé à chaque bloc : le résultat ne
+    dépend pas du découpage en blocs ou en partitions.
+    """
+    values = dates.dropna()
+    if values.empty:
+        return None
+    return guess_datetime_format(str(values.iloc[0]))
+
+
+def map_ordered(func, items, workers):
+    """Résultats de func(*item) dans l'ordre des items, calculés par un pool de processus
+
+    Au plus 2 × workers partitions sont en cours à la fois : les items
+    (par exemple les blocs d'un read_csv) ne sont lus qu'au fur et à mesure.
+    """
+    if workers <= 1:
+        for item in items:
+            yield func(*item)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, *item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def resolve_workers(workers):
+    """Nombre de processus effectif (0 ou None : tous les cœurs)"""
+    return workers or os.cpu_count() or 1
+
+
+def write_cleaned(df, path, sidecar=True):
+    """Écrit le CSV nettoyé (et le cache Arrow lu par le tableau de bord)"""
+    df.to_csv(path, index=False)
+    if sidecar:
+        write_sidecar(df, path)
+
+
+def run(raw_path, output_path, sidecar=True, chunk_rows=None, workers=1, top_capacity=TOP_CAPACITY):
+    """Nettoie raw_path vers output_path ; renvoie la durée des étapes et les statistiques
+
+    Avec workers > 1, les partitions (ou les blocs avec chunk_rows) sont
+    nettoyées en parallèle ; la sortie est identique à l'exécution en série.
+    """
+    workers = resolve_workers(workers)
+    if chunk_rows:
+        return run_chunked(raw_path, output_path, chunk_rows, workers, top_capacity)
+
+    started = time.perf_counter()
+    timings = {}
+    df = load_raw(raw_path)
+    timings['read'] = time.perf_counter() - started
+
+    # Une partition contiguë par processus, recollées dans l'ordre
+    date_format = guess_date_format(df['date_added'])
+    bounds = np.linspace(0, len(df), min(workers, max(len(df), 1)) + 1).astype(int)
+    partitions = [(df.iloc[start:end], date_format, top_capacity) for start, end in zip(bounds[:-1], bounds[1:])]
+    del df
+
+    stats = CatalogStats(top_capacity)
+    cleaned = []
+    for part, part_stats, part_timings in map_ordered(clean_partition, partitions, workers):
+        cleaned.append(part)
+        stats.merge(part_stats)
+        _add_timings(timings, part_timings)
+    del partitions
+    df = cleaned[0] if len(cleaned) == 1 else pd.concat(cleaned)
+
+    start = time.perf_counter()
+    write_cleaned(df, output_path, sidecar)
+    timings['write'] = time.perf_counter() - start
+
+    timings['total'] = time.perf_counter() - started
+    return timings, stats
+
+
+def run_chunked(raw_path, output_path, chunk_rows, workers=1, top_capacity=TOP_CAPACITY):
+    """Nettoyage bloc par bloc : chaque bloc nettoyé est ajouté au CSV de sortie
+
+    Le cache Arrow n'est pas écrit dans ce mode (il demanderait tout le
+    catalogue en mémoire) ; le tableau de bord le crée à son premier chargement.
+    """
+    started = time.perf_counter()
+    timings = {'read': 0.0}
+    stats = CatalogStats(top_capacity)
+    date_format = []
+
+    def blocks():
+        chunks = load_raw(raw_path, chunk_rows)
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            timings['read'] += time.perf_counter() - start
+            if chunk is None:
+                return
+            if not date_format:
+                # Premier bloc contenant une date : format retenu pour tous les blocs
+                fmt = guess_date_format(chunk['date_added'])
+                if fmt is not None:
+                    date_format.append(fmt)
+            yield chunk, date_format[0] if date_format else None, top_capacity
+
+    # Fichier temporaire : un CSV partiel ne remplace jamais le précédent
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+            for chunk, chunk_stats, chunk_timings in map_ordered(clean_partition, blocks(), workers):
+                stats.merge(chunk_stats)
+                _add_timings(timings, chunk_timings)
+
+                start = time.perf_counter()
+                chunk.to_csv(out, index=False, header=out.tell() == 0)
+                timings['write'] = timings.get('write', 0.0) + time.perf_counter() - start
+                logger.debug("bloc nettoyé : %d lignes (total %d)", len(chunk), stats.rows)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    timings['total'] = time.perf_counter() - started
+    return timings, stats
+
+
+def _same_rows(existing, delta):
+    """Vrai pour chaque ligne de delta identique à la ligne de existing au même rang"""
+    same = np.ones(len(delta), dtype=bool)
+    for col in existing.columns:
+        old = existing[col].to_numpy(dtype=object)
+        new = delta[col].to_numpy(dtype=object)
+        if col in LIST_SOURCES:
+            same &= np.fromiter((a == b for a, b in zip(old, new)), dtype=bool, count=len(new))
+        else:
+            # Valeurs manquantes (NaN, NaT, pd.NA) égales entre elles, comparées à part
+            missing = pd.isna(old) | pd.isna(new)
+            equal = pd.isna(old) & pd.isna(new)
+            equal[~missing] = old[~missing] == new[~missing]
+            same &= equal
+    return same
+
+
+def _integer_columns(df):
+    """Rétablit les entiers du nettoyage : "98" et non "98.0" dans le CSV"""
+    return df.astype({col: dtype for col, dtype in INTEGER_COLUMNS.items() if col in df.columns})
+
+
+def _compare(existing, delta):
+    """Aligne delta sur les types de existing et compare les titres connus
+
+    Renvoie (delta aligné, positions dans existing, masque des titres
+    connus, masque des titres connus inchangés).
+    """
+    keys = pd.Index(existing['show_id'])
+    delta = delta[list(existing.columns)].astype(existing.dtypes.to_dict())
+    positions = keys.get_indexer(delta['show_id'])
+    known = positions >= 0
+    unchanged = _same_rows(existing.iloc[positions[known]], delta[known])
+    return delta, positions, known, unchanged
+
+
+def _append_only(table, delta, output_path):
+    """Ajout des nouveaux titres à partir du cache Arrow, sans relire le catalogue
+
+    Seules les lignes du cache dont le show_id figure dans le lot sont
+    converties. Renvoie les compteurs, ou None si un titre connu a changé
+    ou figure en double (il faut alors passer par le catalogue complet).
+    """
+    existing = _integer_columns(table_rows(table, 'show_id', delta['show_id']))
+    if not existing['show_id'].is_unique:
+        return None
+    delta, positions, known, unchanged = _compare(existing, delta)
+    if not unchanged.all():
+        return None
+
+    added = delta[~known]
+    if len(added):
+        with open(output_path, 'a', encoding='utf-8', newline='') as out:
+            added.to_csv(out, index=False, header=False)
+        append_sidecar(added, output_path, table.schema)
+    return {'new': len(added), 'changed': 0, 'unchanged': int(unchanged.sum())}
+
+
+def upsert(delta_path, output_path, sidecar=True, top_capacity=TOP_CAPACITY):
+    """Intègre au CSV nettoyé les titres nouveaux ou modifiés d'un CSV brut (clé show_id)
+
+    Seules les lignes du lot sont nettoyées. Un titre modifié remplace sa ligne
+    à la même position, un nouveau titre est ajouté à la fin, un titre
+    identique est ignoré. Sans titre modifié, les nouvelles lignes sont
+    ajoutées à la fin du CSV et du cache Arrow, sans relire ni réécrire le
+    catalogue. Renvoie la durée des étapes, les statistiques du lot et le
+    nombre de titres nouveaux / modifiés / inchangés.
+    """
+    started = time.perf_counter()
+    timings = {}
+    raw = load_raw(delta_path).drop_duplicates('show_id', keep='last')
+    timings['read'] = time.perf_counter() - started
+
+    delta, stats, stage_timings = clean_partition(raw, guess_date_format(raw['date_added']), top_capacity)
+    _add_timings(timings, stage_timings)
+
+    if not os.path.exists(output_path):
+        # Pas encore de catalogue nettoyé : le lot devient le catalogue
+        start = time.perf_counter()
+        write_cleaned(delta, output_path, sidecar)
+        timings['write'] = time.perf_counter() - start
+        timings['total'] = time.perf_counter() - started
+        return timings, stats, {'new': len(delta), 'changed': 0, 'unchanged': 0}
+
+    # Chemin rapide : le cache Arrow, relu par memory-map, suffit à savoir
+    # quels titres sont connus ; seules leurs lignes sont converties
+    table = read_sidecar_table(output_path) if sidecar else None
+    if table is not None:
+        start = time.perf_counter()
+        counts = _append_only(table, delta, output_path)
+        if counts is not None:
+            timings['append'] = time.perf_counter() - start
+            timings['total'] = time.perf_counter() - started
+            return timings, stats, counts
+
+    start = time.perf_counter()
+    existing = _integer_columns(load_cleaned(output_path))
+    timings['load'] = time.perf_counter() - start
+
+    if not existing['show_id'].is_unique:
+        raise ValueError(f"show_id en double dans {output_path} : impossible d'y intégrer un lot")
+    delta, positions, known, unchanged = _compare(existing, delta)
+    changed = delta[known][~unchanged].set_axis(existing.index[positions[known][~unchanged]])
+    added = delta[~known]
+    counts = {'new': len(added), 'changed': len(changed), 'unchanged': int(unchanged.sum())}
+
+    start = time.perf_counter()
+    if len(changed):
+        merged = pd.concat([existing.drop(index=changed.index), changed]).sort_index(kind='stable')
+        merged = pd.concat([merged, added], ignore_index=True)
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        try:
+            merged.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    elif len(added):
+        # Ajout seul (sans cache Arrow utilisable) : on n'écrit que les nouvelles lignes
+        merged = pd.concat([existing, added], ignore_index=True)
+        with open(output_path, 'a', encoding='utf-8', newline='') as out:
+            added.to_csv(out, index=False, header=False)
+    else:
+        merged = None
+    if merged is not None and sidecar:
+        write_sidecar(merged, output_path)
+    timings['write'] = time.perf_counter() - start
+
+    timings['total'] = time.perf_counter() - started
+    return timings, stats, counts
+
+
+def _add_timings(timings, other):
+    for name, elapsed in other.items():
+        timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def log_report(timings, stats):
+    """Journalise la durée de chaque étape et les statistiques globales"""
+    for name, elapsed in timings.items():
+        logger.info("%-8s %8.3f s", name, elapsed)
+    summary = stats.as_dict()
+    logger.info("%d lignes, %d dates d'ajout manquantes", summary['rows'], summary['missing_date_added'])
+    logger.info("durée moyenne des films : %.1f min, mode du nombre de saisons : %s",
+                summary['mean_movie_duration'], summary['season_mode'])
+    for name, top in summary['top'].items():
+        if top['items']:
+            item, low, high = top['items'][0]
+            count = f"{low}" if low == high else f"{low} à {high}"
+            logger.info("%-9s le plus fréquent : %s (%s)", name, item, count)
+
+
+def write_json(data, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nettoie le catalogue Netflix brut pour le tableau de bord.")
+    parser.add_argument('input', nargs='?', default=RAW_FILENAME, help="CSV brut (défaut : %(default)s)")
+    parser.add_argument('-o', '--output', default=CLEANED_FILENAME, help="CSV nettoyé (défaut : %(default)s)")
+    parser.add_argument('--no-sidecar', action='store_true', help="ne pas écrire le cache Arrow")
+    parser.add_argument('--chunk-rows', type=int, default=None,
+                        help="nettoyer par blocs de N lignes (mémoire bornée, sans cache Arrow)")
+    parser.add_argument('--upsert', action='store_true',
+                        help="intégrer input (titres nouveaux ou modifiés) au CSV nettoyé existant")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="nombre de processus de nettoyage (0 : tous les cœurs ; défaut : %(default)s)")
+    parser.add_argument('--top-capacity', type=int, default=TOP_CAPACITY,
+                        help="compteurs par résumé des éléments les plus fréquents (0 : exact ; défaut : %(default)s)")
+    parser.add_argument('--timings', help="fichier JSON où écrire la durée de chaque étape")
+    parser.add_argument('--stats', help="fichier JSON où écrire les statistiques globales")
+    parser.add_argument('-q', '--quiet', action='store_true', help="n'afficher que les erreurs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.chunk_rows is not None and args.chunk_rows <= 0:
+        parser.error("--chunk-rows doit être strictement positif")
+    if args.workers < 0:
+        parser.error("--workers doit être positif ou nul")
+    if args.top_capacity < 0:
+        parser.error("--top-capacity doit être positif ou nul")
+    top_capacity = args.top_capacity or None
+    if args.upsert and args.chunk_rows:
+        parser.error("--upsert ne se combine pas avec --chunk-rows")
+
+    if args.upsert:
+        timings, stats, counts = upsert(args.input, args.output, sidecar=not args.no_sidecar,
+                                        top_capacity=top_capacity)
+        logger.info("%(new)d titres nouveaux, %(changed)d modifiés, %(unchanged)d inchangés", counts)
+    else:
+        timings, stats = run(args.input, args.output, sidecar=not args.no_sidecar,
+                             chunk_rows=args.chunk_rows, workers=args.workers, top_capacity=top_capacity)
+    log_report(timings, stats)
+    if args.timings:
+        write_json({name: round(value, 6) for name, value in timings.items()}, args.timings)
+    if args.stats:
+        write_json(stats.as_dict(), args.stats)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+# GRAPHE DES COLLABORATIONS (ACTEURS / RÉALISATEURS)
+"""Graphe biparti personnes–titres construit à partir de cast_list et director_list
+
+Chaque personne (acteur ou réalisateur, un seul vocabulaire) reçoit un
+identifiant entier, dans l'ordre alphabétique des noms. Les arêtes
+personne–titre sont rangées deux fois au format CSR (indptr + tableau
+d'identifiants, comme filter_index.ListIndex) : titres de chaque personne et
+personnes de chaque titre, avec le rôle (bits CAST / DIRECTOR) de chaque
+arête.
+
+Toutes les requêtes parcourent ces tableaux par opérations numpy, sans
+graphe d'objets Python : les voisins d'un ensemble de sommets sont la
+concaténation de tranches de l'index, et le plus court chemin est un parcours
+en largeur mené depuis les deux personnes, un niveau entier à la fois.
+"""
+
+import numpy as np
+import pandas as pd
+
+from list_columns import list_codes
+
+CAST = 1
+DIRECTOR = 2
+# colonne de listes -> bit du rôle
+ROLES = {
+    'cast_list': CAST,
+    'director_list': DIRECTOR,
+}
+
+
+def gather(indptr, values, ids):
+    """Éléments des tranches ids d'un CSR, et position dans ids de la tranche de chaque élément"""
+    starts = indptr[ids]
+    lengths = indptr[ids + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return values[:0], np.array([], dtype=np.int64)
+    source = np.repeat(np.arange(len(ids)), lengths)
+    # position de chaque élément : début de sa tranche + rang dans la tranche
+    ends = np.cumsum(lengths)
+    index = np.arange(total) + np.repeat(starts - (ends - lengths), lengths)
+    return values[index], source
+
+
+class CollaborationGraph:
+    """Graphe biparti personnes–titres en CSR (titres par personne et personnes par titre)"""
+
+    def __init__(self, df, roles=ROLES):
+        self.n_titles = len(df)
+
+        # Occurrences (personne, titre, rôle) ; les vocabulaires des colonnes
+        # sont réunis en un seul vocabulaire trié de personnes
+        empty = np.array([], dtype=np.int64)
+        rows, codes, role_bits, vocabularies = [empty], [empty], [empty], [np.array([], dtype=object)]
+        offset = 0
+        for column, bit in roles.items():
+            if column not in df.columns:
+                continue
+            row_ids, column_codes, vocabulary = list_codes(df[column])
+            valid = column_codes >= 0
+            rows.append(row_ids[valid])
+            codes.append(column_codes[valid] + offset)
+            role_bits.append(np.full(int(valid.sum()), bit, dtype=np.int64))
+            vocabularies.append(vocabulary)
+            offset += len(vocabulary)
+        renumber, people = pd.factorize(pd.Series(np.concatenate(vocabularies), dtype=object), sort=True)
+        self.people = np.asarray(people, dtype=object)
+
+        # Clé (personne, titre, rôle) : un seul tri ; les rôles d'une même
+        # personne sur un même titre sont réunis par OU binaire
+        stride = max(self.n_titles, 1)
+        keys = renumber[np.concatenate(codes)].astype(np.int64)
+        keys = ((keys * stride + np.concatenate(rows)) << 2) | np.concatenate(role_bits)
+        keys.sort()
+        pairs = keys >> 2
+        starts = np.flatnonzero(np.r_[True, pairs[1:] != pairs[:-1]]) if len(keys) else np.array([], dtype=np.int64)
+        edge_roles = np.bitwise_or.reduceat(keys & 3, starts).astype(np.uint8) \
+            if len(keys) else np.array([], dtype=np.uint8)
+        pairs = pairs[starts]
+        persons = pairs // stride
+
+        # Titres de chaque personne (triés)
+        self.person_titles = (pairs % stride).astype(np.int32)
+        self.person_roles = edge_roles
+        self.person_indptr = np.zeros(len(self.people) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(persons, minlength=len(self.people)), out=self.person_indptr[1:])
+
+        # Personnes de chaque titre (triées)
+        order = np.argsort(self.person_titles, kind='stable')
+        self.title_people = persons[order].astype(np.int32)
+        self.title_roles = edge_roles[order]
+        self.title_indptr = np.zeros(self.n_titles + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.person_titles, minlength=self.n_titles), out=self.title_indptr[1:])
+
+    def __len__(self):
+        return len(self.people)
+
+    @property
+    def n_edges(self):
+        return len(self.person_titles)
+
+    @property
+    def nbytes(self):
+        """Octets des tableaux du graphe (hors noms)"""
+        return sum(array.nbytes for array in (self.person_titles, self.person_roles, self.person_indptr,
+                                              self.title_people, self.title_roles, self.title_indptr))
+
+    def person_id(self, name):
+        """Identifiant de la personne (-1 si inconnue)"""
+        i = int(np.searchsorted(self.people, name))
+        return i if i < len(self.people) and self.people[i] == name else -1
+
+    def complete(self, prefix, limit=10):
+        """Identifiants des personnes dont le nom commence par prefix (ordre alphabétique)"""
+        lo = int(np.searchsorted(self.people, prefix, side='left'))
+        hi = int(np.searchsorted(self.people, prefix + '\uffff', side='left'))
+        return np.arange(lo, min(hi, lo + limit))
+
+    def titles(self, person, role=None):
+        """Positions (triées) des titres d'une personne, éventuellement limitées à un rôle"""
+        start, stop = self.person_indptr[person], self.person_indptr[person + 1]
+        titles = self.person_titles[start:stop]
+        if role is not None:
+            titles = titles[(self.person_roles[start:stop] & role) > 0]
+        return titles
+
+    def members(self, title, role=None):
+        """Identifiants (triés) des personnes d'un titre, éventuellement limitées à un rôle"""
+        start, stop = self.title_indptr[title], self.title_indptr[title + 1]
+        people = self.title_people[start:stop]
+        if role is not None:
+            people = people[(self.title_roles[start:stop] & role) > 0]
+        return people
+
+    def collaborators(self, person, role=None, partner_role=None, min_titles=1):
+        """Personnes ayant travaillé avec person, et nombre de titres en commun
+
+        role limite les titres de person (ex. DIRECTOR : les films qu'elle a
+        réalisés), partner_role le rôle des partenaires sur ces titres.
+        Résultat trié par nombre de titres décroissant, puis par nom.
+        """
+        titles = self.titles(person, role)
+        people, _ = gather(self.title_indptr, self.title_people, titles)
+        if partner_role is not None:
+            roles, _ = gather(self.title_indptr, self.title_roles, titles)
+            people = people[(roles & partner_role) > 0]
+        people = people[people != person]
+        found, counts = np.unique(people, return_counts=True)
+        keep = counts >= min_titles
+        found, counts = found[keep], counts[keep]
+        order = np.lexsort((found, -counts))
+        return found[order], counts[order]
+
+    def repeat_cast(self, director, min_titles=2):
+        """Acteurs apparus dans au moins min_titles titres réalisés par director"""
+        return self.collaborators(director, role=DIRECTOR, partner_role=CAST, min_titles=min_titles)
+
+    def co_appearances(self, a, b):
+        """Positions (triées) des titres communs à deux personnes"""
+        return np.intersect1d(self.titles(a), self.titles(b), assume_unique=True)
+
+    def shortest_path(self, a, b, max_titles=None):
+        """Plus court chemin de a à b : [a, titre, personne, ..., titre, b] (None si aucun)
+
+        Parcours en largeur depuis les deux extrémités à la fois, en étendant
+        toujours le côté dont la frontière touche le moins d'arêtes.
+        """
+        if a == b:
+            return [a]
+        sides = [_Search(self, a), _Search(self, b)]
+        depth = 0
+        while max_titles is None or depth < max_titles:
+            side, other = sorted(sides, key=lambda search: search.cost())
+            if not len(side.frontier):
+                return None
+            depth += 1
+            meeting = side.expand(other)
+            if meeting is not None:
+                start, end = (side, other) if side is sides[0] else (other, side)
+                return start.path_to(meeting)[::-1] + end.path_to(meeting)[1:]
+        return None
+
+
+class _Search:
+    """Un côté du parcours en largeur : distance et parent des personnes vues, frontière"""
+
+    def __init__(self, graph, origin):
+        self.graph = graph
+        self.person_depth = np.full(len(graph.people), -1, dtype=np.int32)
+        self.person_parent = np.full(len(graph.people), -1, dtype=np.int32)
+        self.title_parent = np.full(graph.n_titles, -1, dtype=np.int32)
+        self.person_depth[origin] = 0
+        self.depth = 0
+        self.origin = origin
+        self.frontier = np.array([origin], dtype=np.int32)
+
+    def cost(self):
+        """Nombre d'arêtes lues pour étendre la frontière"""
+        indptr = self.graph.person_indptr
+        return int((indptr[self.frontier + 1] - indptr[self.frontier]).sum())
+
+    def expand(self, other):
+        """Avance d'un titre ; personne où les deux parcours se rejoignent (None sinon)"""
+        graph = self.graph
+        titles, source = gather(graph.person_indptr, graph.person_titles, self.frontier)
+        new = self.title_parent[titles] < 0
+        titles, first = np.unique(titles[new], return_index=True)
+        self.title_parent[titles] = self.frontier[source[new][first]]
+
+        people, source = gather(graph.title_indptr, graph.title_people, titles)
+        new = self.person_depth[people] < 0
+        people, first = np.unique(people[new], return_index=True)
+        self.depth += 1
+        self.person_depth[people] = self.depth
+        self.person_parent[people] = titles[source[new][first]]
+        self.frontier = people.astype(np.int32)
+
+        # Personne déjà vue de l'autre côté : la plus proche de l'autre extrémité
+        met = people[other.person_depth[people] >= 0]
+        if not len(met):
+            return None
+        return int(met[np.argmin(other.person_depth[met])])
+
+    def path_to(self, person):
+        """[person, titre, ..., origin] en remontant les parents"""
+        path = [person]
+        while person != self.origin:
+            title = int(self.person_parent[person])
+            person = int(self.title_parent[title])
+            path += [title, person]
+        return path
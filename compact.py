@@ -0,0 +1,165 @@
+# REPRÉSENTATION COMPACTE DU CATALOGUE EN MÉMOIRE
+"""Types compacts pour le DataFrame partagé par le tableau de bord
+
+- colonnes texte à faible cardinalité (type, rating, country...) en category ;
+- années, mois, durées et décennie en entiers nullables Int16 ;
+- colonnes de listes en tableaux Arrow list<dictionary> : chaque élément est
+  un code int32 vers un vocabulaire partagé (un seul vocabulaire de
+  personnes pour cast_list et director_list), au lieu d'une liste Python de
+  chaînes Python par ligne.
+
+Les vues filtrées redonnent des listes Python (expand_lists) aux sections qui
+affichent ou exportent des lignes.
+"""
+
+import sys
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from data_store import LIST_COLUMNS, load_cleaned, read_sidecar_table
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # sans pyarrow, les listes restent des listes Python
+    pa = None
+
+CATEGORY_COLUMNS = ['type', 'rating', 'country', 'listed_in', 'duration']
+SMALL_INT_COLUMNS = ['release_year', 'year_added', 'month_added',
+                     'duration_min', 'duration_seasons', 'decade']
+
+# vocabulaire partagé -> colonnes de listes codées avec lui
+LIST_VOCABULARIES = {
+    'genres': ['genres_list'],
+    'countries': ['countries_list'],
+    'people': ['cast_list', 'director_list'],
+}
+
+
+def is_encoded_list(series):
+    """Vrai si la colonne est une liste Arrow (codée par compact_frame)"""
+    return isinstance(series.dtype, pd.ArrowDtype) and pa.types.is_list(series.dtype.pyarrow_dtype)
+
+
+def _list_array(series):
+    """Colonne de listes Python -> ListArray Arrow list<string>"""
+    array = pa.array(series.to_numpy(dtype=object), type=pa.list_(pa.string()), from_pandas=True)
+    return array.cast(pa.list_(pa.string()))
+
+
+def encode_list_arrays(arrays):
+    """ListArray list<string> -> list<dictionary>, avec un vocabulaire trié commun à toutes les colonnes"""
+    # Un seul passage de hachage sur les éléments, puis tri du seul vocabulaire :
+    # les codes sont renumérotés dans l'ordre alphabétique
+    children = [array.flatten().cast(pa.string()) for array in arrays.values()]
+    flat = pc.dictionary_encode(pa.concat_arrays(children) if children else pa.array([], type=pa.string()))
+    order = pc.sort_indices(flat.dictionary)
+    vocabulary = flat.dictionary.take(order)
+    rank = np.empty(len(order), dtype=np.int32)
+    rank[order.to_numpy()] = np.arange(len(order), dtype=np.int32)
+    codes = pc.take(pa.array(rank), flat.indices)
+
+    encoded = {}
+    start = 0
+    for (col, array), child in zip(arrays.items(), children):
+        offsets = pc.subtract(array.offsets, array.offsets[0])
+        column_codes = codes.slice(start, len(child))
+        start += len(child)
+        encoded[col] = pa.ListArray.from_arrays(offsets, pa.DictionaryArray.from_arrays(column_codes, vocabulary))
+    return encoded
+
+
+def encode_list_columns(df, vocabularies=LIST_VOCABULARIES):
+    """Remplace les colonnes de listes par des listes de codes vers un vocabulaire trié"""
+    for columns in vocabularies.values():
+        columns = [col for col in columns if col in df.columns and not is_encoded_list(df[col])]
+        if not columns:
+            continue
+        encoded = encode_list_arrays({col: _list_array(df[col]) for col in columns})
+        for col, array in encoded.items():
+            df[col] = pd.Series(pd.arrays.ArrowExtensionArray(array), index=df.index)
+    return df
+
+
+def compact_frame(df):
+    """Copie de df avec les types compacts (catégories, Int16, listes codées)"""
+    df = df.copy(deep=False)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in SMALL_INT_COLUMNS:
+        if col in df.columns:
+            values = df[col]
+            if values.dropna().between(-2**15, 2**15 - 1).all():
+                df[col] = values.astype('Int16')
+    if pa is not None:
+        df = encode_list_columns(df)
+    return df
+
+
+def expand_lists(frame):
+    """Colonnes de listes codées -> listes Python (pour l'affichage et l'export)"""
+    encoded = [col for col in frame.columns if is_encoded_list(frame[col])]
+    if not encoded:
+        return frame
+    frame = frame.copy(deep=False)
+    for col in encoded:
+        values = pa.array(frame[col]).to_pylist()
+        frame[col] = pd.Series(values, index=frame.index, dtype=object)
+    return frame
+
+
+def column_nbytes(series):
+    """Octets occupés par une colonne, contenu des listes Python compris"""
+    nbytes = int(series.memory_usage(index=False, deep=True))
+    if series.dtype == object and len(series) and isinstance(series.iloc[0], list):
+        # memory_usage ne compte que l'objet liste, pas les chaînes qu'il contient
+        nbytes += sum(map(sys.getsizeof, series))
+        nbytes += sum(map(sys.getsizeof, chain.from_iterable(series)))
+    return nbytes
+
+
+def memory_report(before, after):
+    """Octets par colonne avant et après compact_frame (ligne « Total » à la fin)"""
+    report = pd.DataFrame({
+        'type avant': before.dtypes.astype(str),
+        'octets avant': [column_nbytes(before[col]) for col in before.columns],
+        'type après': after.dtypes.reindex(before.columns).astype(str),
+        'octets après': [column_nbytes(after[col]) for col in before.columns],
+    }, index=pd.Index(before.columns, name='colonne'))
+    report.loc['Total'] = ['', report['octets avant'].sum(), '', report['octets après'].sum()]
+    report['gain'] = report['octets avant'] / report['octets après'].replace(0, np.nan)
+    return report
+
+
+def compact_table(table, vocabularies=LIST_VOCABULARIES):
+    """Table Arrow du cache -> DataFrame compact, listes codées sans passer par des listes Python"""
+    list_cols = [col for col in LIST_COLUMNS if col in table.column_names]
+    df = table.drop_columns(list_cols).to_pandas()
+    for columns in vocabularies.values():
+        columns = [col for col in columns if col in list_cols]
+        if not columns:
+            continue
+        arrays = {col: table.column(col).combine_chunks().cast(pa.list_(pa.string())) for col in columns}
+        for col, array in encode_list_arrays(arrays).items():
+            df[col] = pd.Series(pd.arrays.ArrowExtensionArray(array), index=df.index)
+    return compact_frame(df[table.column_names])
+
+
+def load_compact(path):
+    """Catalogue nettoyé en types compacts
+
+    L'empreinte mémoire (memory_report) n'est pas calculée ici : elle demande
+    les listes Python du chargement classique (load_cleaned).
+    """
+    table = read_sidecar_table(path)
+    if table is None:
+        # Premier chargement : analyse du CSV, qui écrit le cache Arrow
+        loaded = load_cleaned(path)
+        table = read_sidecar_table(path)
+        if table is None:
+            # Sans pyarrow ou sans cache possible (dossier en lecture seule)
+            return compact_frame(loaded.reset_index(drop=True))
+    return compact_table(table)
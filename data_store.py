@@ -0,0 +1,293 @@
+# CHARGEMENT ET CACHE DES DONNÉES NETTOYÉES
+"""Lecture de netflix_titles_cleaned.csv avec un cache colonnaire (Arrow IPC)
+
+Le CSV nettoyé est analysé une seule fois : les types (dates, numériques,
+listes) sont écrits dans un fichier .arrow voisin, vérifié à chaque
+chargement contre la taille, la date de modification et l'empreinte du CSV,
+puis relu par memory-map sans aucune analyse de texte.
+
+Le fichier est un flux Arrow IPC : on peut y ajouter des lots de lignes sans
+le réécrire. L'empreinte du CSV est portée par le schéma, puis par les
+métadonnées du dernier lot qui en a une.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from list_columns import decode_list_column, to_lists
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc
+except ImportError:  # pyarrow est optionnel : sans lui, on relit le CSV
+    pa = None
+
+CLEANED_FILENAME = "netflix_titles_cleaned.csv"
+SIDECAR_SUFFIX = ".arrow"
+SIDECAR_VERSION = 2
+METADATA_KEY = b"netflix.source"
+# Marque de fin d'un flux Arrow IPC (continuation + message de longueur nulle)
+END_OF_STREAM = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+DATE_COLUMNS = ['date_added']
+NUMERIC_COLUMNS = ['release_year', 'year_added', 'month_added',
+                   'duration_min', 'duration_seasons', 'decade']
+LIST_COLUMNS = ['genres_list', 'countries_list', 'cast_list', 'director_list']
+
+
+def sidecar_path(csv_path):
+    """Chemin du cache Arrow associé à un CSV"""
+    return os.path.splitext(csv_path)[0] + SIDECAR_SUFFIX
+
+
+def file_fingerprint(path):
+    """Taille et date de modification (ns) d'un fichier"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """Empreinte BLAKE2b du contenu d'un fichier"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_cleaned_csv(path):
+    """Lit le CSV nettoyé et reconstruit les types de chaque colonne"""
+    df = pd.read_csv(path, encoding='utf-8')
+
+    # Colonnes datetime
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    # Colonnes numériques
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # Colonnes de listes : décodage en bloc, colonne par colonne
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = to_lists(*decode_list_column(df[col]))
+
+    return df
+
+
+def arrow_schema(df, metadata=None):
+    """Schéma Arrow du catalogue : colonnes de listes en list<string>
+
+    Les autres types sont déduits des données de df ; une colonne entièrement
+    vide (type null) est stockée en texte.
+    """
+    fields = []
+    for col in df.columns:
+        if col in LIST_COLUMNS:
+            fields.append(pa.field(col, pa.list_(pa.string())))
+            continue
+        field = pa.Schema.from_pandas(df[[col]], preserve_index=False).field(col)
+        if pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields, metadata=metadata)
+
+
+def _numeric_as_float(df):
+    """Entiers nullables (durées du pipeline de nettoyage) en flottants avec NaN"""
+    # Mêmes types que parse_cleaned_csv, qui relit ces colonnes en flottants
+    nullable = [col for col in NUMERIC_COLUMNS
+                if col in df.columns and isinstance(df[col].dtype, pd.api.extensions.ExtensionDtype)]
+    if nullable:
+        df = df.astype({col: 'float64' for col in nullable})
+    return df
+
+
+def write_sidecar(df, csv_path, source=None):
+    """Écrit le DataFrame typé dans le cache Arrow du CSV"""
+    if pa is None:
+        return None
+    if source is None:
+        source = dict(file_fingerprint(csv_path), hash=file_hash(csv_path))
+    source = dict(source, version=SIDECAR_VERSION)
+
+    df = _numeric_as_float(df)
+    schema = arrow_schema(df, metadata={METADATA_KEY: json.dumps(source).encode()})
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+    # Écriture atomique : un lecteur concurrent ne voit jamais un fichier partiel
+    path = sidecar_path(csv_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Dossier en lecture seule : on se passe du cache
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    return path
+
+
+def _append_batches(path, schema, batches, source):
+    """Ajoute des lots de lignes à la fin du flux du cache, le dernier portant l'empreinte source
+
+    Seuls les nouveaux messages sont écrits, à la place de la marque de fin.
+    Renvoie False si le fichier ne se termine pas par une marque de fin.
+    """
+    # Messages des lots, sans le schéma ni la marque de fin du flux qui les encadrent
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema):
+        pass
+    header = sink.getvalue().size - len(END_OF_STREAM)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for i, batch in enumerate(batches):
+            last = i == len(batches) - 1
+            writer.write_batch(batch, custom_metadata={METADATA_KEY: json.dumps(source).encode()} if last else None)
+    data = sink.getvalue()
+    messages = data.slice(header, data.size - header - len(END_OF_STREAM))
+
+    try:
+        with open(path, 'r+b') as f:
+            f.seek(-len(END_OF_STREAM), os.SEEK_END)
+            if f.read(len(END_OF_STREAM)) != END_OF_STREAM:
+                return False
+            f.seek(-len(END_OF_STREAM), os.SEEK_END)
+            f.write(messages.to_pybytes())
+            f.write(END_OF_STREAM)
+    except OSError:
+        return False
+    return True
+
+
+def append_sidecar(df, csv_path, schema):
+    """Ajoute les lignes de df (déjà ajoutées au CSV) au cache Arrow, sans le réécrire
+
+    schema est celui du cache (read_sidecar_table). L'empreinte enregistrée est
+    celle du CSV complété, sans son contenu haché : il faudrait relire tout le
+    fichier, et un simple changement de date reconstruira le cache une fois.
+    Renvoie None si le lot ne correspond pas au schéma ou si l'écriture échoue :
+    le cache, périmé, est alors recréé au prochain chargement.
+    """
+    if pa is None:
+        return None
+    schema = schema.remove_metadata()
+    try:
+        rows = pa.Table.from_pandas(_numeric_as_float(df), schema=schema, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    source = dict(file_fingerprint(csv_path), hash=None, version=SIDECAR_VERSION)
+    path = sidecar_path(csv_path)
+    if not _append_batches(path, schema, rows.to_batches(), source):
+        return None
+    return path
+
+
+def _read_stream(path):
+    """Table du flux et dernière empreinte du CSV enregistrée (schéma ou lots)"""
+    with pa.memory_map(path, 'r') as source:
+        reader = pa.ipc.open_stream(source)
+        info = (reader.schema.metadata or {}).get(METADATA_KEY, b'{}')
+        batches = []
+        while True:
+            try:
+                batch, metadata = reader.read_next_batch_with_custom_metadata()
+            except StopIteration:
+                break
+            batches.append(batch)
+            if metadata is not None and METADATA_KEY in metadata:
+                info = metadata[METADATA_KEY]
+        return pa.Table.from_batches(batches, schema=reader.schema), info
+
+
+def _sidecar_is_fresh(source, current, csv_path):
+    """Vérifie que le cache correspond toujours au CSV (current : son empreinte actuelle)"""
+    if source.get('version') != SIDECAR_VERSION:
+        return False
+    if current['size'] != source.get('size'):
+        return False
+    if current['mtime_ns'] == source.get('mtime_ns'):
+        return True
+    # Date modifiée (copie, touch...) : on compare le contenu, s'il a été haché
+    if source.get('hash') is None:
+        return False
+    return file_hash(csv_path) == source.get('hash')
+
+
+def _lists_from_arrow(column):
+    """Reconstruit les listes Python d'une colonne Arrow list<string>"""
+    array = column.combine_chunks()
+    offsets = array.offsets.to_numpy()
+    return to_lists(array.flatten().to_pylist(), offsets - offsets[0])
+
+
+def read_sidecar_table(csv_path):
+    """Table Arrow du cache, relue par memory-map, ou None s'il est absent ou périmé"""
+    path = sidecar_path(csv_path)
+    if pa is None or not os.path.exists(path):
+        return None
+    try:
+        table, info = _read_stream(path)
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+    try:
+        info = json.loads(info)
+    except ValueError:
+        return None
+    current = file_fingerprint(csv_path)
+    if not _sidecar_is_fresh(info, current, csv_path):
+        return None
+    if current['mtime_ns'] != info.get('mtime_ns'):
+        # Même contenu, autre date (touch, copie) : la nouvelle date est
+        # enregistrée (lot vide) pour ne pas recalculer l'empreinte à chaque chargement
+        empty = pa.RecordBatch.from_arrays([pa.array([], type=field.type) for field in table.schema],
+                                           schema=table.schema)
+        _append_batches(path, table.schema, [empty], dict(info, **current))
+    return table
+
+
+def table_frame(table):
+    """DataFrame d'une table du cache, colonnes de listes en listes Python"""
+    list_cols = [col for col in LIST_COLUMNS if col in table.column_names]
+    df = table.drop_columns(list_cols).to_pandas()
+    for col in list_cols:
+        df[col] = pd.Series(_lists_from_arrow(table.column(col)), index=df.index, dtype=object)
+    return df[table.column_names]
+
+
+def table_rows(table, column, values):
+    """Lignes de la table dont la colonne vaut l'une des valeurs (table_frame)"""
+    # Table de hachage sur les seules valeurs demandées, parcours de la colonne
+    values = pa.array(list(values), type=table.schema.field(column).type)
+    rows = pc.indices_nonzero(pc.is_in(table.column(column), value_set=values))
+    return table_frame(table.take(rows))
+
+
+def read_sidecar(csv_path):
+    """Relit le cache Arrow (listes Python), ou None s'il est absent ou périmé"""
+    table = read_sidecar_table(csv_path)
+    if table is None:
+        return None
+    return table_frame(table)
+
+
+def load_cleaned(csv_path):
+    """Charge le CSV nettoyé via son cache Arrow, recréé si nécessaire"""
+    df = read_sidecar(csv_path)
+    if df is not None:
+        return df
+
+    source = dict(file_fingerprint(csv_path), hash=file_hash(csv_path)) if pa is not None else None
+    df = parse_cleaned_csv(csv_path)
+    write_sidecar(df, csv_path, source)
+    return df
@@ -0,0 +1,111 @@
+# EXPLORATEUR PAGINÉ DES DONNÉES FILTRÉES
+"""Tri et pagination côté serveur des lignes filtrées
+
+Pour chaque colonne affichable, l'ordre de tri du catalogue complet (argsort
+stable, valeurs manquantes en dernier) est calculé une seule fois par sens et
+partagé entre les sessions. Trier une sélection ne demande alors aucun tri :
+on parcourt cet ordre en ne gardant que les lignes retenues par les filtres
+(un masque booléen, en temps linéaire). Seules les lignes de la page demandée
+sont ensuite copiées et envoyées au navigateur.
+"""
+
+import math
+import threading
+
+import numpy as np
+import pandas as pd
+
+from filtering import FilteredView
+
+DISPLAY_COLUMNS = ['title', 'type', 'release_year', 'country', 'rating', 'duration', 'listed_in']
+PAGE_SIZES = [25, 50, 100, 200]
+
+# Colonnes triées selon d'autres colonnes : la durée suit les minutes (films)
+# puis le nombre de saisons (séries), au lieu de l'ordre alphabétique du texte
+SORT_KEYS = {
+    'duration': ('duration_min', 'duration_seasons'),
+}
+
+
+def sort_codes(series):
+    """Rang dense de chaque valeur dans l'ordre croissant (-1 pour les valeurs manquantes)
+
+    Les catégories sont classées selon leur valeur, pas selon l'ordre des catégories.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        ranks = np.empty(len(categories), dtype=np.int64)
+        ranks[np.argsort(categories.to_numpy(), kind='stable')] = np.arange(len(categories))
+        codes = series.cat.codes.to_numpy()
+        return np.where(codes < 0, -1, ranks[codes])
+    codes, _ = pd.factorize(series, sort=True)
+    return codes.astype(np.int64)
+
+
+def sort_order(df, columns, descending=False):
+    """Positions de df triées selon columns (tri stable, valeurs manquantes en dernier)"""
+    keys = []
+    # np.lexsort trie selon la dernière clé d'abord : colonnes ajoutées à l'envers
+    for col in reversed(columns):
+        codes = sort_codes(df[col])
+        missing = codes < 0
+        if descending:
+            codes = -codes
+        codes[missing] = np.iinfo(np.int64).max
+        keys.append(codes)
+    order = np.lexsort(keys)
+    return order.astype(np.int32) if len(df) < 2**31 else order
+
+
+class SortIndex:
+    """Ordres de tri du catalogue complet, calculés à la première demande par colonne et par sens"""
+
+    def __init__(self, df, sort_keys=SORT_KEYS):
+        self.df = df
+        self.sort_keys = sort_keys
+        self.orders = {}
+        self._lock = threading.Lock()
+
+    def key_columns(self, column):
+        """Colonnes dont dépend le tri de column"""
+        columns = self.sort_keys.get(column, (column,))
+        return columns if all(col in self.df.columns for col in columns) else (column,)
+
+    def order(self, column, descending=False):
+        """Positions du catalogue complet triées selon column"""
+        key = (column, descending)
+        with self._lock:
+            if key not in self.orders:
+                self.orders[key] = sort_order(self.df, self.key_columns(column), descending)
+            return self.orders[key]
+
+    def sort(self, view, column, descending=False):
+        """Vue des lignes de view dans l'ordre de column"""
+        order = self.order(column, descending)
+        if view.positions is None:
+            return FilteredView(self.df, order)
+        member = np.zeros(len(self.df), dtype=bool)
+        member[view.positions] = True
+        return FilteredView(self.df, order[member[order]])
+
+
+def page_count(rows, page_size):
+    """Nombre de pages (au moins une, même vide)"""
+    return max(1, math.ceil(rows / page_size))
+
+
+def page_positions(view, page, page_size):
+    """Positions dans le catalogue des lignes de la page page"""
+    start = (page - 1) * page_size
+    if view.positions is None:
+        return np.arange(start, min(start + page_size, len(view)))
+    return view.positions[start:start + page_size]
+
+
+def page_frame(view, columns, page, page_size):
+    """Lignes de la page page (numérotée à partir de 1) d'une vue triée"""
+    start = (page - 1) * page_size
+    frame = view.frame(columns, limit=page_size, offset=start)
+    # Numéro de ligne dans la sélection triée plutôt que l'index du catalogue
+    frame.index = pd.RangeIndex(start + 1, start + 1 + len(frame))
+    return frame
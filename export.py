@@ -0,0 +1,79 @@
+# EXPORT DES DONNÉES FILTRÉES
+"""Export à la demande des lignes filtrées (CSV, CSV gzip, Parquet)
+
+Le fichier n'est produit que lorsque l'utilisateur clique sur le bouton de
+téléchargement. Les lignes sont sérialisées par blocs dans un fichier
+temporaire (en mémoire jusqu'à une certaine taille, puis sur disque) : on
+n'a jamais en mémoire à la fois tout le CSV en str et tout le CSV en bytes.
+"""
+
+import gzip
+import tempfile
+
+from data_store import arrow_schema, pa
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # export Parquet indisponible sans pyarrow
+    pq = None
+
+CHUNK_ROWS = 50_000
+SPOOL_BYTES = 32 * 2**20
+
+# format -> (libellé, extension, type MIME)
+EXPORT_FORMATS = {
+    'csv': ("CSV", '.csv', 'text/csv'),
+    'csv.gz': ("CSV compressé (gzip)", '.csv.gz', 'application/gzip'),
+    'parquet': ("Parquet", '.parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def available_formats():
+    """Formats d'export utilisables dans l'environnement courant"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or pq is not None]
+
+
+def write_csv(view, fileobj, chunk_rows=CHUNK_ROWS):
+    """Écrit les lignes de la vue en CSV UTF-8, bloc par bloc"""
+    header = True
+    for chunk in view.iter_frames(chunk_rows):
+        fileobj.write(chunk.to_csv(index=False, header=header).encode('utf-8'))
+        header = False
+    if header:
+        # Sélection vide : on garde au moins la ligne d'en-tête
+        fileobj.write(view.frame(limit=0).to_csv(index=False).encode('utf-8'))
+
+
+def write_parquet(view, fileobj, chunk_rows=CHUNK_ROWS):
+    """Écrit les lignes de la vue en Parquet, un groupe de lignes par bloc"""
+    schema = None
+    writer = None
+    for chunk in view.iter_frames(chunk_rows):
+        if schema is None:
+            schema = arrow_schema(chunk)
+            writer = pq.ParquetWriter(fileobj, schema, compression='zstd')
+        writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    if writer is None:
+        # Sélection vide : même conversion que les blocs (listes codées -> listes Python)
+        empty = view.frame(limit=0)
+        pq.write_table(pa.Table.from_pandas(empty, schema=arrow_schema(empty), preserve_index=False), fileobj)
+    else:
+        writer.close()
+
+
+def export_file(view, fmt, chunk_rows=CHUNK_ROWS):
+    """Fichier temporaire (rembobiné) contenant l'export de la vue au format demandé"""
+    target = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    if fmt == 'csv':
+        write_csv(view, target, chunk_rows)
+    elif fmt == 'csv.gz':
+        with gzip.GzipFile(fileobj=target, mode='wb', compresslevel=6) as compressed:
+            write_csv(view, compressed, chunk_rows)
+    elif fmt == 'parquet':
+        if pq is None:
+            raise ValueError("L'export Parquet nécessite pyarrow")
+        write_parquet(view, target, chunk_rows)
+    else:
+        raise ValueError(f"Format d'export inconnu : {fmt}")
+    target.seek(0)
+    return target
@@ -0,0 +1,69 @@
+# CACHE DES FIGURES PLOTLY
+"""Figures Plotly allégées, partagées entre les sessions du tableau de bord
+
+Chaque graphique est mémorisé selon ses propres entrées (nom du graphique,
+clé normalisée des filtres, pays ou genres affichés) : une session qui
+affiche un graphique déjà construit pour les mêmes entrées, par elle-même ou
+par une autre session, réutilise la figure au lieu de la reconstruire.
+
+Avant d'être mémorisée, la figure est allégée sans changer son rendu : son
+modèle (template) ne garde que les styles des types de traces qu'elle
+utilise (plotly.js n'applique template.data qu'aux traces du même type).
+Les tableaux numériques sont déjà encodés par Plotly en tableaux typés
+(base64, plus petit type entier suffisant).
+
+La taille du JSON envoyé au navigateur est mesurée une fois par figure,
+avant et après allègement.
+"""
+
+import plotly.io as pio
+
+from filtering import LRUCache
+
+
+def payload_size(fig):
+    """Taille en octets du JSON de la figure envoyé au navigateur"""
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
+
+
+def compact_figure(fig):
+    """Allège la figure en place : modèle réduit aux types de traces utilisés"""
+    template = fig.layout.template
+    used = {trace.type for trace in fig.data}
+    template.data = {trace_type: template.data[trace_type] for trace_type in used}
+    return fig
+
+
+class CachedFigure:
+    """Figure allégée (None si rien à afficher) et taille de son JSON avant / après allègement"""
+
+    __slots__ = ('figure', 'payload', 'original')
+
+    def __init__(self, figure, payload=0, original=0):
+        self.figure = figure
+        self.payload = payload
+        self.original = original
+
+    @classmethod
+    def build(cls, figure):
+        if figure is None:
+            return cls(None)
+        original = payload_size(figure)
+        compact_figure(figure)
+        return cls(figure, payload_size(figure), original)
+
+
+class FigureCache(LRUCache):
+    """Figures mémorisées par (graphique, entrées du graphique), partagées en lecture seule"""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 2**20):
+        super().__init__(max_entries, max_bytes)
+
+    def figure(self, name, inputs, build):
+        """CachedFigure du graphique name pour ces entrées ; build() n'est appelé qu'en cas d'échec
+
+        inputs doit être hachable et décrire tout ce dont dépend la figure.
+        """
+        # La taille du JSON sert d'estimation de la mémoire occupée par la figure
+        return self.get_or_compute((name, inputs), lambda: CachedFigure.build(build()),
+                                   lambda cached: cached.payload)
@@ -0,0 +1,74 @@
+# INDEX INVERSÉS POUR LES FILTRES PAYS / GENRES
+"""Index inversés construits une fois à partir des colonnes de listes
+
+Chaque valeur (pays, genre) reçoit un identifiant entier et une liste triée
+des positions de lignes qui la contiennent (format CSR : indptr + rows).
+Une sélection devient l'union de quelques listes de lignes, sans parcourir
+le texte de chaque ligne, et la correspondance est exacte : « India » ne
+sélectionne plus « British Indian Ocean Territory ».
+"""
+
+import numpy as np
+import pandas as pd
+
+from list_columns import explode_list_column
+
+
+class ListIndex:
+    """Index inversé d'une colonne de listes (valeur -> positions de lignes)"""
+
+    def __init__(self, series):
+        self.n_rows = len(series)
+        row_ids, values = explode_list_column(series)
+
+        # Encodage dictionnaire : un identifiant entier par valeur distincte
+        codes, vocabulary = pd.factorize(values)
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        self.ids = {value: i for i, value in enumerate(self.vocabulary)}
+
+        # Paires (valeur, ligne) uniques triées par valeur puis par ligne
+        valid = codes >= 0
+        stride = max(self.n_rows, 1)
+        pairs = np.unique(codes[valid].astype(np.int64) * stride + row_ids[valid])
+        self.rows = (pairs % stride).astype(np.int32)
+        counts = np.bincount(pairs // stride, minlength=len(self.vocabulary))
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def __contains__(self, value):
+        return value in self.ids
+
+    def postings(self, value):
+        """Positions (triées) des lignes contenant la valeur"""
+        i = self.ids.get(value)
+        if i is None:
+            return self.rows[:0]
+        return self.rows[self.indptr[i]:self.indptr[i + 1]]
+
+    def mask(self, values):
+        """Masque booléen des lignes contenant au moins une des valeurs"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for value in values:
+            mask[self.postings(value)] = True
+        return mask
+
+    def counts(self):
+        """Nombre de lignes par valeur, du plus fréquent au moins fréquent"""
+        counts = pd.Series(np.diff(self.indptr), index=self.vocabulary)
+        # Tri stable : à égalité, ordre de première apparition (comme Counter)
+        return counts.iloc[np.argsort(-counts.to_numpy(), kind='stable')]
+
+    def most_common(self, k):
+        """Les k valeurs les plus fréquentes"""
+        return self.counts().index[:k].tolist()
+
+
+def build_filter_indexes(df):
+    """Index des filtres de la barre latérale : {'country': ..., 'genre': ...}"""
+    return {
+        'country': ListIndex(df['countries_list']),
+        'genre': ListIndex(df['genres_list']),
+    }
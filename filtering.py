@@ -0,0 +1,218 @@
+# FILTRES DE LA BARRE LATÉRALE
+"""Application des filtres (type, période, pays, genres) et cache LRU des résultats
+
+L'état de la barre latérale est d'abord normalisé en une clé (valeurs triées,
+filtres sans effet retirés) : deux états équivalents partagent la même entrée
+de cache, et un filtre qui ne retire aucune ligne ne provoque aucune copie.
+Les filtres sont combinés en un seul masque NumPy et le résultat est une vue
+(positions des lignes retenues) : les colonnes ne sont copiées qu'à la
+demande. Le cache est borné en nombre d'entrées et en octets.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from compact import expand_lists
+
+
+def filter_domain(df):
+    """Types présents et bornes des années (None si des années manquent)"""
+    years = df['release_year']
+    bounds = None
+    if len(df) and years.notna().all():
+        bounds = (years.min(), years.max())
+    return set(df['type'].dropna().unique()), df['type'].isna().any(), bounds
+
+
+def normalize_filters(domain, content_type, year_range, countries, genres):
+    """Clé canonique (types, période, pays, genres) de l'état des filtres
+
+    Un élément vaut None quand le filtre correspondant est sans effet sur le
+    catalogue décrit par domain (voir filter_domain).
+    """
+    all_types, has_missing_type, year_bounds = domain
+    types = None
+    if content_type and (has_missing_type or not all_types <= set(content_type)):
+        types = tuple(sorted(content_type))
+
+    years = (int(year_range[0]), int(year_range[1]))
+    if year_bounds is not None and years[0] <= year_bounds[0] and years[1] >= year_bounds[1]:
+        years = None
+
+    return (
+        types,
+        years,
+        tuple(sorted(countries)) or None,
+        tuple(sorted(genres)) or None,
+    )
+
+
+def filter_mask(df, indexes, key):
+    """Masque booléen unique combinant les filtres d'une clé (None si aucun filtre)
+
+    Chaque prédicat est évalué sur les tableaux NumPy des colonnes et combiné
+    en place : aucun DataFrame intermédiaire n'est créé.
+    """
+    types, years, countries, genres = key
+    if key == (None, None, None, None):
+        return None
+    mask = np.ones(len(df), dtype=bool)
+
+    # Filtre par type
+    if types is not None:
+        mask &= df['type'].isin(types).to_numpy()
+
+    # Filtre par période
+    if years is not None:
+        release_year = df['release_year'].to_numpy(dtype=float, na_value=np.nan)
+        mask &= release_year >= years[0]
+        mask &= release_year <= years[1]
+
+    # Filtres par pays et par genres (union des listes de lignes de l'index)
+    if countries is not None:
+        mask &= indexes['country'].mask(countries)
+    if genres is not None:
+        mask &= indexes['genre'].mask(genres)
+
+    return mask
+
+
+class FilteredView:
+    """Lignes retenues par les filtres : positions dans df, sans copie des données
+
+    Les colonnes ne sont matérialisées qu'à la demande, et seulement celles
+    que la section appelante lit réellement.
+    """
+
+    def __init__(self, df, positions=None):
+        self.df = df
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.df) if self.positions is None else len(self.positions)
+
+    @property
+    def nbytes(self):
+        """Octets propres à la vue (le tableau des positions)"""
+        return 0 if self.positions is None else int(self.positions.nbytes)
+
+    def frame(self, columns=None, limit=None, offset=0):
+        """DataFrame des lignes retenues, limité aux colonnes (et lignes) demandées
+
+        offset et limit sélectionnent une tranche des lignes retenues (une page).
+        Les colonnes de listes codées (compact_frame) redeviennent des listes Python.
+        """
+        source = self.df if columns is None else self.df[list(columns)]
+        stop = None if limit is None else offset + limit
+        if self.positions is None:
+            return expand_lists(source.iloc[offset:stop] if offset or limit is not None else source)
+        positions = self.positions[offset:stop] if offset or limit is not None else self.positions
+        return expand_lists(source.take(positions))
+
+    def iter_frames(self, chunk_rows, columns=None):
+        """DataFrames successifs d'au plus chunk_rows lignes retenues"""
+        source = self.df if columns is None else self.df[list(columns)]
+        for start in range(0, len(self), chunk_rows):
+            if self.positions is None:
+                yield expand_lists(source.iloc[start:start + chunk_rows])
+            else:
+                yield expand_lists(source.take(self.positions[start:start + chunk_rows]))
+
+    def column(self, name):
+        """Valeurs d'une colonne pour les lignes retenues (tableau NumPy)"""
+        values = self.df[name].to_numpy()
+        return values if self.positions is None else values[self.positions]
+
+
+def filter_view(df, indexes, key):
+    """Vue des lignes correspondant à une clé de normalize_filters"""
+    mask = filter_mask(df, indexes, key)
+    if mask is None:
+        return FilteredView(df)
+    positions = np.flatnonzero(mask)
+    if len(df) < 2**31:
+        positions = positions.astype(np.int32)
+    return FilteredView(df, positions)
+
+
+class LRUCache:
+    """Cache LRU borné en nombre d'entrées et en octets, avec compteurs"""
+
+    def __init__(self, max_entries=64, max_bytes=256 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_or_compute(self, key, compute, sizeof):
+        """Valeur en cache pour key, sinon compute() mémorisé"""
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+
+        # Calcul hors verrou : les autres sessions ne sont pas bloquées
+        value = compute()
+        size = sizeof(value)
+        with self._lock:
+            if key not in self.entries and size <= self.max_bytes:
+                self.entries[key] = (value, size)
+                self.nbytes += size
+                self._evict()
+        return value
+
+    def _evict(self):
+        """Retire les entrées les moins récemment utilisées au-delà des limites"""
+        while self.entries and (len(self.entries) > self.max_entries or self.nbytes > self.max_bytes):
+            _, (_, size) = self.entries.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        with self._lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Compteurs du cache"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.nbytes,
+        }
+
+
+class FilterCache(LRUCache):
+    """Résultats filtrés d'un catalogue, mémorisés par clé normalisée des filtres"""
+
+    def __init__(self, df, indexes, max_entries=64, max_bytes=256 * 2**20):
+        super().__init__(max_entries, max_bytes)
+        self.df = df
+        self.indexes = indexes
+        self.domain = filter_domain(df)
+
+    def key(self, content_type, year_range, countries, genres):
+        """Clé normalisée d'un état de la barre latérale"""
+        return normalize_filters(self.domain, content_type, year_range, countries, genres)
+
+    def filter(self, content_type, year_range, countries, genres):
+        """Vue des lignes filtrées (FilteredView), sans copie si aucun filtre ne s'applique"""
+        key = self.key(content_type, year_range, countries, genres)
+        if key == (None, None, None, None):
+            return FilteredView(self.df)
+        return self.get_or_compute(key, lambda: filter_view(self.df, self.indexes, key),
+                                   lambda view: view.nbytes)
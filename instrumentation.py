@@ -0,0 +1,205 @@
+# INSTRUMENTATION DES ÉTAPES DU TABLEAU DE BORD
+"""Mesure optionnelle de chaque étape d'une exécution d'app.py
+
+Activée par la variable d'environnement NETFLIX_INSTRUMENT=1. Pour chaque
+étape (chargement, index, filtres, sections, export) on enregistre la durée,
+les lignes en entrée et en sortie et la variation de mémoire du processus
+(RSS). Les mesures d'une exécution sont affichées dans un panneau de
+débogage et ajoutées, une ligne JSON par étape, au fichier donné par
+NETFLIX_INSTRUMENT_LOG (défaut : netflix_instrumentation.jsonl), pour
+calculer des percentiles de latence sur plusieurs sessions :
+
+    python instrumentation.py netflix_instrumentation.jsonl
+
+Désactivée, chaque étape ne coûte qu'un appel de fonction.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from aggregates import SliceSummary
+from filtering import FilteredView
+
+try:
+    import psutil
+except ImportError:  # sans psutil, la mémoire est lue dans /proc (Linux)
+    psutil = None
+
+ENABLE_VARIABLE = 'NETFLIX_INSTRUMENT'
+LOG_VARIABLE = 'NETFLIX_INSTRUMENT_LOG'
+DEFAULT_LOG = 'netflix_instrumentation.jsonl'
+PERCENTILES = [0.5, 0.9, 0.99]
+
+_write_lock = threading.Lock()
+
+
+def current_rss():
+    """Mémoire résidente du processus en octets (None si indisponible)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def rows_of(value):
+    """Nombre de lignes d'un résultat d'étape (DataFrame, Series, vue filtrée, agrégats)"""
+    if isinstance(value, SliceSummary):
+        return value.total
+    if isinstance(value, (pd.DataFrame, pd.Series, FilteredView)):
+        return len(value)
+    return None
+
+
+class StageRecord:
+    """Mesure d'une étape ; rows_in et rows_out peuvent être renseignés pendant l'étape"""
+
+    __slots__ = ('stage', 'parent', 'rows_in', 'rows_out', 'seconds', 'memory_delta', 'error')
+
+    def __init__(self, stage, parent=None, rows_in=None):
+        self.stage = stage
+        self.parent = parent
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.seconds = None
+        self.memory_delta = None
+        self.error = None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class StageRecorder:
+    """Enregistre les étapes d'une exécution du script (sans effet si désactivé)"""
+
+    def __init__(self, enabled=False, log_path=None, session=None, run=None):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.session = session
+        self.run = run
+        self.records = []
+        self.pending = []
+        self._stack = []
+        self._start = time.perf_counter()
+        self._start_memory = current_rss() if enabled else None
+
+    @classmethod
+    def from_env(cls, session=None, run=None):
+        """Recorder activé si NETFLIX_INSTRUMENT vaut 1, true ou yes"""
+        enabled = os.environ.get(ENABLE_VARIABLE, '').strip().lower() in ('1', 'true', 'yes')
+        log_path = os.environ.get(LOG_VARIABLE, DEFAULT_LOG) if enabled else None
+        return cls(enabled, log_path or None, session, run)
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """Mesure le bloc with ; le StageRecord produit permet de renseigner rows_out"""
+        record = StageRecord(name, self._stack[-1] if self._stack else None, rows_in)
+        if not self.enabled:
+            yield record
+            return
+        self._stack.append(name)
+        memory = current_rss()
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.seconds = time.perf_counter() - start
+            after = current_rss()
+            record.memory_delta = after - memory if memory is not None and after is not None else None
+            self._stack.pop()
+            self.records.append(record)
+            self.pending.append(record)
+
+    def call(self, name, compute, rows_in=None):
+        """Résultat de compute() mesuré comme une étape (rows_out déduit du résultat)"""
+        with self.stage(name, rows_in) as record:
+            value = compute()
+            record.rows_out = rows_of(value)
+        return value
+
+    def deferred(self, name, compute, rows_in=None):
+        """compute mesuré et journalisé quand il est appelé plus tard (téléchargement)"""
+        if not self.enabled:
+            return compute
+
+        def run():
+            value = self.call(name, compute, rows_in)
+            self.flush()
+            return value
+
+        return run
+
+    def frame(self):
+        """Étapes de l'exécution en cours (une ligne par étape)"""
+        columns = list(StageRecord.__slots__)
+        return pd.DataFrame([record.as_dict() for record in self.records], columns=columns)
+
+    def finish(self, name='exécution'):
+        """Ajoute l'étape englobant toute l'exécution du script (depuis la création du recorder)"""
+        if not self.enabled:
+            return
+        record = StageRecord(name)
+        record.seconds = time.perf_counter() - self._start
+        memory = current_rss()
+        if memory is not None and self._start_memory is not None:
+            record.memory_delta = memory - self._start_memory
+        self.records.append(record)
+        self.pending.append(record)
+
+    def flush(self):
+        """Ajoute les étapes non encore écrites au journal JSONL"""
+        if not self.enabled or not self.log_path or not self.pending:
+            self.pending = []
+            return
+        timestamp = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        lines = [json.dumps({'time': timestamp, 'session': self.session, 'run': self.run, **record.as_dict()},
+                            ensure_ascii=False)
+                 for record in self.pending]
+        with _write_lock, open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        self.pending = []
+
+
+def read_log(path):
+    """Journal JSONL -> DataFrame (une ligne par étape mesurée)"""
+    return pd.read_json(path, lines=True)
+
+
+def latency_percentiles(log, percentiles=PERCENTILES):
+    """Nombre de mesures et percentiles de durée (ms) par étape"""
+    grouped = log.groupby('stage')['seconds']
+    table = grouped.quantile(percentiles).unstack() * 1000
+    table.columns = [f"p{round(q * 100)} (ms)" for q in percentiles]
+    table.insert(0, 'mesures', grouped.size())
+    table['mémoire moyenne (Mo)'] = log.groupby('stage')['memory_delta'].mean() / 2**20
+    return table.sort_values(table.columns[-2], ascending=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Percentiles de latence par étape d'un journal d'instrumentation.")
+    parser.add_argument('log', nargs='?', default=DEFAULT_LOG, help="journal JSONL (défaut : %(default)s)")
+    args = parser.parse_args(argv)
+
+    log = read_log(args.log)
+    print(f"{len(log):,} mesures, {log['session'].nunique()} sessions, "
+          f"{log[['session', 'run']].drop_duplicates().shape[0]} exécutions")
+    with pd.option_context('display.width', 160, 'display.max_columns', None, 'display.float_format', '{:.1f}'.format):
+        print(latency_percentiles(log))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
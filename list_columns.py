@@ -0,0 +1,135 @@
+# COLONNES DE LISTES (genres_list, countries_list, cast_list, director_list)
+"""Décodage en bloc des colonnes de listes du CSV nettoyé
+
+Une colonne entière est convertie en une fois au format « valeurs + offsets »
+(même disposition qu'une ListArray Arrow) : les éléments de la ligne i sont
+values[offsets[i]:offsets[i + 1]]. Le découpage se fait avec les opérations
+vectorisées de pandas au lieu d'un ast.literal_eval par cellule.
+"""
+
+import ast
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # colonnes Arrow impossibles sans pyarrow
+    pa = None
+
+QUOTES = ('"', "'")
+
+
+def decode_list_column(series):
+    """Décode une colonne texte ("['a', 'b']" ou "a, b") en (values, offsets)
+
+    Reproduit convert_to_list : NaN, '' et '[]' donnent une liste vide, une
+    liste Python écrite par to_csv est relue élément par élément, et un texte
+    simple est découpé sur les virgules (éléments vides ignorés).
+    """
+    n = len(series)
+    text = pd.Series(series, copy=False).fillna('').astype(str).str.strip()
+
+    # Retirer les crochets des listes Python sérialisées
+    bracketed = text.str.startswith('[') & text.str.endswith(']')
+    inner = text.where(~bracketed, text.str.slice(1, -1))
+    non_empty = inner.str.strip() != ''
+
+    # Nombre d'éléments bruts par ligne (un élément ne contient jamais de virgule)
+    counts = np.where(non_empty, inner.str.count(',').to_numpy() + 1, 0)
+    if counts.sum() == 0:
+        return np.array([], dtype=object), np.zeros(n + 1, dtype=np.int64)
+
+    # Un seul découpage sur le texte concaténé de toute la colonne
+    tokens = pd.Series(','.join(inner[non_empty].tolist()).split(',')).str.strip()
+    row_ids = np.repeat(np.arange(n), counts)
+
+    # Éléments vides hors guillemets ("a,,b") : ignorés comme dans l'ancien code
+    keep = (tokens != '').to_numpy()
+    tokens = tokens[keep]
+    row_ids = row_ids[keep]
+
+    # Retirer les guillemets des éléments repr() : 'Dramas' ou "Kids' TV"
+    first = tokens.str[:1]
+    quoted = first.isin(QUOTES) & (tokens.str[-1:] == first) & (tokens.str.len() >= 2)
+    values = tokens.where(~quoted, tokens.str.slice(1, -1)).to_numpy(dtype=object)
+
+    # Cas rare des échappements (\' ou \\) : on délègue à literal_eval
+    escaped = np.flatnonzero((quoted & tokens.str.contains('\\', regex=False)).to_numpy())
+    for i in escaped:
+        values[i] = ast.literal_eval(tokens.iloc[i])
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_ids, minlength=n), out=offsets[1:])
+    return values, offsets
+
+
+def to_lists(values, offsets):
+    """Reconstruit une liste Python par ligne à partir de (values, offsets)"""
+    flat = values.tolist() if isinstance(values, np.ndarray) else list(values)
+    bounds = np.asarray(offsets).tolist()
+    return [flat[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def to_tuples(values, offsets):
+    """Comme to_lists, avec des tuples (hachables)"""
+    flat = values.tolist() if isinstance(values, np.ndarray) else list(values)
+    bounds = np.asarray(offsets).tolist()
+    return [tuple(flat[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def list_values(series):
+    """(values, offsets) d'une colonne de listes Python ou de listes Arrow (compact_frame)"""
+    if isinstance(series.dtype, pd.ArrowDtype):
+        array = series.array.__arrow_array__()
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        offsets = array.offsets.to_numpy().astype(np.int64)
+        flat = array.flatten()
+        if pa.types.is_dictionary(flat.type):
+            # Décodage par indexation du vocabulaire : une chaîne partagée par valeur
+            vocabulary = flat.dictionary.to_numpy(zero_copy_only=False)
+            values = vocabulary[flat.indices.to_numpy()]
+        else:
+            values = flat.to_numpy(zero_copy_only=False)
+        return np.asarray(values, dtype=object), offsets - offsets[0]
+
+    lengths = np.fromiter(map(len, series), dtype=np.int64, count=len(series))
+    values = np.empty(int(lengths.sum()), dtype=object)
+    values[:] = list(chain.from_iterable(series))
+    offsets = np.zeros(len(series) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return values, offsets
+
+
+def explode_list_column(series):
+    """Aplati une colonne de listes en (row_ids, values)
+
+    row_ids[j] est la position (0..n-1) de la ligne d'où provient values[j].
+    """
+    values, offsets = list_values(series)
+    row_ids = np.repeat(np.arange(len(series)), np.diff(offsets))
+    return row_ids, values
+
+
+def list_codes(series):
+    """Aplati une colonne de listes en (row_ids, codes, vocabulary)
+
+    values[j] == vocabulary[codes[j]] ; les colonnes Arrow codées
+    (compact_frame) donnent directement leurs codes, sans décoder les chaînes.
+    Les éléments manquants ont le code -1.
+    """
+    if isinstance(series.dtype, pd.ArrowDtype) and pa.types.is_dictionary(series.dtype.pyarrow_dtype.value_type):
+        array = series.array.__arrow_array__()
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        offsets = array.offsets.to_numpy().astype(np.int64)
+        flat = array.flatten()
+        codes = flat.indices.fill_null(-1).to_numpy().astype(np.int64)
+        vocabulary = flat.dictionary.to_numpy(zero_copy_only=False)
+        row_ids = np.repeat(np.arange(len(series)), np.diff(offsets))
+        return row_ids, codes, np.asarray(vocabulary, dtype=object)
+    row_ids, values = explode_list_column(series)
+    codes, vocabulary = pd.factorize(values)
+    return row_ids, codes.astype(np.int64), np.asarray(vocabulary, dtype=object)
@@ -0,0 +1,234 @@
+# PROFIL DES COLONNES DU CATALOGUE
+"""Profil de chaque colonne d'un CSV en une seule lecture par blocs
+
+Pour chaque colonne : valeurs manquantes, minimum / maximum / moyenne (des
+valeurs pour les colonnes numériques, des longueurs pour les colonnes texte),
+valeurs les plus fréquentes (HeavyHitters) et nombre approché de valeurs
+distinctes (HyperLogLog). La mémoire utilisée ne dépend que de la taille des
+blocs et des résumés, pas de la taille du fichier :
+
+    python profiling.py netflix_titles.csv -o netflix_titles.profile.json
+
+Le profil JSON est affiché par le tableau de bord sans relire le CSV brut.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import file_fingerprint
+from sketches import HeavyHitters, HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+RAW_FILENAME = "netflix_titles.csv"
+PROFILE_SUFFIX = ".profile.json"
+CHUNK_ROWS = 100_000
+TOP_CAPACITY = 1_000
+HLL_PRECISION = 14
+
+
+def profile_path(csv_path):
+    """Chemin du profil JSON associé à un CSV"""
+    return os.path.splitext(csv_path)[0] + PROFILE_SUFFIX
+
+
+def _plain(value):
+    """Valeur numpy -> valeur JSON (entier si la valeur est entière)"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def is_numeric_text(values):
+    """Vrai si toutes les valeurs non manquantes se lisent comme des nombres"""
+    values = values.dropna()
+    return bool(len(values)) and pd.to_numeric(values, errors='coerce').notna().all()
+
+
+class ColumnProfile:
+    """Statistiques cumulées d'une colonne, bloc par bloc (fusionnables)"""
+
+    def __init__(self, kind, top_capacity=TOP_CAPACITY, precision=HLL_PRECISION):
+        self.kind = kind
+        self.count = 0
+        self.missing = 0
+        self.invalid = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.total = 0.0
+        self.measured = 0
+        self.top = HeavyHitters(top_capacity)
+        self.distinct = HyperLogLog(precision)
+
+    def update(self, values):
+        """Ajoute un bloc de la colonne (lu en texte)"""
+        self.count += len(values)
+        self.missing += int(values.isna().sum())
+        present = values.dropna()
+        if self.kind == 'numeric':
+            numbers = pd.to_numeric(present, errors='coerce').astype('float64')
+            self.invalid += int(numbers.isna().sum())
+            present = numbers.dropna()
+            measures = present
+        else:
+            measures = present.str.len()
+        if len(measures):
+            self.minimum = min(self.minimum, float(measures.min()))
+            self.maximum = max(self.maximum, float(measures.max()))
+            self.total += float(measures.sum())
+            self.measured += len(measures)
+        self.top.update_counts(present.value_counts(sort=False).items())
+        self.distinct.update(present)
+        return self
+
+    def merge(self, other):
+        """Cumule le profil de la même colonne sur d'autres lignes"""
+        self.count += other.count
+        self.missing += other.missing
+        self.invalid += other.invalid
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.total += other.total
+        self.measured += other.measured
+        self.top.merge(other.top)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def as_dict(self, top=5):
+        summary = None
+        if self.measured:
+            summary = {
+                'min': _plain(self.minimum),
+                'max': _plain(self.maximum),
+                'mean': round(self.total / self.measured, 4),
+            }
+        present = self.count - self.missing
+        result = {
+            'kind': self.kind,
+            'count': present,
+            'missing': self.missing,
+            'missing_pct': round(100 * self.missing / self.count, 2) if self.count else 0.0,
+            # l'estimation ne peut dépasser le nombre de valeurs présentes
+            'distinct': min(int(round(self.distinct.estimate())), present),
+        }
+        if self.kind == 'numeric':
+            result.update(summary or {'min': None, 'max': None, 'mean': None})
+            result['invalid'] = self.invalid
+        else:
+            result['length'] = summary
+        items = self.top.most_common(top)
+        if self.kind == 'numeric':
+            items = [(_plain(item), count) for item, count in items]
+        result['top'] = {
+            'error': self.top.error,
+            'guaranteed': self.top.guaranteed(top),
+            'items': [[item, count, count + self.top.error] for item, count in items],
+        }
+        return result
+
+
+def profile_csv(path, chunk_rows=CHUNK_ROWS, top_capacity=TOP_CAPACITY, precision=HLL_PRECISION, top=5):
+    """Profil de toutes les colonnes d'un CSV, en une lecture par blocs de chunk_rows lignes"""
+    start = time.perf_counter()
+    fingerprint = file_fingerprint(path)
+    profiles = {}
+    rows = chunks = 0
+    for chunk in pd.read_csv(path, dtype=str, chunksize=chunk_rows):
+        if not profiles:
+            # Le type de chaque colonne est fixé sur le premier bloc ; les valeurs
+            # non numériques des blocs suivants sont comptées dans invalid
+            profiles = {col: ColumnProfile('numeric' if is_numeric_text(chunk[col]) else 'text',
+                                           top_capacity, precision)
+                        for col in chunk.columns}
+        for col, profile in profiles.items():
+            profile.update(chunk[col])
+        rows += len(chunk)
+        chunks += 1
+    return {
+        'source': os.path.basename(path),
+        'size': fingerprint['size'],
+        'mtime_ns': fingerprint['mtime_ns'],
+        'rows': rows,
+        'chunks': chunks,
+        'seconds': round(time.perf_counter() - start, 3),
+        'distinct_relative_error': round(float(HyperLogLog(precision).relative_error), 4),
+        'top_capacity': top_capacity,
+        'columns': {col: profile.as_dict(top) for col, profile in profiles.items()},
+    }
+
+
+def profile_frame(profile):
+    """Profil JSON -> tableau d'une ligne par colonne (pour l'affichage)"""
+    records = []
+    for col, stats in profile['columns'].items():
+        # effectifs minimaux si le résumé a dû réduire ses compteurs
+        bound = '≥' if stats['top']['error'] else ''
+        summary = stats if stats['kind'] == 'numeric' else (stats.get('length') or {})
+        records.append({
+            'colonne': col,
+            'type': 'numérique' if stats['kind'] == 'numeric' else 'texte',
+            'présentes': stats['count'],
+            'manquantes': stats['missing'],
+            '% manquantes': stats['missing_pct'],
+            'distinctes (≈)': stats['distinct'],
+            'min': summary.get('min'),
+            'max': summary.get('max'),
+            'moyenne': summary.get('mean'),
+            'plus fréquentes': ", ".join(f"{item} ({bound}{count})" for item, count, _ in stats['top']['items']),
+        })
+    return pd.DataFrame.from_records(records).set_index('colonne')
+
+
+def is_fresh(profile, csv_path):
+    """Vrai si le profil correspond encore au CSV (même taille, même date de modification)"""
+    try:
+        fingerprint = file_fingerprint(csv_path)
+    except OSError:
+        return False
+    return (profile.get('size'), profile.get('mtime_ns')) == (fingerprint['size'], fingerprint['mtime_ns'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profil des colonnes d'un CSV en une seule lecture par blocs.")
+    parser.add_argument('input', nargs='?', default=RAW_FILENAME, help="CSV à profiler (défaut : %(default)s)")
+    parser.add_argument('-o', '--output', help="profil JSON (défaut : <input>%s)" % PROFILE_SUFFIX)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                        help="lignes lues par bloc (défaut : %(default)s)")
+    parser.add_argument('--top', type=int, default=5, help="valeurs fréquentes par colonne (défaut : %(default)s)")
+    parser.add_argument('--top-capacity', type=int, default=TOP_CAPACITY,
+                        help="compteurs par résumé des valeurs fréquentes (0 : exact ; défaut : %(default)s)")
+    parser.add_argument('--precision', type=int, default=HLL_PRECISION,
+                        help="précision HyperLogLog : 2**p registres (4 à 18 ; défaut : %(default)s)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="n'afficher que les erreurs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.chunk_rows <= 0:
+        parser.error("--chunk-rows doit être strictement positif")
+    if args.top < 1:
+        parser.error("--top doit être au moins 1")
+    if args.top_capacity < 0:
+        parser.error("--top-capacity doit être positif ou nul")
+    if not 4 <= args.precision <= 18:
+        parser.error("--precision doit être compris entre 4 et 18")
+
+    profile = profile_csv(args.input, chunk_rows=args.chunk_rows, top_capacity=args.top_capacity or None,
+                          precision=args.precision, top=args.top)
+    output = args.output or profile_path(args.input)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
+    logger.info("%d lignes, %d colonnes profilées en %.2f s -> %s",
+                profile['rows'], len(profile['columns']), profile['seconds'], output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
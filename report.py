@@ -0,0 +1,336 @@
+# FIGURES DU RAPPORT (MODE SANS AFFICHAGE)
+"""Figures de l'analyse exploratoire écrites en fichiers (PNG, SVG, PDF)
+
+Reprend les graphiques du script d'analyse (sections A à I) sans fenêtre :
+le backend Agg de matplotlib dessine chaque figure dans un fichier. Les
+agrégats partagés (effectifs par genre, par pays, par type...) sont calculés
+une seule fois, puis les figures, indépendantes, sont dessinées en parallèle
+dans un pool de processus ; chacune ne reçoit que les séries dont elle a
+besoin. Un manifeste JSON liste les fichiers et le temps de rendu de chaque
+figure :
+
+    python report.py netflix_titles_cleaned.csv -o report_figures --format png svg
+
+Différence avec le script d'analyse : l'appartenance d'un titre à un genre
+ou à un pays se lit dans les colonnes de listes (correspondance exacte, comme
+dans le tableau de bord) au lieu de str.contains sur le texte.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+# Fichiers reproductibles : identifiants SVG fixes, pas de date dans les métadonnées
+matplotlib.rcParams['svg.hashsalt'] = 'netflix-report'
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from cleaning import clean_catalog, load_raw, map_ordered, resolve_workers  # noqa: E402
+from data_store import CLEANED_FILENAME, load_cleaned  # noqa: E402
+from list_columns import explode_list_column  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = "report_figures"
+MANIFEST_FILENAME = "manifest.json"
+FORMATS = ['png', 'svg', 'pdf']
+METADATA = {'svg': {'Date': None}, 'pdf': {'CreationDate': None}}
+RED, BLACK = '#E50914', '#221F1F'
+
+
+def load_catalog(path):
+    """Catalogue nettoyé (un CSV brut est d'abord nettoyé en mémoire)"""
+    if 'genres_list' in pd.read_csv(path, nrows=0).columns:
+        return load_cleaned(path)
+    return clean_catalog(load_raw(path))
+
+
+def _exploded(df, list_column):
+    """(positions de lignes, valeurs) d'une colonne de listes"""
+    return explode_list_column(df[list_column])
+
+
+def _counts_by_member(df, list_column, members, by):
+    """Effectifs de df[by] parmi les titres dont la liste contient chaque membre"""
+    rows, values = _exploded(df, list_column)
+    keep = pd.Series(values).isin(members).to_numpy()
+    table = pd.crosstab(df[by].to_numpy()[rows[keep]], values[keep])
+    return table.reindex(columns=members, fill_value=0)
+
+
+def eda_aggregates(df):
+    """Séries partagées par les figures, calculées une seule fois"""
+    genre_counts = pd.Series(_exploded(df, 'genres_list')[1]).value_counts()
+    country_counts = pd.Series(_exploded(df, 'countries_list')[1]).value_counts()
+    actor_counts = pd.Series(_exploded(df, 'cast_list')[1]).value_counts()
+    top_genres = genre_counts.head(15)
+    top_countries = country_counts.head(15)
+    films = df[df['type'] == 'Movie']
+    series = df[df['type'] == 'TV Show']
+    return {
+        'type_counts': df['type'].value_counts(),
+        'added_by_year': df['year_added'].dropna().astype(int).value_counts().sort_index(),
+        'top_genres': top_genres,
+        'genre_evolution': _counts_by_member(df, 'genres_list', top_genres.index[:5].tolist(), 'release_year'),
+        'top_countries': top_countries,
+        'country_types': _counts_by_member(df, 'countries_list', top_countries.index[:3].tolist(), 'type').T,
+        'movie_durations': films['duration_min'].dropna().to_numpy(dtype=float),
+        'seasons': series['duration_seasons'].dropna().to_numpy(dtype=float),
+        'season_counts': series['duration_seasons'].dropna().astype(int).value_counts().sort_index().head(10),
+        'rating_counts': df['rating'].value_counts(),
+        'top_actors': actor_counts.head(10),
+        'decade_counts': df['decade'].dropna().astype(int).value_counts().sort_index(),
+    }
+
+
+def _barh(ax, counts, color, offset):
+    """Barres horizontales annotées, la plus grande en haut"""
+    bars = ax.barh(counts.index.astype(str), counts.to_numpy(), color=color)
+    ax.invert_yaxis()
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + offset, bar.get_y() + bar.get_height() / 2, f'{int(width)}', va='center', fontsize=10)
+
+
+def _bar(ax, counts, offset, fontsize, **style):
+    """Barres verticales annotées"""
+    bars = ax.bar(counts.index.astype(str), counts.to_numpy(), **style)
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2, height + offset, f'{int(height)}', ha='center', fontsize=fontsize)
+
+
+def figure_types(type_counts):
+    """A1. Distribution des films et des séries"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.pie(type_counts.to_numpy(), labels=type_counts.index, autopct='%1.1f%%',
+           colors=[RED, BLACK], startangle=90, explode=[0.05] + [0] * (len(type_counts) - 1))
+    ax.set_title('Distribution des Films vs Séries TV', fontsize=14, fontweight='bold')
+    return fig
+
+
+def figure_added_by_year(added_by_year):
+    """A2. Ajouts au catalogue par année"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(added_by_year.index, added_by_year.to_numpy(), marker='o', linewidth=2, color=RED, markersize=6)
+    ax.set_xlabel('Année', fontsize=12)
+    ax.set_ylabel("Nombre d'ajouts", fontsize=12)
+    ax.set_title('Évolution des ajouts sur Netflix par année', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def figure_top_genres(top_genres):
+    """B. Genres les plus représentés"""
+    fig, ax = plt.subplots(figsize=(12, 8))
+    _barh(ax, top_genres, RED, 5)
+    ax.set_xlabel('Nombre de productions', fontsize=12)
+    ax.set_title('Top 15 des genres les plus populaires', fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+
+def figure_genre_evolution(genre_evolution):
+    """C. Évolution des 5 genres principaux par année de sortie"""
+    fig, ax = plt.subplots(figsize=(14, 8))
+    for genre in genre_evolution.columns:
+        ax.plot(genre_evolution.index, genre_evolution[genre], marker='o', linewidth=2, markersize=4, label=genre)
+    ax.set_xlabel('Année de sortie', fontsize=12)
+    ax.set_ylabel('Nombre de productions', fontsize=12)
+    ax.set_title('Évolution des 5 genres les plus populaires', fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def figure_top_countries(top_countries):
+    """D. Pays producteurs principaux"""
+    fig, ax = plt.subplots(figsize=(12, 8))
+    _barh(ax, top_countries, BLACK, 5)
+    ax.set_xlabel('Nombre de productions', fontsize=12)
+    ax.set_title('Top 15 des pays producteurs', fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+
+def figure_country_types(country_types):
+    """E. Films / séries des 3 pays principaux"""
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    for ax, country in zip(axes, country_types.index):
+        types = country_types.loc[country]
+        types = types[types > 0].sort_values(ascending=False)
+        ax.pie(types.to_numpy(), labels=types.index, autopct='%1.1f%%', colors=[RED, BLACK], startangle=90)
+        ax.set_title(f'Distribution Films/Séries\n{country}', fontweight='bold')
+    fig.suptitle('Comparaison des 3 principaux pays producteurs', fontsize=16, fontweight='bold', y=1.05)
+    fig.tight_layout()
+    return fig
+
+
+def figure_durations(movie_durations, seasons, season_counts):
+    """F. Durées des films et nombre de saisons"""
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    axes[0, 0].hist(movie_durations, bins=30, edgecolor='black', alpha=0.7, color=RED)
+    axes[0, 0].set_xlabel('Durée (minutes)', fontsize=11)
+    axes[0, 0].set_ylabel('Nombre de films', fontsize=11)
+    axes[0, 0].set_title('Distribution des durées des films', fontsize=12, fontweight='bold')
+    axes[0, 0].grid(True, alpha=0.3)
+
+    axes[0, 1].boxplot(movie_durations, orientation='horizontal', patch_artist=True,
+                       boxprops=dict(facecolor=RED, alpha=0.7))
+    axes[0, 1].set_xlabel('Durée (minutes)', fontsize=11)
+    axes[0, 1].set_title('Boxplot des durées des films', fontsize=12, fontweight='bold')
+    axes[0, 1].grid(True, alpha=0.3, axis='x')
+
+    axes[1, 0].bar(season_counts.index.astype(str), season_counts.to_numpy(), color=BLACK, edgecolor='black')
+    axes[1, 0].set_xlabel('Nombre de saisons', fontsize=11)
+    axes[1, 0].set_ylabel('Nombre de séries', fontsize=11)
+    axes[1, 0].set_title('Distribution du nombre de saisons (top 10)', fontsize=12, fontweight='bold')
+    axes[1, 0].tick_params(axis='x', rotation=45)
+    axes[1, 0].grid(True, alpha=0.3, axis='y')
+
+    axes[1, 1].boxplot(seasons, orientation='horizontal', patch_artist=True,
+                       boxprops=dict(facecolor=BLACK, alpha=0.7))
+    axes[1, 1].set_xlabel('Nombre de saisons', fontsize=11)
+    axes[1, 1].set_title('Boxplot du nombre de saisons', fontsize=12, fontweight='bold')
+    axes[1, 1].grid(True, alpha=0.3, axis='x')
+    fig.tight_layout()
+    return fig
+
+
+def figure_ratings(rating_counts):
+    """G. Classifications"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    _bar(ax, rating_counts, 20, 9, color=RED, edgecolor='black')
+    ax.set_xlabel('Classification', fontsize=12)
+    ax.set_ylabel('Nombre de productions', fontsize=12)
+    ax.set_title('Distribution des ratings', fontsize=14, fontweight='bold')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    fig.tight_layout()
+    return fig
+
+
+def figure_actors(top_actors):
+    """H. Acteurs les plus fréquents"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    _barh(ax, top_actors, BLACK, 0.5)
+    ax.set_xlabel("Nombre d'apparitions", fontsize=12)
+    ax.set_title('Top 10 des acteurs les plus fréquents', fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+
+def figure_decades(decade_counts):
+    """I. Productions par décennie"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    _bar(ax, decade_counts, 20, 10, color=RED)
+    ax.set_xlabel('Décennie', fontsize=12)
+    ax.set_ylabel('Nombre de productions', fontsize=12)
+    ax.set_title('Distribution des productions par décennie', fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+
+# nom du fichier -> (fonction, agrégats utilisés)
+FIGURES = {
+    '01_films_series': (figure_types, ['type_counts']),
+    '02_ajouts_par_annee': (figure_added_by_year, ['added_by_year']),
+    '03_top_genres': (figure_top_genres, ['top_genres']),
+    '04_evolution_genres': (figure_genre_evolution, ['genre_evolution']),
+    '05_top_pays': (figure_top_countries, ['top_countries']),
+    '06_comparaison_pays': (figure_country_types, ['country_types']),
+    '07_durees': (figure_durations, ['movie_durations', 'seasons', 'season_counts']),
+    '08_ratings': (figure_ratings, ['rating_counts']),
+    '09_acteurs': (figure_actors, ['top_actors']),
+    '10_decennies': (figure_decades, ['decade_counts']),
+}
+
+
+def render_figure(name, inputs, output_dir, formats, dpi):
+    """Dessine une figure et l'écrit dans chaque format ; entrée du manifeste"""
+    start = time.perf_counter()
+    function, _ = FIGURES[name]
+    fig = function(**inputs)
+    files = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        fig.savefig(path, format=fmt, dpi=dpi, bbox_inches='tight', metadata=METADATA.get(fmt))
+        files.append({'path': os.path.basename(path), 'bytes': os.path.getsize(path)})
+    plt.close(fig)
+    return {
+        'name': name,
+        'title': function.__doc__,
+        'files': files,
+        'seconds': round(time.perf_counter() - start, 4),
+        'pid': os.getpid(),
+    }
+
+
+def render_report(df, output_dir=OUTPUT_DIR, formats=('png',), workers=0, dpi=100, names=None):
+    """Écrit les figures et le manifeste ; renvoie le manifeste"""
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    aggregates = eda_aggregates(df)
+    aggregate_seconds = time.perf_counter() - start
+
+    names = list(FIGURES) if names is None else names
+    workers = min(resolve_workers(workers), len(names))
+    tasks = ((name, {key: aggregates[key] for key in FIGURES[name][1]}, output_dir, list(formats), dpi)
+             for name in names)
+    figures = list(map_ordered(render_figure, tasks, workers))
+
+    manifest = {
+        'rows': len(df),
+        'formats': list(formats),
+        'dpi': dpi,
+        'workers': workers,
+        'aggregate_seconds': round(aggregate_seconds, 4),
+        'render_seconds': round(sum(figure['seconds'] for figure in figures), 4),
+        'total_seconds': round(time.perf_counter() - start, 4),
+        'figures': figures,
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Écrit les figures de l'analyse exploratoire dans des fichiers.")
+    parser.add_argument('input', nargs='?', default=CLEANED_FILENAME,
+                        help="CSV nettoyé ou brut (défaut : %(default)s)")
+    parser.add_argument('-o', '--output-dir', default=OUTPUT_DIR, help="dossier des figures (défaut : %(default)s)")
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['png'],
+                        help="formats des fichiers (défaut : png)")
+    parser.add_argument('--dpi', type=int, default=100, help="résolution des images PNG (défaut : %(default)s)")
+    parser.add_argument('-j', '--workers', type=int, default=0,
+                        help="processus de rendu (0 : tous les cœurs ; défaut : %(default)s)")
+    parser.add_argument('--figures', nargs='+', choices=list(FIGURES), help="figures à produire (défaut : toutes)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="n'afficher que les erreurs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s")
+    # Axes d'étiquettes numériques (saisons, décennies) voulues comme catégories
+    logging.getLogger('matplotlib.category').setLevel(logging.WARNING)
+    if args.workers < 0:
+        parser.error("--workers doit être positif ou nul")
+
+    manifest = render_report(load_catalog(args.input), args.output_dir, args.format,
+                             args.workers, args.dpi, args.figures)
+    for figure in manifest['figures']:
+        logger.info("%-22s %6.3f s  %s", figure['name'], figure['seconds'],
+                    ", ".join(item['path'] for item in figure['files']))
+    logger.info("%d figures en %.2f s (agrégats %.2f s, %d processus) -> %s",
+                len(manifest['figures']), manifest['total_seconds'], manifest['aggregate_seconds'],
+                manifest['workers'], os.path.join(args.output_dir, MANIFEST_FILENAME))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
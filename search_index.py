@@ -0,0 +1,231 @@
+# INDEX DE RECHERCHE PLEIN TEXTE
+"""Recherche par mots et par préfixe dans les titres, personnes et descriptions
+
+Le texte de title, director, cast et description est découpé en mots
+(minuscules, sans accents). L'index inversé associe à chaque mot la liste
+triée des lignes qui le contiennent, avec le champ où il apparaît (format CSR,
+comme filter_index.ListIndex). Les identifiants des mots suivent l'ordre
+alphabétique : les mots qui commencent par un préfixe ont des identifiants
+consécutifs, et leurs lignes forment une seule tranche de l'index.
+
+Une requête retient les lignes qui contiennent tous ses mots, le dernier
+étant lu comme un préfixe (recherche pendant la saisie). Chaque mot rapporte
+son idf multiplié par le poids du champ (un titre compte plus qu'une
+description) ; les lignes sont classées par score décroissant.
+"""
+
+import re
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # sans pyarrow, le découpage passe par pandas (plus lent)
+    pa = None
+
+# bit du champ dans les postings -> poids dans le score
+FIELDS = {
+    'title': 4.0,
+    'director': 2.0,
+    'cast': 2.0,
+    'description': 1.0,
+}
+CHUNK_ROWS = 200_000
+MIN_PREFIX = 2
+# au-delà de n_rows / DENSE_FRACTION lignes, un mot est combiné via un
+# tableau de la taille du catalogue plutôt que par tri ou recherche dichotomique
+DENSE_FRACTION = 16
+SEPARATORS = re.compile(r'[\W_]+')
+# même découpage en expression RE2 (pyarrow), où \W ne connaît que l'ASCII
+ARROW_SEPARATORS = r'[^\p{L}\p{N}\p{M}]+'
+
+
+def fold(text):
+    """Minuscules sans accents (« Amélie » -> « amelie »)"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """Mots d'une requête, dans l'ordre (minuscules, sans accents)"""
+    return [token for token in SEPARATORS.split(fold(text)) if token]
+
+
+def tokenize_column(values):
+    """Colonne texte -> (codes, mots distincts, lignes) : code du mot et position de sa ligne par occurrence"""
+    if pa is not None:
+        words = pc.split_pattern_regex(pc.utf8_lower(pa.array(values, type=pa.string(), from_pandas=True)),
+                                       ARROW_SEPARATORS)
+        rows = pc.list_parent_indices(words)
+        words = pc.list_flatten(words)
+        keep = pc.not_equal(words, '')
+        encoded = pc.dictionary_encode(pc.filter(words, keep))
+        rows = pc.filter(rows, keep).to_numpy(zero_copy_only=False)
+        return encoded.indices.to_numpy(zero_copy_only=False), encoded.dictionary.to_pylist(), rows
+    # en object, str.replace utilise le module re (\W reconnaît les lettres accentuées)
+    words = values.reset_index(drop=True).astype(object).fillna('').str.lower().str.replace(SEPARATORS.pattern, ' ', regex=True).str.split().explode()
+    words = words.dropna()
+    codes, uniques = pd.factorize(words.to_numpy(dtype=object))
+    return codes, list(uniques), words.index.to_numpy()
+
+
+def member_mask(view):
+    """Masque booléen des lignes d'une vue filtrée (None si la vue garde tout le catalogue)"""
+    if view.positions is None:
+        return None
+    mask = np.zeros(len(view.df), dtype=bool)
+    mask[view.positions] = True
+    return mask
+
+
+class SearchResult:
+    """Lignes trouvées (triées par score décroissant), nombre total de correspondances et durée"""
+
+    __slots__ = ('rows', 'scores', 'total', 'seconds')
+
+    def __init__(self, rows, scores, total, seconds):
+        self.rows = rows
+        self.scores = scores
+        self.total = total
+        self.seconds = seconds
+
+
+class SearchIndex:
+    """Index inversé mot -> lignes des colonnes texte d'un catalogue"""
+
+    def __init__(self, df, fields=FIELDS, chunk_rows=CHUNK_ROWS):
+        self.n_rows = len(df)
+        self.fields = [field for field in fields if field in df.columns]
+        # poids d'une combinaison de champs (masque de bits) : somme des poids
+        weights = np.array([fields[field] for field in self.fields])
+        masks = np.arange(2 ** len(self.fields))
+        self.mask_weights = (((masks[:, None] >> np.arange(len(self.fields))) & 1) @ weights).astype(np.float32)
+
+        # Occurrences (mot, ligne, champ), lues par blocs de lignes ; un
+        # dictionnaire global attribue un identifiant provisoire à chaque mot
+        ids = {}
+        token_ids, row_ids, field_bits = [], [], []
+        for start in range(0, self.n_rows, chunk_rows):
+            for bit, field in enumerate(self.fields):
+                codes, uniques, rows = tokenize_column(df[field].iloc[start:start + chunk_rows])
+                local = np.array([ids.setdefault(word, len(ids)) for word in uniques], dtype=np.int64)
+                token_ids.append(local[codes])
+                row_ids.append(rows.astype(np.int64) + start)
+                field_bits.append(np.full(len(rows), 1 << bit, dtype=np.int64))
+
+        # Vocabulaire sans accents, trié : identifiants définitifs dans l'ordre alphabétique
+        folded = pd.Series([fold(word) for word in ids], dtype=object)
+        final, vocabulary = pd.factorize(folded, sort=True)
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+
+        # Clé (mot, ligne, champ) : un seul tri regroupe les occurrences d'un
+        # mot dans une ligne, dont les champs sont réunis par OU binaire
+        stride = max(self.n_rows, 1)
+        width = len(self.fields)
+        keys = np.concatenate(token_ids)
+        keys = ((final[keys].astype(np.int64) * stride + np.concatenate(row_ids)) << width) | np.concatenate(field_bits)
+        keys.sort()
+        pairs = keys >> width
+        starts = np.flatnonzero(np.r_[True, pairs[1:] != pairs[:-1]]) if len(keys) else np.array([], dtype=np.int64)
+        self.postings_fields = np.bitwise_or.reduceat(keys & ((1 << width) - 1), starts).astype(np.uint8) \
+            if len(keys) else np.array([], dtype=np.uint8)
+        keys = pairs[starts]
+        self.rows = (keys % stride).astype(np.int32)
+        counts = np.bincount(keys // stride, minlength=len(self.vocabulary))
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+        self.idf = np.log1p(self.n_rows / np.maximum(counts, 1)).astype(np.float32)
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    @property
+    def nbytes(self):
+        """Octets des tableaux de l'index (hors vocabulaire)"""
+        return sum(array.nbytes for array in (self.rows, self.postings_fields, self.indptr, self.idf))
+
+    def term_range(self, token, prefix=False):
+        """Identifiants [début, fin) du mot, ou des mots qui commencent par token"""
+        lo = int(np.searchsorted(self.vocabulary, token, side='left'))
+        if not prefix:
+            found = lo < len(self.vocabulary) and self.vocabulary[lo] == token
+            return lo, lo + 1 if found else lo
+        return lo, int(np.searchsorted(self.vocabulary, token + '\uffff', side='left'))
+
+    def is_dense(self, count):
+        """Vrai si count lignes justifient un tableau de la taille du catalogue"""
+        return count > self.n_rows // DENSE_FRACTION
+
+    def postings(self, lo, hi):
+        """Ligne et score de chaque occurrence des mots [lo, hi) (lignes triées par mot)"""
+        start, stop = self.indptr[lo], self.indptr[hi]
+        idf = np.repeat(self.idf[lo:hi], np.diff(self.indptr[lo:hi + 1]))
+        return self.rows[start:stop], self.mask_weights[self.postings_fields[start:stop]] * idf
+
+    def dense_scores(self, lo, hi):
+        """Score de chaque ligne du catalogue pour les mots [lo, hi) (0 : aucun de ces mots)"""
+        rows, scores = self.postings(lo, hi)
+        return np.bincount(rows, weights=scores, minlength=self.n_rows)
+
+    def term_scores(self, lo, hi):
+        """Lignes (triées) contenant un des mots [lo, hi) et leur score (somme sur ces mots)"""
+        rows, scores = self.postings(lo, hi)
+        if hi - lo <= 1:
+            return rows, scores
+        if self.is_dense(len(rows)):
+            # Préfixe fréquent : cumul direct par ligne, sans tri
+            dense = np.bincount(rows, weights=scores, minlength=self.n_rows)
+            rows = np.flatnonzero(dense > 0).astype(np.int32)
+            return rows, dense[rows]
+        order = np.argsort(rows, kind='stable')
+        rows = rows[order]
+        first = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        return rows[first], np.add.reduceat(scores[order], first)
+
+    def search(self, query, limit=50, mask=None):
+        """Lignes contenant tous les mots de la requête, le dernier comme préfixe
+
+        mask (masque booléen sur tout le catalogue, voir member_mask) restreint
+        la recherche aux lignes retenues par les filtres ; None : tout le catalogue.
+        """
+        start = time.perf_counter()
+        tokens = tokenize(query)
+        empty = np.array([], dtype=np.int32)
+        if not tokens:
+            return SearchResult(empty, np.array([]), 0, time.perf_counter() - start)
+
+        ranges = [self.term_range(token, prefix=i == len(tokens) - 1 and len(token) >= MIN_PREFIX)
+                  for i, token in enumerate(tokens)]
+        # Mots les plus rares d'abord : les intersections portent sur peu de lignes
+        ranges.sort(key=lambda bounds: self.indptr[bounds[1]] - self.indptr[bounds[0]])
+        rows, scores = self.term_scores(*ranges[0])
+        if mask is not None:
+            keep = mask[rows]
+            rows, scores = rows[keep], scores[keep]
+        for lo, hi in ranges[1:]:
+            if not len(rows):
+                break
+            if self.is_dense(self.indptr[hi] - self.indptr[lo]):
+                # Mot fréquent : score lu directement pour chaque ligne candidate
+                # (les scores sont strictement positifs : 0 signifie absent)
+                found = self.dense_scores(lo, hi)[rows]
+                keep = found > 0
+                rows, scores = rows[keep], scores[keep] + found[keep]
+                continue
+            term_rows, term_scores = self.term_scores(lo, hi)
+            found = np.searchsorted(term_rows, rows)
+            found[found == len(term_rows)] = 0
+            keep = term_rows[found] == rows if len(term_rows) else np.zeros(len(rows), dtype=bool)
+            rows, scores = rows[keep], scores[keep] + term_scores[found[keep]]
+
+        total = len(rows)
+        if total > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            rows, scores = rows[top], scores[top]
+        # score décroissant, puis ordre du catalogue
+        order = np.lexsort((rows, -scores))
+        return SearchResult(rows[order], scores[order], total, time.perf_counter() - start)
@@ -0,0 +1,55 @@
+# SECTIONS DU TABLEAU DE BORD ET DÉPENDANCES
+"""Recalcul partiel des sections du tableau de bord
+
+Chaque section déclare ses entrées explicites (clé des filtres, pays ou
+genres qu'elle affiche...). Son résultat (séries, figure) est mémorisé dans
+l'état de la session avec ces entrées : lors d'une nouvelle exécution du
+script, une section dont les entrées n'ont pas changé réutilise son résultat
+au lieu d'être recalculée. Tous les résultats sont oubliés quand la version
+des données (empreinte du fichier) change.
+
+Avec un StageRecorder (instrumentation.py), chaque section recalculée est
+mesurée comme une étape.
+"""
+
+STATE_KEY = '_sections'
+VERSION_KEY = '_sections_version'
+
+
+class SectionRunner:
+    """Exécute les sections en ne recalculant que celles dont les entrées ont changé"""
+
+    def __init__(self, state, version=None, recorder=None):
+        # Nouvelle version des données (fichier modifié) : rien n'est réutilisable
+        if state.get(VERSION_KEY) != version:
+            state[STATE_KEY] = {}
+            state[VERSION_KEY] = version
+        self.store = state.setdefault(STATE_KEY, {})
+        self.computed = []
+        self.reused = []
+        self.recorder = recorder
+
+    def run(self, name, inputs, compute):
+        """Résultat de compute() pour la section name, mémorisé selon inputs
+
+        inputs doit être hachable et comparable (tuples, chaînes, nombres).
+        """
+        entry = self.store.get(name)
+        if entry is not None and entry[0] == inputs:
+            self.reused.append(name)
+            return entry[1]
+        value = compute() if self.recorder is None else self.recorder.call(name, compute)
+        self.store[name] = (inputs, value)
+        self.computed.append(name)
+        return value
+
+    def lazy(self, name, inputs, compute):
+        """Fonction sans argument qui exécute la section au premier appel seulement"""
+        result = []
+
+        def get():
+            if not result:
+                result.append(self.run(name, inputs, compute))
+            return result[0]
+
+        return get
@@ -0,0 +1,310 @@
+# TITRES SIMILAIRES
+"""Table des plus proches voisins de chaque titre, calculée hors ligne
+
+Chaque titre est décrit par un vecteur creux TF-IDF : personnes (cast_list,
+director_list) et mots de la description, pondérés par champ et normalisés
+(similarité cosinus). Les genres et les pays sont comparés à part, comme
+ensembles (vecteurs multi-hot codés en bits). La similarité est la somme
+pondérée de ces trois cosinus.
+
+Elle est calculée exactement pour les paires candidates : les titres qui
+partagent au moins une personne ou un mot de description. Les termes
+présents dans plus de max_df titres (mots courants, acteurs omniprésents)
+sont ignorés, comme dans un TF-IDF classique : ils apportent peu et rendraient
+le nombre de paires quadratique. Les titres sont traités par blocs dont les
+paires tiennent dans un budget mémoire.
+
+Les k voisins de chaque titre sont écrits dans un fichier .npz à côté du CSV
+nettoyé ; le tableau de bord n'a plus qu'à lire une ligne de cette table :
+
+    python similarity.py netflix_titles_cleaned.csv -k 10
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from compact import load_compact
+from data_store import CLEANED_FILENAME, file_fingerprint
+from list_columns import explode_list_column
+from search_index import tokenize_column
+
+logger = logging.getLogger(__name__)
+
+NEIGHBORS_SUFFIX = ".neighbors.npz"
+K = 10
+MIN_DF = 2
+MAX_DF = 1_000
+MEMORY_MB = 512
+CHUNK_ROWS = 200_000
+# clé, titre cible, score et permutation du tri de chaque paire, avec marge
+BYTES_PER_PAIR = 48
+
+# poids de chaque champ dans le vecteur TF-IDF
+TERM_FIELDS = {
+    'director_list': 1.5,
+    'cast_list': 1.0,
+    'description': 0.75,
+}
+TEXT_COLUMNS = {'description'}
+# poids de chaque cosinus dans la similarité finale (somme égale à 1)
+TERMS_WEIGHT = 0.6
+SET_WEIGHTS = {
+    'genres_list': 0.3,
+    'countries_list': 0.1,
+}
+
+
+def neighbors_path(csv_path):
+    """Chemin de la table des voisins associée à un CSV nettoyé"""
+    return os.path.splitext(csv_path)[0] + NEIGHBORS_SUFFIX
+
+
+def popcount(bits):
+    """Nombre de bits à 1 de chaque ligne d'un tableau de mots uint64"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    return np.unpackbits(bits.view(np.uint8), axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+def _occurrences(df, fields, chunk_rows):
+    """(ligne, terme) de chaque occurrence ; les termes de chaque champ ont leurs propres identifiants"""
+    rows, terms, field_weights = [], [], []
+    for column, weight in fields.items():
+        if column not in df.columns:
+            continue
+        offset = len(field_weights)
+        if column in TEXT_COLUMNS:
+            ids = {}
+            for start in range(0, len(df), chunk_rows):
+                codes, uniques, positions = tokenize_column(df[column].iloc[start:start + chunk_rows])
+                local = np.array([ids.setdefault(word, len(ids)) for word in uniques], dtype=np.int64)
+                rows.append(positions.astype(np.int64) + start)
+                terms.append(local[codes] + offset)
+            count = len(ids)
+        else:
+            row_ids, values = explode_list_column(df[column])
+            codes, uniques = pd.factorize(values)
+            valid = codes >= 0
+            rows.append(row_ids[valid].astype(np.int64))
+            terms.append(codes[valid].astype(np.int64) + offset)
+            count = len(uniques)
+        field_weights.extend([weight] * count)
+    if not rows:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([])
+    return np.concatenate(rows), np.concatenate(terms), np.array(field_weights)
+
+
+class TermMatrix:
+    """Matrice creuse titres × termes (TF-IDF normalisé), en CSR par ligne et par terme"""
+
+    def __init__(self, df, fields=TERM_FIELDS, min_df=MIN_DF, max_df=MAX_DF, chunk_rows=CHUNK_ROWS):
+        self.n_rows = len(df)
+        rows, terms, field_weights = _occurrences(df, fields, chunk_rows)
+        n_terms = max(len(field_weights), 1)
+
+        # Paires (ligne, terme) uniques, triées par ligne puis terme, et fréquence dans la ligne
+        keys, tf = np.unique(rows * n_terms + terms, return_counts=True)
+        rows, terms = keys // n_terms, keys % n_terms
+        doc_freq = np.bincount(terms, minlength=n_terms)
+        kept = (doc_freq >= min_df) & (doc_freq <= max_df)
+        keep = kept[terms]
+        rows, terms, tf = rows[keep], terms[keep], tf[keep]
+
+        # Poids TF-IDF (tf sous-linéaire, idf lissé) puis normalisation L2 par ligne
+        idf = np.log((1 + self.n_rows) / (1 + doc_freq)) + 1
+        weights = field_weights[terms] * (1 + np.log(tf)) * idf[terms]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=self.n_rows))
+        weights = weights / norms[rows]
+
+        # Identifiants compacts des termes conservés
+        renumber = np.cumsum(kept) - 1
+        self.n_terms = int(kept.sum())
+        self.terms = renumber[terms].astype(np.int32)
+        self.weights = weights.astype(np.float32)
+        self.row_indptr = np.zeros(self.n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.n_rows), out=self.row_indptr[1:])
+
+        # Postings : lignes de chaque terme (CSR par terme, lignes triées)
+        order = np.argsort(self.terms, kind='stable')
+        self.term_rows = rows[order].astype(np.int32)
+        self.term_weights = self.weights[order]
+        self.term_indptr = np.zeros(self.n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.terms, minlength=self.n_terms), out=self.term_indptr[1:])
+
+    @property
+    def nnz(self):
+        return len(self.terms)
+
+    def pair_counts(self):
+        """Nombre de paires (avant regroupement) que produit chaque ligne"""
+        rows = np.repeat(np.arange(self.n_rows), np.diff(self.row_indptr))
+        return np.bincount(rows, weights=np.diff(self.term_indptr)[self.terms], minlength=self.n_rows)
+
+    def products(self, start, stop):
+        """Produits scalaires non nuls des lignes [start, stop) avec tout le catalogue
+
+        Renvoie (lignes, cibles, cosinus) : une entrée par paire de titres qui
+        partagent au moins un terme.
+        """
+        lo, hi = self.row_indptr[start], self.row_indptr[stop]
+        terms = self.terms[lo:hi]
+        counts = self.term_indptr[terms + 1] - self.term_indptr[terms]
+        total = int(counts.sum())
+        queries = np.repeat(np.arange(start, stop), np.diff(self.row_indptr[start:stop + 1]))
+        # positions des postings de chaque terme, plages concaténées
+        positions = np.repeat(self.term_indptr[terms] - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        targets = self.term_rows[positions]
+        values = np.repeat(self.weights[lo:hi], counts) * self.term_weights[positions]
+
+        keys = np.repeat(queries - start, counts).astype(np.int64) * self.n_rows + targets
+        order = np.argsort(keys)
+        keys = keys[order]
+        first = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if total else np.array([], dtype=np.int64)
+        sums = np.add.reduceat(values[order], first) if total else values
+        keys = keys[first]
+        return (keys // self.n_rows + start).astype(np.int32), (keys % self.n_rows).astype(np.int32), sums
+
+
+class SetBits:
+    """Ensembles de valeurs d'une colonne de listes, en bits (un mot uint64 par tranche de 64 valeurs)"""
+
+    def __init__(self, series):
+        row_ids, values = explode_list_column(series)
+        codes, uniques = pd.factorize(values)
+        valid = codes >= 0
+        row_ids, codes = row_ids[valid], codes[valid]
+        self.bits = np.zeros((len(series), max(1, -(-len(uniques) // 64))), dtype=np.uint64)
+        np.bitwise_or.at(self.bits, (row_ids, codes // 64),
+                         np.left_shift(np.uint64(1), (codes % 64).astype(np.uint64)))
+        self.sizes = popcount(self.bits)
+
+    def cosine(self, rows, targets):
+        """Cosinus des vecteurs multi-hot de chaque paire (0 si un ensemble est vide)"""
+        common = popcount(self.bits[rows] & self.bits[targets])
+        norms = np.sqrt(self.sizes[rows] * self.sizes[targets])
+        return np.divide(common, norms, out=np.zeros(len(rows)), where=norms > 0)
+
+
+def block_bounds(costs, budget):
+    """Bornes de blocs de lignes consécutives dont le coût cumulé reste sous le budget"""
+    cumulative = np.cumsum(costs)
+    bounds = [0]
+    while bounds[-1] < len(costs):
+        start = bounds[-1]
+        base = cumulative[start - 1] if start else 0
+        stop = int(np.searchsorted(cumulative, base + budget, side='right'))
+        # une ligne dont les paires dépassent à elle seule le budget forme un bloc
+        bounds.append(min(max(stop, start + 1), len(costs)))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def top_k(rows, targets, scores, k):
+    """Les k meilleures cibles de chaque ligne : (lignes, rangs, cibles, scores)"""
+    # score décroissant, puis position dans le catalogue
+    order = np.lexsort((targets, -scores, rows))
+    rows, targets, scores = rows[order], targets[order], scores[order]
+    first = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]]) if len(rows) else np.array([], dtype=np.int64)
+    ranks = np.arange(len(rows)) - np.repeat(first, np.diff(np.r_[first, len(rows)]))
+    keep = ranks < k
+    return rows[keep], ranks[keep], targets[keep], scores[keep]
+
+
+def nearest_neighbors(df, k=K, min_df=MIN_DF, max_df=MAX_DF, memory_mb=MEMORY_MB):
+    """Table (n × k) des voisins de chaque titre (-1 : pas d'autre voisin) et de leurs scores"""
+    matrix = TermMatrix(df, min_df=min_df, max_df=max_df)
+    sets = {column: SetBits(df[column]) for column in SET_WEIGHTS if column in df.columns}
+    logger.info("%d titres, %d termes conservés, %d valeurs non nulles", matrix.n_rows, matrix.n_terms, matrix.nnz)
+
+    neighbors = np.full((len(df), k), -1, dtype=np.int32)
+    scores = np.zeros((len(df), k), dtype=np.float32)
+    budget = max(1, memory_mb * 2**20 // BYTES_PER_PAIR)
+    blocks = block_bounds(matrix.pair_counts(), budget)
+    for i, (start, stop) in enumerate(blocks, 1):
+        rows, targets, similarity = matrix.products(start, stop)
+        other = rows != targets
+        rows, targets = rows[other], targets[other]
+        similarity = TERMS_WEIGHT * similarity[other]
+        for column, weight in SET_WEIGHTS.items():
+            if column in sets:
+                similarity += weight * sets[column].cosine(rows, targets)
+        rows, ranks, targets, similarity = top_k(rows, targets, similarity, k)
+        neighbors[rows, ranks] = targets
+        scores[rows, ranks] = similarity
+        logger.debug("bloc %d/%d : lignes %d à %d, %d paires", i, len(blocks), start, stop, len(rows))
+    return neighbors, scores
+
+
+def save_neighbors(path, neighbors, scores, csv_path, seconds, max_df):
+    """Écrit la table des voisins avec l'empreinte du CSV dont elle provient"""
+    fingerprint = file_fingerprint(csv_path)
+    with open(path, 'wb') as f:
+        np.savez(f, neighbors=neighbors, scores=scores, size=fingerprint['size'],
+                 mtime_ns=fingerprint['mtime_ns'], seconds=seconds, max_df=max_df,
+                 source=os.path.basename(csv_path))
+
+
+def load_neighbors(path):
+    """Table des voisins écrite par save_neighbors -> dict de tableaux"""
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def is_fresh(table, csv_path):
+    """Vrai si la table correspond encore au CSV (même taille, même date de modification)"""
+    try:
+        fingerprint = file_fingerprint(csv_path)
+    except OSError:
+        return False
+    return (int(table['size']), int(table['mtime_ns'])) == (fingerprint['size'], fingerprint['mtime_ns'])
+
+
+def similar_titles(table, position):
+    """Positions et scores des voisins d'un titre (lecture d'une ligne de la table)"""
+    found = table['neighbors'][position]
+    valid = found >= 0
+    return found[valid], table['scores'][position][valid]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Table des titres similaires d'un catalogue nettoyé.")
+    parser.add_argument('input', nargs='?', default=CLEANED_FILENAME,
+                        help="CSV nettoyé (défaut : %(default)s)")
+    parser.add_argument('-o', '--output', help="table .npz (défaut : <input>%s)" % NEIGHBORS_SUFFIX)
+    parser.add_argument('-k', type=int, default=K, help="voisins par titre (défaut : %(default)s)")
+    parser.add_argument('--max-df', type=int, default=MAX_DF,
+                        help="termes présents dans plus de titres ignorés (défaut : %(default)s)")
+    parser.add_argument('--memory-mb', type=int, default=MEMORY_MB,
+                        help="budget mémoire des paires d'un bloc (défaut : %(default)s)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="détail de chaque bloc")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.k < 1:
+        parser.error("-k doit être au moins 1")
+    if args.max_df < MIN_DF:
+        parser.error(f"--max-df doit être au moins {MIN_DF}")
+    if args.memory_mb <= 0:
+        parser.error("--memory-mb doit être strictement positif")
+
+    start = time.perf_counter()
+    df = load_compact(args.input)
+    neighbors, scores = nearest_neighbors(df, k=args.k, max_df=args.max_df, memory_mb=args.memory_mb)
+    seconds = time.perf_counter() - start
+    output = args.output or neighbors_path(args.input)
+    save_neighbors(output, neighbors, scores, args.input, seconds, args.max_df)
+    found = (neighbors >= 0).sum(axis=1)
+    logger.info("%d titres, %.1f voisins en moyenne (%d sans voisin) en %.1f s -> %s",
+                len(df), found.mean(), int((found == 0).sum()), seconds, output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+# RÉSUMÉS DE FLUX (ÉLÉMENTS LES PLUS FRÉQUENTS, NOMBRE DE VALEURS DISTINCTES)
+"""Résumés de flux en mémoire bornée, fusionnables bloc par bloc
+
+HeavyHitters remplace le motif « une grande liste + Counter » : les éléments
+sont lus par lots, chaque lot est compté puis fusionné dans au plus capacity
+compteurs (algorithme de Misra-Gries, fusionnable : deux résumés de blocs ou
+de partitions différents se combinent avec merge). Chaque compteur
+sous-estime l'effectif réel d'au plus error, avec error <= n / (capacity + 1).
+Avec capacity=None le comptage est exact (error = 0).
+
+HyperLogLog estime le nombre de valeurs distinctes avec 2**p registres d'un
+octet (16 Ko pour p=14, erreur relative typique 1.04 / sqrt(2**p) ≈ 0.8 %).
+"""
+
+from collections import Counter
+from itertools import chain, islice
+
+import numpy as np
+import pandas as pd
+
+BATCH_ITEMS = 100_000
+
+
+class HeavyHitters:
+    """Effectifs approchés (bornés) des éléments les plus fréquents d'un flux"""
+
+    def __init__(self, capacity=None):
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity doit être au moins 1 (None : comptage exact)")
+        self.capacity = capacity
+        self.counts = {}
+        self.n = 0
+        self.error = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def exact(self):
+        """Vrai si aucun compteur n'a encore été réduit"""
+        return self.error == 0
+
+    def update(self, items):
+        """Ajoute les éléments d'un itérable, lu par lots de BATCH_ITEMS"""
+        items = iter(items)
+        while True:
+            batch = Counter(islice(items, BATCH_ITEMS))
+            if not batch:
+                return self
+            self.n += sum(batch.values())
+            self._add(batch)
+
+    def update_lists(self, lists):
+        """Ajoute les éléments d'une colonne de listes (cast_list, genres_list...)"""
+        return self.update(chain.from_iterable(lists))
+
+    def update_counts(self, counts):
+        """Ajoute des effectifs déjà comptés (dict élément -> effectif, ex. value_counts d'un bloc)"""
+        counts = dict(counts)
+        self.n += sum(counts.values())
+        self._add(counts)
+        return self
+
+    def merge(self, other):
+        """Cumule le résumé d'un autre flux (autre bloc ou autre partition)"""
+        self.n += other.n
+        self.error += other.error
+        self._add(other.counts)
+        return self
+
+    def _add(self, counts):
+        merged = self.counts
+        for item, count in counts.items():
+            merged[item] = merged.get(item, 0) + count
+        self._prune()
+
+    def _prune(self):
+        """Ramène le résumé à capacity compteurs (étape de réduction de Misra-Gries)"""
+        if self.capacity is None or len(self.counts) <= self.capacity:
+            return
+        values = np.fromiter(self.counts.values(), dtype=np.int64, count=len(self.counts))
+        # (capacity + 1)-ième plus grand effectif, retranché à tous les compteurs
+        cut = len(values) - self.capacity - 1
+        delta = int(np.partition(values, cut)[cut])
+        self.counts = {item: count - delta for item, count in self.counts.items() if count > delta}
+        self.error += delta
+
+    def bounds(self, item):
+        """(minimum, maximum) de l'effectif réel d'un élément"""
+        count = self.counts.get(item, 0)
+        return count, count + self.error
+
+    def most_common(self, k=None):
+        """Les k éléments de plus grand effectif estimé, comme Counter.most_common
+
+        Les effectifs renvoyés sont des minimums ; le maximum est effectif + error.
+        À égalité, l'ordre est celui de première apparition.
+        """
+        ranked = sorted(self.counts.items(), key=lambda item: -item[1])
+        return ranked if k is None else ranked[:k]
+
+    def guaranteed(self, k):
+        """Vrai si most_common(k) contient certainement les k éléments les plus fréquents"""
+        ranked = self.most_common(k + 1)
+        if len(ranked) < k:
+            return self.exact
+        runner_up = ranked[k][1] if len(ranked) > k else 0
+        return ranked[k - 1][1] >= runner_up + self.error
+
+    def as_dict(self, k=10):
+        return {
+            'n': self.n,
+            'capacity': self.capacity,
+            'error': self.error,
+            'guaranteed': self.guaranteed(k),
+            'top': [[item, count, count + self.error] for item, count in self.most_common(k)],
+        }
+
+
+class HyperLogLog:
+    """Nombre approché de valeurs distinctes d'un flux (HyperLogLog)"""
+
+    def __init__(self, p=14):
+        if not 4 <= p <= 18:
+            raise ValueError("p doit être compris entre 4 et 18")
+        self.p = p
+        self.registers = np.zeros(2**p, dtype=np.uint8)
+
+    def update(self, values):
+        """Ajoute les valeurs (non manquantes) d'une Series"""
+        values = values.dropna()
+        if len(values):
+            self.update_hashes(pd.util.hash_pandas_object(values, index=False).to_numpy())
+        return self
+
+    def update_hashes(self, hashes):
+        """Ajoute des empreintes 64 bits déjà calculées"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        bits = 64 - self.p
+        index = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64(2**bits - 1)
+        # Rang = position du premier bit à 1 dans les bits restants (bits + 1 s'ils sont tous nuls)
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rank = np.where(rest == 0, bits + 1, bits - exponent + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """Union avec un autre résumé de même précision"""
+        if other.p != self.p:
+            raise ValueError("fusion de résumés HyperLogLog de précisions différentes")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        """Nombre estimé de valeurs distinctes"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Petites cardinalités : comptage linéaire des registres vides
+            return m * np.log(m / zeros)
+        return float(raw)
+
+    @property
+    def relative_error(self):
+        """Erreur relative typique (écart-type) de l'estimation"""
+        return 1.04 / np.sqrt(len(self.registers))
@@ -0,0 +1,281 @@
+# CATALOGUES SYNTHÉTIQUES
+"""Catalogues synthétiques au format de netflix_titles.csv, de 10k à 10M lignes
+
+Mêmes colonnes que le fichier Kaggle, avec des distributions proches :
+listes de pays, de genres, d'acteurs et de réalisateurs (répartition en loi
+de Zipf : quelques pays et genres dominent), ~70 % de films, durées en
+minutes ou en saisons, dates d'ajout concentrées sur 2016-2021, valeurs
+manquantes aux taux du fichier réel. Le fichier est écrit par blocs : la
+mémoire ne dépend que de chunk_rows.
+
+    python synthetic.py 1m -o synthetic_1m.csv
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # sans pyarrow, les listes sont jointes en Python
+    pa = None
+
+CHUNK_ROWS = 500_000
+SIZE_SUFFIXES = {'k': 10**3, 'm': 10**6}
+
+# Vocabulaires, du plus au moins fréquent (ordre du fichier Kaggle)
+COUNTRIES = [
+    'United States', 'India', 'United Kingdom', 'Canada', 'France', 'Japan', 'Spain',
+    'South Korea', 'Germany', 'Mexico', 'China', 'Australia', 'Egypt', 'Turkey', 'Hong Kong',
+    'Nigeria', 'Italy', 'Brazil', 'Argentina', 'Belgium', 'Indonesia', 'Taiwan', 'Philippines',
+    'Thailand', 'South Africa', 'Colombia', 'Netherlands', 'Denmark', 'Ireland', 'Sweden',
+    'Singapore', 'Poland', 'United Arab Emirates', 'New Zealand', 'Israel', 'Norway',
+    'Lebanon', 'Malaysia', 'Chile', 'Russia', 'Pakistan', 'Switzerland', 'Czech Republic',
+    'Saudi Arabia', 'Austria', 'Romania', 'Qatar', 'Kenya', 'Luxembourg', 'Ghana',
+    'Portugal', 'Hungary', 'Iceland', 'Finland', 'Peru', 'Vietnam', 'Bulgaria', 'Uruguay',
+    'Greece', 'Jordan', 'Serbia', 'Morocco', 'Cambodia', 'Venezuela', 'Bangladesh',
+    'Kuwait', 'Iran', 'Croatia', 'Senegal', 'Georgia', 'Ukraine', 'Mauritius', 'Cyprus',
+    'Paraguay', 'Zimbabwe', 'Namibia', 'Malta', 'Slovenia', 'Nepal', 'Sri Lanka',
+]
+MOVIE_GENRES = [
+    'International Movies', 'Dramas', 'Comedies', 'Documentaries', 'Action & Adventure',
+    'Independent Movies', 'Children & Family Movies', 'Romantic Movies', 'Thrillers',
+    'Music & Musicals', 'Horror Movies', 'Stand-Up Comedy', 'Sci-Fi & Fantasy',
+    'Sports Movies', 'Classic Movies', 'LGBTQ Movies', 'Cult Movies', 'Anime Features',
+    'Faith & Spirituality', 'Movies',
+]
+TV_GENRES = [
+    'International TV Shows', 'TV Dramas', 'TV Comedies', 'Crime TV Shows', 'Kids\' TV',
+    'Docuseries', 'Romantic TV Shows', 'Reality TV', 'British TV Shows', 'Anime Series',
+    'Spanish-Language TV Shows', 'TV Action & Adventure', 'Korean TV Shows', 'TV Mysteries',
+    'Science & Nature TV', 'TV Sci-Fi & Fantasy', 'TV Horror', 'Teen TV Shows',
+    'TV Thrillers', 'Stand-Up Comedy & Talk Shows', 'Classic & Cult TV', 'TV Shows',
+]
+# (classification, part du catalogue)
+RATINGS = [
+    ('TV-MA', 0.364), ('TV-14', 0.245), ('TV-PG', 0.098), ('R', 0.091), ('PG-13', 0.056),
+    ('TV-Y7', 0.038), ('TV-Y', 0.035), ('PG', 0.033), ('TV-G', 0.025), ('NR', 0.009),
+    ('G', 0.005), ('TV-Y7-FV', 0.001), ('NC-17', 0.0004), ('UR', 0.0006),
+]
+FIRST_NAMES = [
+    'James', 'Maria', 'Hiroshi', 'Priya', 'Carlos', 'Aisha', 'Wei', 'Sofia', 'Ahmed', 'Emma',
+    'Raj', 'Yuki', 'Lucas', 'Fatima', 'Jin', 'Chloé', 'Olu', 'Ana', 'Mehmet', 'Ingrid',
+    'Diego', 'Anya', 'Kwame', 'Laura', 'Arjun', 'Mei', 'Pedro', 'Nadia', 'Ji-woo', 'Tom',
+]
+LAST_NAMES = [
+    'Smith', 'Kapoor', 'Tanaka', 'Garcia', 'Okafor', 'Chen', 'Müller', 'Rossi', 'Kim',
+    'Martin', 'Silva', 'Haddad', 'Nguyen', 'Johansson', 'Yilmaz', 'Khan', 'Dubois',
+    'Novak', 'Mensah', 'López', 'Sato', 'Park', 'Costa', 'Ivanova', 'Das', 'Moreau',
+    'Wright', 'Ortiz', 'Levi', 'Osei',
+]
+WORDS = [
+    'Secret', 'Last', 'Dark', 'Little', 'Lost', 'Wild', 'Blue', 'Broken', 'Golden', 'Silent',
+    'Midnight', 'Hidden', 'Crazy', 'Perfect', 'Final', 'City', 'Love', 'Night', 'House',
+    'Road', 'Game', 'Heart', 'World', 'Story', 'Family', 'River', 'Dream', 'War', 'Summer',
+    'Shadow', 'Kingdom', 'Island', 'Legacy', 'Storm', 'Journey', 'Promise', 'Chef', 'Club',
+]
+SUBJECTS = ['A young woman', 'A detective', 'Two friends', 'A family', 'A former soldier',
+            'A teenager', 'A chef', 'A comedian', 'A group of strangers', 'An ambitious lawyer']
+ACTIONS = ['must confront', 'sets out to uncover', 'fights to protect', 'tries to escape',
+           'stumbles upon', 'races against time to stop', 'reluctantly joins', 'falls for']
+OBJECTS = ['a dangerous secret', 'the family business', 'a long-lost sibling', 'a powerful cartel',
+           'an ancient curse', 'a rival crew', 'the love of their life', 'a mysterious stranger']
+PLACES = ['in a small town.', 'across Europe.', 'in 1980s Tokyo.', 'in the big city.',
+          'on a remote island.', 'during a heat wave.', 'in post-war Berlin.', 'in Lagos.']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+          'September', 'October', 'November', 'December']
+
+
+def parse_size(text):
+    """'10k', '1m', '250000' -> nombre de lignes"""
+    text = str(text).strip().lower().replace('_', '')
+    factor = SIZE_SUFFIXES.get(text[-1:], 1)
+    digits = text[:-1] if text[-1:] in SIZE_SUFFIXES else text
+    try:
+        rows = int(float(digits) * factor)
+    except ValueError:
+        raise ValueError(f"taille invalide : {text!r} (ex. 10k, 1m, 250000)") from None
+    if rows <= 0:
+        raise ValueError(f"taille invalide : {text!r}")
+    return rows
+
+
+def format_size(rows):
+    """Nombre de lignes -> libellé court (10k, 1m)"""
+    for suffix, factor in sorted(SIZE_SUFFIXES.items(), key=lambda item: -item[1]):
+        if rows >= factor and rows % factor == 0:
+            return f"{rows // factor}{suffix}"
+    return str(rows)
+
+
+def zipf_weights(n, exponent):
+    """Probabilités décroissantes en 1 / rang**exponent"""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _strings(vocabulary, ids):
+    """Chaînes vocabulary[ids] dans une Series de type str"""
+    return pd.Series(np.asarray(vocabulary, dtype=object)[ids], dtype=str)
+
+
+def _join_lists(names, ids, sizes):
+    """Listes de longueurs sizes (ids à plat) -> « a, b, c » (manquant si vide)"""
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    if pa is not None:
+        values = pa.array(np.asarray(names, dtype=object)).take(pa.array(ids))
+        joined = pc.binary_join(pa.ListArray.from_arrays(pa.array(offsets, pa.int64()), values), ', ')
+        joined = pd.Series(pd.arrays.ArrowStringArray(joined.cast(pa.large_string())), dtype=str)
+    else:
+        flat = np.asarray(names, dtype=object)[ids].tolist()
+        joined = pd.Series([', '.join(flat[start:end]) for start, end in zip(offsets[:-1], offsets[1:])],
+                           dtype=str)
+    return joined.where(sizes > 0)
+
+
+def power_ranks(rng, size, n, exponent):
+    """Rangs dans [0, n) de probabilité ~ 1 / rang**exponent (exponent < 1), sans table de n poids"""
+    return np.minimum((n * rng.random(size) ** (1 / (1 - exponent))).astype(np.int64), n - 1)
+
+
+def person_names(ids):
+    """Nom (prénom, nom, numéro éventuel) de chaque identifiant de personne"""
+    ids = np.asarray(ids)
+    pairs = len(FIRST_NAMES) * len(LAST_NAMES)
+    names = (_strings(FIRST_NAMES, ids % len(FIRST_NAMES)) + ' '
+             + _strings(LAST_NAMES, (ids // len(FIRST_NAMES)) % len(LAST_NAMES)))
+    suffix = pd.Series(np.where(ids < pairs, '', ' ' + (ids // pairs).astype(str)), dtype=str)
+    return (names + suffix).to_numpy(dtype=object)
+
+
+def _sample_lists(n_rows, sizes, draw, offset_ids=None):
+    """Identifiants à plat (tirés par draw(n), sans doublon dans une liste) et tailles finales"""
+    rows = np.repeat(np.arange(n_rows), sizes)
+    ids = draw(len(rows))
+    if offset_ids is not None:
+        ids = ids + offset_ids[rows]
+    keep = ~pd.DataFrame({'row': rows, 'id': ids}).duplicated().to_numpy()
+    return ids[keep], np.bincount(rows[keep], minlength=n_rows)
+
+
+def _join_people(ids, sizes):
+    """Listes de personnes -> « a, b, c » (noms construits pour les seuls identifiants tirés)"""
+    used, codes = np.unique(ids, return_inverse=True)
+    return _join_lists(person_names(used), codes, sizes)
+
+
+def make_raw_catalog(n_rows, seed=0, start_id=0, people=None):
+    """DataFrame de n_rows titres au format brut (colonnes de netflix_titles.csv)"""
+    rng = np.random.default_rng(seed)
+    people = people or max(2_000, n_rows * 4)
+    is_movie = rng.random(n_rows) < 0.7
+
+    def choose(weights):
+        return lambda size: rng.choice(len(weights), size=size, p=weights)
+
+    def choose_person(size):
+        return power_ranks(rng, size, people, 0.5)
+
+    # Pays, réalisateurs, acteurs : listes tirées en loi de Zipf
+    country_ids, country_sizes = _sample_lists(
+        n_rows, np.where(rng.random(n_rows) < 0.094, 0, rng.choice([1, 2, 3], n_rows, p=[0.85, 0.11, 0.04])),
+        choose(zipf_weights(len(COUNTRIES), 1.3)))
+    director_ids, director_sizes = _sample_lists(
+        n_rows, np.where(rng.random(n_rows) < 0.3, 0, rng.choice([1, 2], n_rows, p=[0.93, 0.07])),
+        choose_person)
+    cast_ids, cast_sizes = _sample_lists(
+        n_rows, np.where(rng.random(n_rows) < 0.094, 0, np.clip(rng.poisson(7, n_rows), 1, 50)),
+        choose_person)
+
+    # Genres : vocabulaire des films ou des séries selon le type
+    genre_names = MOVIE_GENRES + TV_GENRES
+    genre_ids, genre_sizes = _sample_lists(
+        n_rows, rng.choice([1, 2, 3], n_rows, p=[0.22, 0.35, 0.43]),
+        choose(zipf_weights(min(len(MOVIE_GENRES), len(TV_GENRES)), 1.0)),
+        offset_ids=np.where(is_movie, 0, len(MOVIE_GENRES)))
+
+    # Dates d'ajout (surtout 2016-2021) et années de sortie (antérieures)
+    added = pd.Timestamp('2021-09-25') - pd.to_timedelta(
+        np.minimum(rng.exponential(900, n_rows), 4_700).astype(int), unit='D')
+    added = pd.DatetimeIndex(added)
+    date_added = (_strings(MONTHS, added.month.to_numpy() - 1) + ' '
+                  + pd.Series(added.day.astype(str), dtype=str) + ', '
+                  + pd.Series(added.year.astype(str), dtype=str))
+    date_added = date_added.where(rng.random(n_rows) >= 0.001)
+    release_year = np.maximum(added.year.to_numpy() - np.minimum(rng.geometric(0.25, n_rows) - 1, 80), 1925)
+
+    minutes = np.clip(rng.normal(100, 28, n_rows), 3, 312).astype(int)
+    seasons = np.minimum(rng.geometric(0.6, n_rows), 17)
+    duration = pd.Series(np.where(is_movie, minutes, seasons).astype(str), dtype=str) + pd.Series(
+        np.where(is_movie, ' min', np.where(seasons == 1, ' Season', ' Seasons')), dtype=str)
+
+    title = _strings(WORDS, rng.integers(0, len(WORDS), n_rows)) + ' ' + _strings(
+        WORDS, rng.integers(0, len(WORDS), n_rows))
+    title = title.where(rng.random(n_rows) < 0.7, title + ' ' + pd.Series(
+        rng.integers(2, 2_000, n_rows).astype(str), dtype=str))
+    description = (_strings(SUBJECTS, rng.integers(0, len(SUBJECTS), n_rows)) + ' '
+                   + _strings(ACTIONS, rng.integers(0, len(ACTIONS), n_rows)) + ' '
+                   + _strings(OBJECTS, rng.integers(0, len(OBJECTS), n_rows)) + ' '
+                   + _strings(PLACES, rng.integers(0, len(PLACES), n_rows)))
+
+    ratings, shares = zip(*RATINGS)
+    return pd.DataFrame({
+        'show_id': 's' + pd.Series(np.arange(start_id + 1, start_id + n_rows + 1).astype(str), dtype=str),
+        'type': pd.Series(np.where(is_movie, 'Movie', 'TV Show'), dtype=str),
+        'title': title,
+        'director': _join_people(director_ids, director_sizes),
+        'cast': _join_people(cast_ids, cast_sizes),
+        'country': _join_lists(COUNTRIES, country_ids, country_sizes),
+        'date_added': date_added,
+        'release_year': release_year,
+        'rating': _strings(ratings, rng.choice(len(ratings), n_rows, p=np.array(shares) / sum(shares))),
+        'duration': duration.where(rng.random(n_rows) >= 0.0005),
+        'listed_in': _join_lists(genre_names, genre_ids, genre_sizes),
+        'description': description,
+    })
+
+
+def write_catalog(path, n_rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Écrit un catalogue synthétique de n_rows lignes, bloc par bloc (via un fichier temporaire)"""
+    people = max(2_000, n_rows * 4)
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_rows // chunk_rows))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        for number, (start, chunk_seed) in enumerate(zip(range(0, n_rows, chunk_rows), seeds)):
+            chunk = make_raw_catalog(min(chunk_rows, n_rows - start), seed=chunk_seed,
+                                     start_id=start, people=people)
+            chunk.to_csv(f, index=False, header=number == 0)
+    os.replace(tmp_path, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un catalogue synthétique au format de netflix_titles.csv.")
+    parser.add_argument('rows', help="nombre de lignes (ex. 10k, 100k, 1m, 10m)")
+    parser.add_argument('-o', '--output', help="CSV à écrire (défaut : synthetic_<rows>.csv)")
+    parser.add_argument('--seed', type=int, default=0, help="graine aléatoire (défaut : %(default)s)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                        help="lignes générées par bloc (défaut : %(default)s)")
+    args = parser.parse_args(argv)
+
+    try:
+        rows = parse_size(args.rows)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.chunk_rows <= 0:
+        parser.error("--chunk-rows doit être strictement positif")
+
+    output = args.output or f"synthetic_{format_size(rows)}.csv"
+    start = time.perf_counter()
+    write_catalog(output, rows, seed=args.seed, chunk_rows=args.chunk_rows)
+    print(f"{rows:,} lignes écrites dans {output} en {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,19 @@
+# CONFIGURATION DES TESTS
+"""Accès aux modules de la racine et petit catalogue synthétique nettoyé"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cleaning import clean_catalog  # noqa: E402
+from synthetic import make_raw_catalog  # noqa: E402
+
+
+@pytest.fixture
+def catalog():
+    """Catalogue synthétique au format nettoyé (netflix_titles_cleaned.csv)"""
+    return clean_catalog(make_raw_catalog(500, seed=0))
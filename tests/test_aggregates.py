@@ -0,0 +1,91 @@
+"""Le cube d'agrégation doit donner les mêmes chiffres qu'un groupby pandas"""
+
+import numpy as np
+import pytest
+
+from aggregates import build_cube
+from filter_index import build_filter_indexes
+
+FILTERS = [
+    ([], (1900, 2100), [], []),
+    (['Movie'], (2000, 2015), [], []),
+    (['Movie', 'TV Show'], (1995, 2020), ['India', 'France'], []),
+    ([], (1990, 2021), [], ['Dramas', 'Anime Series']),
+    (['TV Show'], (2005, 2021), ['United States'], ['Comedies', 'Kids\' TV']),
+    ([], (1990, 2021), ['Atlantis'], []),
+]
+
+
+def _filtered(df, content_type, year_range, countries, genres):
+    """Filtrage ligne à ligne de référence (même sémantique que la barre latérale)"""
+    mask = df['release_year'].between(*year_range).fillna(False).astype(bool)
+    if content_type:
+        mask &= df['type'].isin(content_type)
+    if countries:
+        mask &= df['countries_list'].map(lambda values: bool(set(values) & set(countries)))
+    if genres:
+        mask &= df['genres_list'].map(lambda values: bool(set(values) & set(genres)))
+    return df[mask]
+
+
+def _has(df, column, value):
+    """Masque des lignes dont la liste contient la valeur"""
+    return df[column].map(lambda values: value in values).astype(bool)
+
+
+@pytest.fixture
+def cube(catalog):
+    """Cube construit sur le catalogue de test"""
+    return build_cube(catalog, build_filter_indexes(catalog))
+
+
+COUNTRIES = ['United States', 'India', 'Japan']
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_counts_match_groupby(catalog, cube, filters):
+    summary = cube.slice(*filters).summary(COUNTRIES)
+    expected = _filtered(catalog, *filters)
+
+    assert summary.total == len(expected)
+    types = expected.groupby('type').size().reindex(cube.type_names, fill_value=0)
+    assert summary.type_totals.tolist() == types.tolist()
+    years = expected.groupby(expected['release_year'].astype(int)).size()
+    assert summary.year_counts.to_dict() == years.to_dict()
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_member_breakdowns_match_groupby(catalog, cube, filters):
+    summary = cube.slice(*filters).summary(COUNTRIES)
+    expected = _filtered(catalog, *filters)
+
+    for country in COUNTRIES:
+        rows = expected[_has(expected, 'countries_list', country)]
+        by_year = summary.year_by_country[country]
+        assert by_year[by_year > 0].to_dict() == rows.groupby(rows['release_year'].astype(int)).size().to_dict()
+        assert summary.country_totals[country] == len(rows)
+        types = rows.groupby('type').size().reindex(cube.type_names, fill_value=0)
+        assert summary.type_by_country.loc[country].tolist() == types.tolist()
+        for genre in summary.crosstab.columns:
+            both = rows[_has(rows, 'genres_list', genre)]
+            assert summary.crosstab.loc[country, genre] == len(both)
+
+    for genre in summary.genre_totals.index:
+        rows = expected[_has(expected, 'genres_list', genre)]
+        assert summary.genre_totals[genre] == len(rows)
+        by_year = summary.year_by_genre[genre]
+        assert by_year[by_year > 0].to_dict() == rows.groupby(rows['release_year'].astype(int)).size().to_dict()
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_duration_stats_match_pandas(catalog, cube, filters):
+    expected = _filtered(catalog, *filters)
+    durations = expected.loc[expected['type'] == 'Movie', 'duration_min'].dropna().astype(float)
+
+    n, mean, std = cube.slice(*filters).summary(COUNTRIES).duration_stats('Movie')
+    assert n == len(durations)
+    if n:
+        assert mean == pytest.approx(durations.mean())
+        assert std == pytest.approx(durations.std(ddof=0))
+    else:
+        assert np.isnan(mean) and np.isnan(std)
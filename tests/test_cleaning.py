@@ -0,0 +1,83 @@
+"""Un upsert doit produire le même catalogue nettoyé qu'un nettoyage complet"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from cleaning import run, upsert
+from data_store import parse_cleaned_csv, read_sidecar, sidecar_path
+from synthetic import make_raw_catalog
+
+
+@pytest.fixture
+def raw():
+    """Catalogue brut de base et lot de titres nouveaux"""
+    return make_raw_catalog(300), make_raw_catalog(40, seed=1, start_id=300)
+
+
+def _clean(tmp_path, name, frame, sidecar=True):
+    """Nettoyage complet d'un catalogue brut ; chemin du CSV nettoyé"""
+    raw_path, cleaned_path = tmp_path / f'{name}_raw.csv', tmp_path / f'{name}.csv'
+    frame.to_csv(raw_path, index=False)
+    run(str(raw_path), str(cleaned_path), sidecar=sidecar)
+    return cleaned_path
+
+
+def _upsert(tmp_path, store, frame, sidecar=True):
+    """Intègre un lot brut au catalogue nettoyé ; (durées des étapes, compteurs)"""
+    delta_path = tmp_path / 'delta_raw.csv'
+    frame.to_csv(delta_path, index=False)
+    timings, _, counts = upsert(str(delta_path), str(store), sidecar=sidecar)
+    return timings, counts
+
+
+@pytest.mark.parametrize('sidecar', [True, False])
+def test_append_matches_full_clean(tmp_path, raw, sidecar):
+    base, added = raw
+    store = _clean(tmp_path, 'store', base, sidecar)
+    # Quelques titres déjà connus et inchangés dans le lot
+    timings, counts = _upsert(tmp_path, store, pd.concat([base.iloc[:5], added]), sidecar)
+    expected = _clean(tmp_path, 'expected', pd.concat([base, added]), sidecar)
+
+    assert counts == {'new': len(added), 'changed': 0, 'unchanged': 5}
+    assert store.read_bytes() == expected.read_bytes()
+    # Avec le cache Arrow, les lignes sont ajoutées sans relire le catalogue
+    assert ('load' not in timings) == sidecar
+    if sidecar:
+        cached = read_sidecar(str(store))
+        assert cached is not None
+        pd.testing.assert_frame_equal(cached, read_sidecar(str(expected)))
+        pd.testing.assert_frame_equal(cached, parse_cleaned_csv(str(store)))
+
+
+@pytest.mark.parametrize('sidecar', [True, False])
+def test_changed_rows_match_full_clean(tmp_path, raw, sidecar):
+    base, added = raw
+    store = _clean(tmp_path, 'store', base, sidecar)
+    changed = base.iloc[10:30].copy()
+    changed['title'] += ' (remastered)'
+    _, counts = _upsert(tmp_path, store, pd.concat([changed, added]), sidecar)
+
+    updated = base.copy()
+    updated.loc[changed.index, 'title'] = changed['title']
+    expected = _clean(tmp_path, 'expected', pd.concat([updated, added]), sidecar)
+
+    assert counts == {'new': len(added), 'changed': len(changed), 'unchanged': 0}
+    assert store.read_bytes() == expected.read_bytes()
+    if sidecar:
+        pd.testing.assert_frame_equal(read_sidecar(str(store)), read_sidecar(str(expected)))
+
+
+def test_touched_store_is_reloaded_from_csv(tmp_path, raw):
+    base, added = raw
+    store = _clean(tmp_path, 'store', base)
+    _upsert(tmp_path, store, added)
+    assert read_sidecar(str(store)) is not None
+
+    # Les lignes ajoutées n'ont pas d'empreinte de contenu : un simple
+    # changement de date périme le cache plutôt que de le croire à jour
+    stat = store.stat()
+    os.utime(store, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert read_sidecar(str(store)) is None
+    assert os.path.exists(sidecar_path(str(store)))
@@ -0,0 +1,98 @@
+"""Le graphe CSR doit répondre comme un parcours Python naïf des listes de personnes"""
+
+import random
+from collections import Counter, deque
+
+import pytest
+
+from cleaning import clean_catalog
+from collaboration import CAST, DIRECTOR, CollaborationGraph
+from compact import compact_frame
+from synthetic import make_raw_catalog
+
+
+@pytest.fixture(scope='module')
+def people():
+    """Catalogue au petit vocabulaire de personnes (graphe dense), et ses rôles par titre"""
+    df = clean_catalog(make_raw_catalog(600, seed=2, people=400))
+    roles = []
+    for cast, directors in zip(df['cast_list'], df['director_list']):
+        members = {}
+        for name in cast:
+            members[name] = members.get(name, 0) | CAST
+        for name in directors:
+            members[name] = members.get(name, 0) | DIRECTOR
+        roles.append(members)
+    titles = {}
+    for title, members in enumerate(roles):
+        for name in members:
+            titles.setdefault(name, set()).add(title)
+    return df, roles, titles
+
+
+def bfs_distance(roles, titles, a, b):
+    """Nombre de titres du plus court chemin de a à b (parcours en largeur simple)"""
+    distance = {a: 0}
+    queue = deque([a])
+    while queue:
+        person = queue.popleft()
+        if person == b:
+            return distance[person]
+        for title in titles[person]:
+            for other in roles[title]:
+                if other not in distance:
+                    distance[other] = distance[person] + 1
+                    queue.append(other)
+    return None
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_graph_matches_python_reference(people, compact):
+    df, roles, titles = people
+    graph = CollaborationGraph(compact_frame(df) if compact else df)
+    names = sorted(titles)
+    assert list(graph.people) == names
+    assert graph.n_edges == sum(len(members) for members in roles)
+
+    rng = random.Random(0)
+    for _ in range(100):
+        a, b = rng.choice(names), rng.choice(names)
+        ia, ib = graph.person_id(a), graph.person_id(b)
+        assert set(graph.titles(ia).tolist()) == titles[a]
+        assert set(graph.co_appearances(ia, ib).tolist()) == titles[a] & titles[b]
+
+        expected = Counter(other for title in titles[a] for other in roles[title] if other != a)
+        ids, counts = graph.collaborators(ia)
+        assert {names[i]: count for i, count in zip(ids, counts)} == expected
+        assert list(counts) == sorted(counts, reverse=True)
+
+        cast = Counter(other for title in titles[a] if roles[title][a] & DIRECTOR
+                       for other, role in roles[title].items() if other != a and role & CAST)
+        ids, counts = graph.repeat_cast(ia)
+        assert {names[i]: count for i, count in zip(ids, counts)} == {k: v for k, v in cast.items() if v >= 2}
+
+
+def test_bidirectional_path_matches_bfs(people):
+    df, roles, titles = people
+    graph = CollaborationGraph(df)
+    names = sorted(titles)
+
+    rng = random.Random(1)
+    lengths = Counter()
+    for _ in range(200):
+        a, b = rng.choice(names), rng.choice(names)
+        ia, ib = graph.person_id(a), graph.person_id(b)
+        path = graph.shortest_path(ia, ib)
+        distance = bfs_distance(roles, titles, a, b)
+        lengths[distance] += 1
+        if distance is None:
+            assert path is None
+            continue
+        # [a, titre, personne, ..., titre, b] : autant de titres que la distance du BFS
+        assert len(path) == 2 * distance + 1
+        assert path[0] == ia and path[-1] == ib
+        for k in range(1, len(path), 2):
+            members = graph.members(path[k]).tolist()
+            assert path[k - 1] in members and path[k + 1] in members
+    # L'échantillon couvre des chemins de plusieurs longueurs
+    assert len([d for d in lengths if d]) >= 3
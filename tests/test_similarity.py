@@ -0,0 +1,67 @@
+"""Les voisins de nearest_neighbors doivent être ceux d'une matrice de similarité dense"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from search_index import SEPARATORS
+from similarity import MIN_DF, SET_WEIGHTS, TERM_FIELDS, TERMS_WEIGHT, TEXT_COLUMNS, nearest_neighbors
+
+K = 5
+
+
+def _terms(df, column):
+    """Termes de chaque ligne pour un champ (mots en minuscules ou éléments de la liste)"""
+    if column in TEXT_COLUMNS:
+        return [[word for word in SEPARATORS.split(str(text).lower()) if word] for text in df[column]]
+    return [list(values) for values in df[column]]
+
+
+def dense_similarity(df, max_df):
+    """Matrice n × n des similarités, calculée terme à terme sans index ni blocs"""
+    n = len(df)
+    vectors = np.zeros((n, 0))
+    for column, field_weight in TERM_FIELDS.items():
+        counts = [Counter(terms) for terms in _terms(df, column)]
+        doc_freq = Counter(term for row in counts for term in row)
+        vocabulary = sorted(term for term, freq in doc_freq.items() if MIN_DF <= freq <= max_df)
+        block = np.zeros((n, len(vocabulary)))
+        for j, term in enumerate(vocabulary):
+            idf = np.log((1 + n) / (1 + doc_freq[term])) + 1
+            for i, row in enumerate(counts):
+                if row[term]:
+                    block[i, j] = field_weight * (1 + np.log(row[term])) * idf
+        vectors = np.hstack([vectors, block])
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+    terms = vectors @ vectors.T
+
+    similarity = TERMS_WEIGHT * terms
+    for column, weight in SET_WEIGHTS.items():
+        values = sorted({value for row in df[column] for value in row})
+        hot = np.array([[value in row for value in values] for row in df[column]], dtype=float)
+        sizes = np.sqrt(hot.sum(axis=1))
+        outer = np.outer(sizes, sizes)
+        similarity += weight * np.divide(hot @ hot.T, outer, out=np.zeros((n, n)), where=outer > 0)
+    # Seules les paires qui partagent un terme sont candidates
+    similarity[terms <= 0] = -np.inf
+    np.fill_diagonal(similarity, -np.inf)
+    return similarity
+
+
+@pytest.mark.parametrize('max_df', [1_000, 20])
+@pytest.mark.parametrize('memory_mb', [512, 0.001])
+def test_neighbors_match_dense_matrix(catalog, max_df, memory_mb):
+    df = catalog.iloc[:300].reset_index(drop=True)
+    neighbors, scores = nearest_neighbors(df, k=K, max_df=max_df, memory_mb=memory_mb)
+    dense = dense_similarity(df, max_df)
+
+    for row in range(len(df)):
+        candidates = np.sort(dense[row][np.isfinite(dense[row])])[::-1][:K]
+        found = neighbors[row] >= 0
+        # Autant de voisins que de candidats, avec les meilleurs scores
+        assert found.sum() == len(candidates)
+        assert scores[row][found] == pytest.approx(candidates, abs=1e-5)
+        # Chaque voisin renvoyé a bien ce score dans la matrice dense
+        assert scores[row][found] == pytest.approx(dense[row][neighbors[row][found]], abs=1e-5)